@@ -1,9 +1,24 @@
+import argparse
+import asyncio
 import json
 import os
+import time
+from contextlib import asynccontextmanager
 from openai import OpenAI
 
+from batch_journal import append_record
+from id_registry import IdRegistry
+from json_stream import aiter_array_items
+from llm_async import RateLimiter, estimate_request_tokens, with_retries
+from llm_cache import (ResponseCache, cached_completion, cached_completion_async, discard_response,
+                       stream_completion_async)
+from merge_words import merge_words, print_report
+
 client = OpenAI()
 
+# 응답 캐시 (재실행/프롬프트 일부 수정 시 같은 요청은 API를 다시 호출하지 않음)
+cache = ResponseCache()
+
 # New categories to add
 NEW_CATEGORIES = [
     {
@@ -88,11 +103,16 @@ NEW_CATEGORIES = [
     }
 ]
 
-def generate_words_for_category(category, count=120):
-    """Generate words for a category using GPT-4o mini"""
+SYSTEM_PROMPT = "You are a Japanese language expert. Generate accurate, practical vocabulary with correct readings and translations. Return only valid JSON."
+
+def build_messages(category, count, part=None, parts=None):
+    """카테고리 단어 생성 프롬프트 (part/parts가 있으면 분할 요청 중 하나)"""
+    focus = ""
+    if parts and parts > 1:
+        focus = f"\nThis request is part {part} of {parts} for this category. Split the typical situations of the topic into {parts} groups and cover only group {part}, so the parts do not overlap.\n"
     
     prompt = f"""Generate exactly {count} practical Japanese vocabulary words/phrases for the category: {category['name_en']} ({category['description']}).
-
+{focus}
 For each word, provide:
 1. word: Japanese word/phrase (kanji if applicable)
 2. reading: Hiragana reading
@@ -114,17 +134,32 @@ Requirements:
 
 Return as JSON array with exactly {count} objects. No markdown, just pure JSON."""
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": "You are a Japanese language expert. Generate accurate, practical vocabulary with correct readings and translations. Return only valid JSON."},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.7,
-        max_tokens=16000
-    )
-    
-    content = response.choices[0].message.content.strip()
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+# 단어 객체의 필수 필드 (모두 비어 있지 않은 문자열이어야 함)
+WORD_FIELDS = ("word", "reading", "meaning_en", "meaning_ko", "meaning_zh",
+               "meaning_es", "meaning_vi", "example_ja", "example_reading", "example_en")
+
+def validate_word(word):
+    """스키마 검사. 문제가 없으면 None, 있으면 사유 문자열"""
+    if not isinstance(word, dict):
+        return f"not an object: {word!r:.60}"
+    missing = [field for field in WORD_FIELDS
+               if not isinstance(word.get(field), str) or not word[field].strip()]
+    if missing:
+        return f"{word.get('word', '?')}: missing {', '.join(missing)}"
+    return None
+
+def max_tokens_for(count):
+    """단어 수에 맞춘 응답 토큰 한도 (120개 = 16000)"""
+    return min(16000, 130 * count + 400)
+
+def parse_words(content):
+    """응답 텍스트에서 JSON 배열 추출"""
+    content = content.strip()
     # Remove markdown if present
     if content.startswith("```"):
         content = content.split("\n", 1)[1]
@@ -132,7 +167,214 @@ Return as JSON array with exactly {count} objects. No markdown, just pure JSON."
     
     return json.loads(content)
 
-def main():
+def generate_words_for_category(category, count=120):
+    """Generate words for a category using GPT-4o mini"""
+    request = {
+        "model": "gpt-4o-mini",
+        "messages": build_messages(category, count),
+        "temperature": 0.7,
+        "max_tokens": 16000
+    }
+    
+    return cached_completion(client, cache, request,
+                             parse=lambda response: parse_words(response["content"]))
+
+async def generate_chunk_async(aclient, category, count, part, parts, limiter, semaphore, retries=5):
+    """분할 요청 하나 실행 (동시 실행/속도 제한 + 재시도)"""
+    messages = build_messages(category, count, part, parts)
+    max_tokens = max_tokens_for(count)
+    
+    request = {
+        "model": "gpt-4o-mini",
+        "messages": messages,
+        "temperature": 0.7,
+        "max_tokens": max_tokens
+    }
+    
+    @asynccontextmanager
+    async def throttled():
+        async with semaphore:
+            await limiter.acquire(estimate_request_tokens(messages, max_tokens))
+            yield
+    
+    async def call():
+        return await cached_completion_async(
+            aclient, cache, request,
+            parse=lambda response: parse_words(response["content"]), guard=throttled)
+    
+    return await with_retries(call, retries=retries, label=f"{category['id']} part {part}/{parts}")
+
+async def generate_words_for_category_async(aclient, category, count, chunk_size, limiter, semaphore, retries=5):
+    """카테고리를 chunk_size 단위로 나눠 동시에 생성하고 단어 중복을 제거"""
+    sizes = [min(chunk_size, count - start) for start in range(0, count, chunk_size)]
+    chunks = await asyncio.gather(*[
+        generate_chunk_async(aclient, category, size, part, len(sizes), limiter, semaphore, retries)
+        for part, size in enumerate(sizes, 1)
+    ])
+    
+    words = []
+    seen = set()
+    for chunk in chunks:
+        for word in chunk:
+            if word.get("word") in seen:
+                continue
+            seen.add(word.get("word"))
+            words.append(word)
+    return words
+
+class IncompleteStream(Exception):
+    """스트림이 끝났지만 필요한 단어 수를 채우지 못함 (재시도 대상)"""
+
+def partial_file_for(category):
+    return f"new_words_{category['id']}.partial.jsonl"
+
+def load_partial(partial_file):
+    """이전 실행에서 스트리밍으로 저장된 단어 (잘린 마지막 줄은 무시)"""
+    words = []
+    if not os.path.exists(partial_file):
+        return words
+    with open(partial_file, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                word = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if validate_word(word) is None:
+                words.append(word)
+    return words
+
+async def stream_chunk_async(aclient, category, count, part, parts, limiter, semaphore,
+                             accept, retries=5):
+    """분할 요청 하나를 스트리밍으로 실행
+
+    배열 원소가 완성될 때마다 검사하여 accept(word)로 넘긴다 (중복이면 False).
+    스트림이 끊기거나 단어가 모자라면 남은 수만큼만 다시 요청한다.
+    반환값: 받아들인 단어 수 (재시도 후에도 모자라면 그때까지 받은 수)
+    """
+    accepted = 0
+    label = f"{category['id']} part {part}/{parts}"
+    
+    async def call():
+        nonlocal accepted
+        remaining = count - accepted
+        messages = build_messages(category, remaining, part, parts)
+        max_tokens = max_tokens_for(remaining)
+        request = {
+            "model": "gpt-4o-mini",
+            "messages": messages,
+            "temperature": 0.7,
+            "max_tokens": max_tokens
+        }
+        
+        @asynccontextmanager
+        async def throttled():
+            async with semaphore:
+                await limiter.acquire(estimate_request_tokens(messages, max_tokens))
+                yield
+        
+        rejected = 0
+        chunks = stream_completion_async(aclient, cache, request, guard=throttled)
+        async for word, error in aiter_array_items(chunks):
+            error = error or validate_word(word)
+            if error:
+                rejected += 1
+                print(f"  skip invalid word ({label}): {error}")
+            elif accept(word):
+                accepted += 1
+        if rejected or accepted < count:
+            # 검증에 실패한 응답은 캐시에 남기지 않음 (재시도/재실행 때 같은 응답을 받지 않도록)
+            discard_response(cache, request)
+        if accepted < count:
+            raise IncompleteStream(f"{accepted}/{count} words ({rejected} invalid)")
+    
+    try:
+        await with_retries(call, retries=retries, label=label)
+    except Exception as e:
+        if not accepted:
+            raise
+        print(f"  ! {label}: keeping {accepted}/{count} words ({e})")
+    return accepted
+
+async def stream_words_for_category_async(aclient, category, count, chunk_size, limiter, semaphore, retries=5):
+    """스트리밍 모드: 단어가 도착하는 대로 new_words_{id}.partial.jsonl에 추가
+
+    이전 실행의 partial 파일이 있으면 그 단어들은 다시 요청하지 않는다.
+    """
+    partial_file = partial_file_for(category)
+    words = load_partial(partial_file)
+    seen = {word["word"] for word in words}
+    if words:
+        print(f"  {category['id']}: resuming with {len(words)} streamed words")
+    
+    def accept(word):
+        if word["word"] in seen:
+            return False
+        seen.add(word["word"])
+        words.append(word)
+        append_record(partial_file, word)
+        if len(words) == 1:
+            print(f"  {category['id']}: first word after {time.monotonic() - started:.1f}s")
+        return True
+    
+    started = time.monotonic()
+    remaining = max(0, count - len(words))
+    sizes = [min(chunk_size, remaining - start) for start in range(0, remaining, chunk_size)]
+    results = await asyncio.gather(*[
+        stream_chunk_async(aclient, category, size, part, len(sizes), limiter, semaphore, accept, retries)
+        for part, size in enumerate(sizes, 1)
+    ], return_exceptions=True)
+    
+    failed = [r for r in results if isinstance(r, Exception)]
+    if failed and not words:
+        raise failed[0]
+    return words
+
+async def generate_all_categories(categories, count=120, concurrency=8, chunk_size=40,
+                                  rpm=None, tpm=None, retries=5, base_url=None, stream=False):
+    """모든 카테고리를 동시에 생성. category id -> 단어 목록 (실패한 카테고리는 제외)
+
+    base_url로 OpenAI 호환 로컬 스텁 서버(llm_stub_server.py)를 지정할 수 있다.
+    stream이면 응답을 스트리밍으로 받아 단어 단위로 검사/저장한다.
+    """
+    from openai import AsyncOpenAI
+    
+    aclient = AsyncOpenAI(base_url=base_url) if base_url else AsyncOpenAI()
+    limiter = RateLimiter(rpm=rpm, tpm=tpm)
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    generate = stream_words_for_category_async if stream else generate_words_for_category_async
+    
+    async def run(category):
+        try:
+            words = await generate(
+                aclient, category, count, chunk_size, limiter, semaphore, retries)
+        except Exception as e:
+            print(f"✗ Error generating {category['id']}: {e}")
+            return category["id"], None
+        
+        print(f"✓ Generated {len(words)} words for {category['id']}")
+        return category["id"], words
+    
+    results = await asyncio.gather(*[run(category) for category in categories])
+    return {cat_id: words for cat_id, words in results if words is not None}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="새 카테고리 단어 생성 및 words.json 병합")
+    parser.add_argument("--count", type=int, default=120, help="카테고리당 단어 수")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 요청 수")
+    parser.add_argument("--chunk-size", type=int, default=40, help="요청 1건당 단어 수")
+    parser.add_argument("--rpm", type=int, default=None, help="분당 요청 수 제한")
+    parser.add_argument("--tpm", type=int, default=None, help="분당 토큰 수 제한")
+    parser.add_argument("--retries", type=int, default=5, help="요청당 최대 재시도 횟수")
+    parser.add_argument("--base-url", default=None, help="OpenAI 호환 API 주소 (로컬 스텁 서버 등)")
+    parser.add_argument("--serial", action="store_true", help="기존 방식: 카테고리를 하나씩 순서대로 생성")
+    parser.add_argument("--stream", action="store_true",
+                        help="응답을 스트리밍으로 받아 단어가 완성되는 대로 검사/저장 (일부 실패해도 나머지 유지)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    
     # Load existing words
     words_file = "assets/data/words.json"
     with open(words_file, "r", encoding="utf-8") as f:
@@ -145,48 +387,63 @@ def main():
         existing_words = existing_data.get("words", [])
     print(f"Existing words: {len(existing_words)}")
     
-    # Find max ID
-    max_id = max(w.get("id", 0) for w in existing_words) if existing_words else 0
+    # id 레지스트리 (words.json을 손으로 고친 내용 반영). 새 단어 id는 max+1이 아니라 병합할 때 여기서 받음
+    registry = IdRegistry()
+    registry.sync(existing_words)
     
-    all_new_words = []
+    if args.serial:
+        generated = {}
+        for category in NEW_CATEGORIES:
+            print(f"\n{'='*50}")
+            print(f"Generating words for: {category['name_en']}")
+            print(f"{'='*50}")
+            
+            try:
+                words = generate_words_for_category(category, count=args.count)
+                generated[category["id"]] = words
+                print(f"✓ Generated {len(words)} words for {category['id']}")
+            except Exception as e:
+                print(f"✗ Error generating {category['id']}: {e}")
+                continue
+    else:
+        print(f"\nGenerating {len(NEW_CATEGORIES)} categories "
+              f"(concurrency {args.concurrency}, chunk size {args.chunk_size})...")
+        generated = asyncio.run(generate_all_categories(
+            NEW_CATEGORIES, count=args.count, concurrency=args.concurrency,
+            chunk_size=args.chunk_size, rpm=args.rpm, tpm=args.tpm,
+            retries=args.retries, base_url=args.base_url, stream=args.stream))
     
+    # Add category to each word (카테고리 순서대로). id는 merge_words가 중복 제거 뒤에 레지스트리에서 매김
+    all_new_words = []
     for category in NEW_CATEGORIES:
-        print(f"\n{'='*50}")
-        print(f"Generating words for: {category['name_en']}")
-        print(f"{'='*50}")
-        
-        try:
-            words = generate_words_for_category(category, count=120)
-            
-            # Add category and ID to each word
-            for word in words:
-                max_id += 1
-                word["id"] = max_id
-                word["category"] = category["id"]
-            
-            all_new_words.extend(words)
-            print(f"✓ Generated {len(words)} words for {category['id']}")
-            
-            # Save progress after each category
-            progress_file = f"new_words_{category['id']}.json"
-            with open(progress_file, "w", encoding="utf-8") as f:
-                json.dump(words, f, ensure_ascii=False, indent=2)
-            print(f"  Saved to {progress_file}")
-            
-        except Exception as e:
-            print(f"✗ Error generating {category['id']}: {e}")
+        words = generated.get(category["id"])
+        if not words:
             continue
+        for word in words:
+            word["category"] = category["id"]
+        all_new_words.extend(words)
+        
+        # Save progress after each category
+        progress_file = f"new_words_{category['id']}.json"
+        with open(progress_file, "w", encoding="utf-8") as f:
+            json.dump(words, f, ensure_ascii=False, indent=2)
+        print(f"  Saved to {progress_file}")
+        if os.path.exists(partial_file_for(category)):
+            os.remove(partial_file_for(category))
     
     print(f"\n{'='*50}")
     print(f"Total new words generated: {len(all_new_words)}")
     print(f"{'='*50}")
     
-    # Merge with existing
-    all_words = existing_words + all_new_words
+    # Merge with existing (정규화 키로 중복 제거, 비슷한 예문 보고)
+    all_words, merge_report = merge_words(existing_words, all_new_words, registry=registry)
+    print_report(merge_report)
     
     # Save merged file (as array)
     with open(words_file, "w", encoding="utf-8") as f:
         json.dump(all_words, f, ensure_ascii=False, indent=2)
+    registry.sync(all_words)
+    registry.save()
     
     print(f"\nTotal words in app: {len(all_words)}")
     
@@ -225,6 +482,9 @@ def main():
     
     for cat, count in sorted(category_counts.items()):
         print(f"  {cat}: {count} words")
+    
+    stats = cache.stats()
+    print(f"\nResponse cache: {stats['hits']} hits, {stats['misses']} misses ({stats['entries']} entries)")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Aho-Corasick 다중 패턴 매칭
+여러 패턴을 하나의 오토마톤으로 컴파일하여 텍스트를 한 번만 스캔한다.
+"""
+
+from collections import deque
+
+def build_automaton(patterns):
+    """패턴 목록을 오토마톤으로 컴파일
+
+    반환값의 'out'[state]는 해당 상태에서 끝나는 패턴 번호 목록
+    (failure 링크를 따라 도달하는 패턴 포함)이다. 빈 패턴은 무시한다.
+    """
+    goto = [{}]
+    out = [[]]
+    for idx, pattern in enumerate(patterns):
+        if not pattern:
+            continue
+        state = 0
+        for ch in pattern:
+            nxt = goto[state].get(ch)
+            if nxt is None:
+                nxt = len(goto)
+                goto[state][ch] = nxt
+                goto.append({})
+                out.append([])
+            state = nxt
+        out[state].append(idx)
+
+    # BFS로 failure 링크 계산 (얕은 상태부터)
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for ch, nxt in goto[state].items():
+            f = fail[state]
+            while f and ch not in goto[f]:
+                f = fail[f]
+            target = goto[f].get(ch, 0)
+            fail[nxt] = target if target != nxt else 0
+            if out[fail[nxt]]:
+                out[nxt] = out[nxt] + out[fail[nxt]]
+            queue.append(nxt)
+
+    return {'goto': goto, 'fail': fail, 'out': out, 'patterns': list(patterns)}
+
+def iter_matches(automaton, text):
+    """텍스트에서 모든 (겹치는 것 포함) 매치를 (끝 위치, 패턴 번호)로 생성"""
+    goto = automaton['goto']
+    fail = automaton['fail']
+    out = automaton['out']
+    state = 0
+    for pos, ch in enumerate(text):
+        while state and ch not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(ch, 0)
+        if out[state]:
+            for idx in out[state]:
+                yield pos, idx
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+저널 기반 배치 실행기 (중단 후 이어하기)
+
+완료된 배치 결과를 append-only JSONL 저널에 한 줄씩 기록하고,
+다시 실행하면 저널에 결과가 있는 항목은 건너뛴다.
+실패한 배치(또는 응답에서 빠진 항목)는 재시도 큐로 다시 묶어 실행한다.
+
+저널 레코드:
+  {"batch": "...", "status": "ok", "results": {"<item key>": <value>, ...}}
+  {"batch": "...", "status": "failed", "error": "...", "keys": [...]}
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# lock을 넘기지 않은 append_record 호출끼리 공유 (호출마다 새 lock을 만들면 아무것도 막지 못함)
+_APPEND_LOCK = threading.Lock()
+
+def load_journal(journal_path):
+    """저널에서 완료된 결과 읽기 (item key -> value)
+
+    중단으로 마지막 줄이 잘렸을 수 있으므로 읽을 수 없는 줄은 무시한다.
+    """
+    done = {}
+    if not os.path.exists(journal_path):
+        return done
+    with open(journal_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get('status') == 'ok':
+                done.update(record['results'])
+    return done
+
+def append_record(journal_path, record, lock=None):
+    """저널에 레코드 한 줄 추가 (즉시 디스크에 반영). lock이 없으면 모듈 공용 lock 사용"""
+    line = json.dumps(record, ensure_ascii=False) + '\n'
+    with lock or _APPEND_LOCK:
+        with open(journal_path, 'a', encoding='utf-8') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+def fixed_batches(items, batch_size):
+    return [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+def run_batches(items, process, journal_path, item_key, make_batches,
+                max_retries=3, concurrency=1, retry_delay=5.0):
+    """저널을 이어가며 items를 배치로 처리
+
+    process(batch)는 {item key: value}를 반환한다 (일부 항목만 반환해도 됨).
+    예외를 던지거나 빠진 항목은 다음 회차에 다시 배치로 묶어 재시도한다.
+    make_batches(pending items)가 배치 구성을 정한다.
+
+    반환값: (item key -> value, 재시도 후에도 남은 items)
+    """
+    done = load_journal(journal_path)
+    lock = threading.Lock()
+    pending = [item for item in items if item_key(item) not in done]
+    if done:
+        print(f"Resuming from {journal_path}: {len(items) - len(pending)}/{len(items)} done")
+
+    def run_one(batch, label):
+        keys = [item_key(item) for item in batch]
+        key_set = set(keys)
+        try:
+            results = process(batch)
+        except Exception as e:
+            print(f"  ✗ batch {label} failed: {e}")
+            append_record(journal_path, {'batch': label, 'status': 'failed',
+                                         'error': str(e), 'keys': keys}, lock)
+            return
+        results = {k: v for k, v in results.items() if k in key_set}
+        append_record(journal_path, {'batch': label, 'status': 'ok', 'results': results}, lock)
+        with lock:
+            done.update(results)
+        missing = len(keys) - len(results)
+        print(f"  ✓ batch {label}: {len(results)} items" + (f" ({missing} missing)" if missing else ""))
+
+    for attempt in range(max_retries + 1):
+        if not pending:
+            break
+        if attempt:
+            print(f"\nRetry {attempt}/{max_retries}: {len(pending)} items")
+            time.sleep(retry_delay * attempt)
+        batches = make_batches(pending)
+        labels = [f"{attempt}.{i + 1}/{len(batches)}" for i in range(len(batches))]
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            list(executor.map(run_one, batches, labels))
+        pending = [item for item in pending if item_key(item) not in done]
+
+    return done, pending
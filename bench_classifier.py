@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+키워드 분류기 벤치마크
+JMdict 의성어/의태어 전체(onomatopoeia_data.json)에 대해
+기존 키워드 루프와 컴파일된 분류기의 결과/속도를 비교한다.
+"""
+
+import json
+import sys
+import time
+
+from categorize_and_translate import RECATEGORY_CLASSIFIER, RECATEGORY_KEYWORDS
+from extract_onomatopoeia import CATEGORY_CLASSIFIER, CATEGORY_KEYWORDS
+from keyword_classifier import classify
+
+def legacy_classify(table, definition):
+    """기존 방식: 카테고리 -> 키워드 -> 부분 문자열 검사"""
+    definition_lower = definition.lower()
+    for category, keywords in table:
+        for keyword in keywords:
+            if keyword in definition_lower:
+                return category
+    return None
+
+def timed(func, definitions, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [func(d) for d in definitions]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return results, best
+
+def main():
+    input_file = sys.argv[1] if len(sys.argv) > 1 else 'onomatopoeia_data.json'
+    repeat = 5
+    with open(input_file, 'r', encoding='utf-8') as f:
+        definitions = [item['definition'] for item in json.load(f)]
+    print(f"Definitions: {len(definitions)} (best of {repeat})")
+
+    tables = [
+        ("categorize_onomatopoeia", CATEGORY_KEYWORDS, CATEGORY_CLASSIFIER),
+        ("recategorize_onomatopoeia", list(RECATEGORY_KEYWORDS.items()), RECATEGORY_CLASSIFIER),
+    ]
+    for name, table, classifier in tables:
+        legacy, legacy_time = timed(lambda d: legacy_classify(table, d), definitions, repeat)
+        compiled, compiled_time = timed(lambda d: classify(classifier, d), definitions, repeat)
+        mismatches = sum(1 for a, b in zip(legacy, compiled) if a != b)
+        print(f"\n{name} ({len(classifier['keywords'])} keywords)")
+        print(f"  legacy loop: {legacy_time * 1000:8.1f} ms")
+        print(f"  compiled:    {compiled_time * 1000:8.1f} ms ({legacy_time / compiled_time:.1f}x)")
+        print(f"  mismatches:  {mismatches}")
+        if mismatches:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
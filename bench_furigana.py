@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+후리가나 벤치마크
+전체 단어장(단어 + 예문)에 대해
+- 위젯 방식: FuriganaText._parseFurigana를 그대로 옮긴 parse_furigana_widget를 매번 실행
+- 파이프라인 방식: furigana.py의 검증된 분할 계산 (빌드 시 한 번)
+- 앱 실행 시: 미리 계산한 furigana.json 파싱 (json.loads)
+의 시간을 비교하고, 위젯 결과가 검증된 분할과 다른 항목 수를 출력한다.
+"""
+
+import json
+import sys
+import time
+
+from furigana import FURIGANA_FIELDS, _first, build_furigana
+
+def _is_kanji(char):
+    code = ord(char)
+    return 0x4E00 <= code <= 0x9FFF or 0x3400 <= code <= 0x4DBF
+
+def parse_furigana_widget(word, reading):
+    """lib/widgets/furigana_text.dart의 _parseFurigana와 같은 동작 (비교 기준)"""
+    if not any(_is_kanji(char) for char in word):
+        return [(word, None)]
+    parts = []
+    word_idx = read_idx = 0
+    while word_idx < len(word):
+        if _is_kanji(word[word_idx]):
+            kanji_start = word_idx
+            while word_idx < len(word) and _is_kanji(word[word_idx]):
+                word_idx += 1
+            kanji_part = word[kanji_start:word_idx]
+
+            next_kana = None
+            if word_idx < len(word):
+                kana_start = word_idx
+                while word_idx < len(word) and not _is_kanji(word[word_idx]):
+                    word_idx += 1
+                next_kana = word[kana_start:word_idx]
+                word_idx = kana_start
+
+            if next_kana:
+                next_pos = reading.find(next_kana, read_idx)
+                if next_pos > read_idx:
+                    parts.append((kanji_part, reading[read_idx:next_pos]))
+                    read_idx = next_pos
+                else:
+                    parts.append((kanji_part, reading[read_idx:]))
+                    read_idx = len(reading)
+            else:
+                parts.append((kanji_part, reading[read_idx:]))
+                read_idx = len(reading)
+        else:
+            kana_start = word_idx
+            while word_idx < len(word) and not _is_kanji(word[word_idx]):
+                word_idx += 1
+            kana_part = word[kana_start:word_idx]
+            parts.append((kana_part, None))
+            if reading[read_idx:].startswith(kana_part):
+                read_idx += len(kana_part)
+    return parts
+
+def best_time(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+def main():
+    input_file = sys.argv[1] if len(sys.argv) > 1 else 'assets/data/words.json'
+    repeat = 5
+    with open(input_file, 'r', encoding='utf-8') as f:
+        words = json.load(f)
+
+    pairs = []
+    for word in words:
+        for field, (text_keys, reading_keys) in FURIGANA_FIELDS.items():
+            text, reading = _first(word, text_keys), _first(word, reading_keys)
+            if text and reading:
+                pairs.append((str(word['id']), field, text, reading))
+
+    widget, widget_time = best_time(
+        lambda: [parse_furigana_widget(text, reading) for _, _, text, reading in pairs], repeat)
+    (asset, review), build_time = best_time(lambda: build_furigana(words), repeat)
+    data = json.dumps(asset, ensure_ascii=False, separators=(',', ':'))
+    _, load_time = best_time(lambda: json.loads(data), repeat)
+
+    flagged = {(str(item['id']), item['field']) for item in review}
+    differs = 0
+    for (word_id, field, text, _), parts in zip(pairs, widget):
+        if (word_id, field) in flagged:
+            continue
+        expected = asset.get(word_id, {}).get(field, [[text, None]])
+        if [[part, ruby if ruby != part else None] for part, ruby in parts] != expected:
+            differs += 1
+
+    print(f"{len(pairs)} texts ({len(words)} words + examples), best of {repeat}")
+    print(f"  widget parse (every build):  {widget_time * 1000:8.2f} ms")
+    print(f"  pipeline alignment (once):   {build_time * 1000:8.2f} ms")
+    print(f"  load furigana.json:          {load_time * 1000:8.2f} ms ({len(data.encode('utf-8')) / 1024:.1f} KB)")
+    print(f"  flagged for review: {len(review)}, widget output differs from verified alignment: {differs}")
+
+if __name__ == "__main__":
+    main()
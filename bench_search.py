@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+검색 벤치마크
+words.json을 복제해 1k/10k/100k 단어 DB(build_db.py)를 만들고,
+앱의 LIKE 검색(searchWords)과 FTS5 trigram 검색(search_words)의 지연 시간과 결과를 비교한다.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+from build_db import SEARCH_COLUMNS, build_db, search_words
+
+SIZES = (1_000, 10_000, 100_000)
+# 3글자 이상 (FTS 사용): 히라가나, 한자, 영어, 결과 없음
+QUERIES = ("こんにち", "します", "お祝い", "hospital", "celebration", "zzqx")
+
+def scaled_words(words, size):
+    """words를 반복해 size개로 (id만 새로 부여)"""
+    return [dict(words[i % len(words)], id=i + 1) for i in range(size)]
+
+def like_search(conn, query):
+    where = " OR ".join(f"{column} LIKE ?" for column in SEARCH_COLUMNS)
+    return conn.execute(f"SELECT * FROM words WHERE {where} ORDER BY word ASC",
+                        [f"%{query}%"] * len(SEARCH_COLUMNS)).fetchall()
+
+def best_time(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+def main():
+    input_file = sys.argv[1] if len(sys.argv) > 1 else 'assets/data/words.json'
+    repeat = 5
+    with open(input_file, 'r', encoding='utf-8') as f:
+        words = json.load(f)
+
+    mismatches = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in SIZES:
+            db_file = os.path.join(tmp, f"words_{size}.db")
+            build_db(scaled_words(words, size), db_file)
+            conn = sqlite3.connect(db_file)
+            print(f"\n{size} words ({os.path.getsize(db_file) / 1024 / 1024:.1f} MB, best of {repeat})")
+            print(f"  {'query':14s} {'hits':>6s} {'LIKE':>10s} {'FTS':>10s}")
+            total_like = total_fts = 0.0
+            for query in QUERIES:
+                like, like_time = best_time(lambda: like_search(conn, query), repeat)
+                fts, fts_time = best_time(lambda: search_words(conn, query), repeat)
+                total_like += like_time
+                total_fts += fts_time
+                if like != fts:
+                    mismatches += 1
+                print(f"  {query:14s} {len(like):6d} {like_time * 1000:8.2f}ms {fts_time * 1000:8.2f}ms"
+                      + ("" if like == fts else "  MISMATCH"))
+            print(f"  {'total':14s} {'':6s} {total_like * 1000:8.2f}ms {total_fts * 1000:8.2f}ms "
+                  f"({total_like / total_fts:.1f}x)")
+            conn.close()
+
+    if mismatches:
+        print(f"\n{mismatches} result mismatches")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+번역 조회 벤치마크
+카테고리 단어 목록을 한 언어로 불러올 때
+기존 방식(words.translations JSON을 행마다 디코딩)과
+translations 테이블 인덱스 조인(load_words_by_category)을 1k/10k/100k 단어에서 비교한다.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+
+from bench_search import SIZES, best_time, scaled_words
+from build_db import COLUMN_INDEX, build_db, load_words_by_category
+
+LANGUAGES = ("ko", "zh", "es", "vi")
+
+def json_load_category(conn, category, language):
+    """Word.fromDb 방식: 행마다 translations JSON 전체를 디코딩"""
+    word_id, translations_column = COLUMN_INDEX["id"], COLUMN_INDEX["translations"]
+    result = []
+    for row in conn.execute("SELECT * FROM words WHERE category = ? ORDER BY id ASC", (category,)):
+        translations = json.loads(row[translations_column]) if row[translations_column] else {}
+        texts = translations.get(language, {})
+        result.append((row[word_id], texts.get("definition") or None, texts.get("example") or None))
+    return result
+
+def join_load_category(conn, category, language):
+    return [(row[0], row[-2], row[-1]) for row in load_words_by_category(conn, category, language)]
+
+def main():
+    input_file = sys.argv[1] if len(sys.argv) > 1 else 'assets/data/words.json'
+    repeat = 5
+    with open(input_file, 'r', encoding='utf-8') as f:
+        words = json.load(f)
+
+    mismatches = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in SIZES:
+            db_file = os.path.join(tmp, f"words_{size}.db")
+            build_db(scaled_words(words, size), db_file, fts=False)
+            conn = sqlite3.connect(db_file)
+            categories = [row[0] for row in conn.execute("SELECT DISTINCT category FROM words")]
+
+            def run(load):
+                return [load(conn, category, language)
+                        for language in LANGUAGES for category in categories]
+
+            decoded, json_time = best_time(lambda: run(json_load_category), repeat)
+            joined, join_time = best_time(lambda: run(join_load_category), repeat)
+            if decoded != joined:
+                mismatches += 1
+            lists = len(categories) * len(LANGUAGES)
+            print(f"{size:7d} words, {lists} category lists: "
+                  f"JSON decode {json_time * 1000:8.2f} ms, join {join_time * 1000:8.2f} ms "
+                  f"({json_time / join_time:.1f}x)" + ("" if decoded == joined else "  MISMATCH"))
+            conn.close()
+
+    if mismatches:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+앱용 SQLite DB(daily_japanese.db) 미리 만들기
+
+앱의 첫 실행 시 DatabaseHelper._loadInitialData가 단어마다 db.insert를 기다리는 대신,
+같은 내용의 DB 파일을 파이프라인에서 만들어 복사만 하도록 한다.
+
+- 스키마는 lib/db/database_helper.dart의 _createDB에 있는 CREATE 문을 그대로 읽어 사용
+- 행 변환은 _loadInitialData와 동일 (word_row). 입력은 normalize_words로 정규화/검증한 뒤 사용
+- 한 트랜잭션에서 executemany로 넣은 뒤 VACUUM / ANALYZE
+- PRAGMA user_version을 openDatabase(version: N)과 맞춰 onCreate가 다시 실행되지 않게 함
+- 생성한 DB와 Dart 스키마로 만든 빈 DB의 테이블/컬럼/인덱스를 비교하여 검증
+- 검색용 FTS5 테이블 words_fts (trigram 토크나이저, 단어/읽기/뜻/번역 전체)
+- translations 테이블에 언어별 뜻/예문 번역을 미리 채움 (createdAt = 0).
+  words.translations JSON은 기존 앱 코드 호환을 위해 그대로 둔다.
+
+사용 예:
+  python build_db.py
+  python build_db.py --verify assets/data/daily_japanese.db
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import time
+
+from normalize_words import TRANSLATION_FIELDS, load_normalized
+
+DART_HELPER = "lib/db/database_helper.dart"
+
+def dart_schema(dart_file=DART_HELPER):
+    """_createDB의 CREATE 문 목록과 openDatabase의 version"""
+    with open(dart_file, "r", encoding="utf-8") as f:
+        source = f.read()
+    body = re.search(r"Future _createDB\(.*?\{(.*?)\n  \}", source, re.S).group(1)
+    statements = [" ".join(sql.split()) for sql in re.findall(r"db\.execute\('''(.*?)'''\)", body, re.S)]
+    version = int(re.search(r"version:\s*(\d+)", source).group(1))
+    return statements, version
+
+def word_row(word):
+    """_loadInitialData와 같은 규칙으로 words 행 만들기"""
+    translations = {}
+    for code, (field, example_field) in TRANSLATION_FIELDS.items():
+        if word.get(field) is not None:
+            example = word.get(example_field)
+            translations[code] = {
+                "definition": str(word[field]),
+                "example": "" if example is None else str(example),
+            }
+    translations_json = None
+    if translations:
+        # Dart json.encode와 같은 형식 (공백 없음, 비ASCII 그대로)
+        translations_json = json.dumps(translations, ensure_ascii=False, separators=(",", ":"))
+
+    def first(*keys):
+        for key in keys:
+            if word.get(key) is not None:
+                return word[key]
+        return ""
+
+    return (
+        word.get("id"),
+        first("word"),
+        first("kanji", "word"),
+        first("hiragana", "reading"),
+        word.get("category") if word.get("category") is not None else "daily",
+        first("part_of_speech"),
+        first("definition"),
+        first("example_en", "example"),
+        first("example_jp"),
+        first("example_reading"),
+        0,
+        translations_json,
+    )
+
+# 검색 색인 (rowid = words.id). trigram은 띄어쓰기 없는 일본어도 부분 문자열로 찾을 수 있다.
+FTS_TABLE = "words_fts"
+FTS_COLUMNS = ("word", "hiragana", "definition", "ko", "zh", "es", "vi")
+# 현재 앱 검색(searchWords)이 보는 컬럼
+SEARCH_COLUMNS = ("word", "hiragana", "definition")
+
+WORD_COLUMNS = ("id", "word", "kanji", "hiragana", "category", "partOfSpeech", "definition",
+                "example", "example_jp", "example_reading", "isFavorite", "translations")
+# words 행(튜플)에서 컬럼 위치
+COLUMN_INDEX = {column: index for index, column in enumerate(WORD_COLUMNS)}
+_ID = COLUMN_INDEX["id"]
+_TRANSLATIONS = COLUMN_INDEX["translations"]
+_FTS_TEXT = tuple(COLUMN_INDEX[column] for column in ("word", "hiragana", "definition"))
+
+def fts_row(row):
+    """words 행 -> words_fts 행 (rowid, word, hiragana, definition, 언어별 번역)"""
+    translations = json.loads(row[_TRANSLATIONS]) if row[_TRANSLATIONS] else {}
+    return (row[_ID], *(row[index] for index in _FTS_TEXT),
+            *(translations.get(code, {}).get("definition", "") for code in TRANSLATION_FIELDS))
+
+def build_fts(conn, rows):
+    conn.execute(f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5({', '.join(FTS_COLUMNS)}, tokenize='trigram')")
+    placeholders = ", ".join("?" * (len(FTS_COLUMNS) + 1))
+    conn.executemany(f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(FTS_COLUMNS)}) VALUES ({placeholders})",
+                     (fts_row(row) for row in rows))
+    conn.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+
+def search_words(conn, query, columns=SEARCH_COLUMNS):
+    """searchWords와 같은 결과를 FTS로 찾는 참조 쿼리 (words 행, word 순)
+
+    trigram 색인은 3글자 미만을 찾지 못하므로 그때는 기존 LIKE 쿼리를 쓴다.
+    """
+    if len(query) < 3:
+        where = " OR ".join(f"{column} LIKE ?" for column in columns)
+        return conn.execute(f"SELECT * FROM words WHERE {where} ORDER BY word ASC",
+                            [f"%{query}%"] * len(columns)).fetchall()
+    phrase = '"' + query.replace('"', '""') + '"'
+    return conn.execute(
+        f"SELECT words.* FROM {FTS_TABLE} JOIN words ON words.id = {FTS_TABLE}.rowid "
+        f"WHERE {FTS_TABLE} MATCH ? ORDER BY words.word ASC",
+        (f"{{{' '.join(columns)}}} : {phrase}",)).fetchall()
+
+def translation_rows(rows):
+    """words 행 -> translations 행 (wordId, languageCode, fieldType, translatedText, createdAt)
+
+    fieldType은 앱의 getTranslation과 같은 'definition' / 'example'이며 빈 번역은 넣지 않는다.
+    createdAt 0은 앱 실행 중 번역 API로 저장한 행과 구분하기 위한 값이다.
+    """
+    for row in rows:
+        if not row[_TRANSLATIONS]:
+            continue
+        for code, texts in json.loads(row[_TRANSLATIONS]).items():
+            for field_type in ("definition", "example"):
+                if texts.get(field_type):
+                    yield (row[_ID], code, field_type, texts[field_type], 0)
+
+def load_words_by_category(conn, category, language):
+    """카테고리 단어 목록 + 해당 언어 번역 (JSON 디코딩 없이 인덱스 조인 한 번)
+
+    반환값: (translations를 뺀 words 컬럼..., translatedDefinition, translatedExample) 목록, id 순
+    """
+    columns = ", ".join(f"words.{column}" for column in WORD_COLUMNS if column != "translations")
+    return conn.execute(
+        f"SELECT {columns}, d.translatedText, e.translatedText FROM words "
+        "LEFT JOIN translations d ON d.wordId = words.id AND d.languageCode = ?1 AND d.fieldType = 'definition' "
+        "LEFT JOIN translations e ON e.wordId = words.id AND e.languageCode = ?1 AND e.fieldType = 'example' "
+        "WHERE words.category = ?2 ORDER BY words.id ASC",
+        (language, category)).fetchall()
+
+def build_db(words, db_file, dart_file=DART_HELPER, fts=True):
+    """words로 DB 파일 생성 (임시 파일에 만든 뒤 교체)"""
+    statements, version = dart_schema(dart_file)
+    tmp_file = db_file + ".tmp"
+    if os.path.exists(tmp_file):
+        os.remove(tmp_file)
+
+    conn = sqlite3.connect(tmp_file)
+    with conn:
+        for sql in statements:
+            conn.execute(sql)
+        placeholders = ", ".join("?" * len(WORD_COLUMNS))
+        rows = [word_row(word) for word in words]
+        conn.executemany(f"INSERT INTO words ({', '.join(WORD_COLUMNS)}) VALUES ({placeholders})", rows)
+        conn.executemany("INSERT INTO translations (wordId, languageCode, fieldType, translatedText, createdAt) "
+                         "VALUES (?, ?, ?, ?, ?)", translation_rows(rows))
+        if fts:
+            build_fts(conn, rows)
+    conn.execute(f"PRAGMA user_version = {version}")
+    conn.execute("VACUUM")
+    conn.execute("ANALYZE")
+    conn.commit()
+    conn.close()
+    os.replace(tmp_file, db_file)
+
+def describe_schema(conn):
+    """비교용 스키마 요약: 테이블 컬럼, 인덱스 컬럼, user_version"""
+    schema = {"user_version": conn.execute("PRAGMA user_version").fetchone()[0]}
+    for kind, name, table in conn.execute(
+            "SELECT type, name, tbl_name FROM sqlite_master "
+            "WHERE type IN ('table', 'index') AND name NOT LIKE 'sqlite_%' ORDER BY name"):
+        if kind == "table":
+            schema[f"table {name}"] = conn.execute(f"PRAGMA table_info({name})").fetchall()
+        else:
+            columns = [row[2] for row in conn.execute(f"PRAGMA index_info({name})")]
+            schema[f"index {name}"] = (table, columns)
+    return schema
+
+def verify_schema(db_file, dart_file=DART_HELPER):
+    """DB 스키마가 Dart _createDB와 같은지 확인. 차이 목록 반환 (없으면 빈 목록)"""
+    statements, version = dart_schema(dart_file)
+    expected_conn = sqlite3.connect(":memory:")
+    for sql in statements:
+        expected_conn.execute(sql)
+    expected_conn.execute(f"PRAGMA user_version = {version}")
+    expected = describe_schema(expected_conn)
+    expected_conn.close()
+
+    conn = sqlite3.connect(db_file)
+    actual = describe_schema(conn)
+    conn.close()
+
+    problems = []
+    for key in sorted(set(expected) | set(actual)):
+        if key not in expected and key.startswith(f"table {FTS_TABLE}"):
+            continue  # 파이프라인이 추가하는 검색 색인 (및 FTS5 내부 테이블)
+        if key not in actual:
+            problems.append(f"missing {key}")
+        elif key not in expected:
+            problems.append(f"unexpected {key}")
+        elif expected[key] != actual[key]:
+            problems.append(f"{key}: expected {expected[key]}, got {actual[key]}")
+    return problems
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="앱용 SQLite DB 미리 만들기")
+    parser.add_argument("--input", default="assets/data/words.json")
+    parser.add_argument("--output", default="assets/data/daily_japanese.db")
+    parser.add_argument("--dart", default=DART_HELPER, help="스키마를 읽을 database_helper.dart")
+    parser.add_argument("--verify", metavar="DB", help="DB를 만들지 않고 스키마만 검증")
+    parser.add_argument("--no-fts", action="store_true", help="검색 색인(words_fts)을 만들지 않음")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if not args.verify:
+        words, _ = load_normalized(args.input)
+        start = time.perf_counter()
+        build_db(words, args.output, args.dart, fts=not args.no_fts)
+        print(f"Built {args.output}: {len(words)} words in {time.perf_counter() - start:.2f}s "
+              f"({os.path.getsize(args.output) / 1024:.1f} KB)")
+
+    db_file = args.verify or args.output
+    problems = verify_schema(db_file, args.dart)
+    if problems:
+        print(f"Schema mismatch with {args.dart}:")
+        for problem in problems:
+            print(f"  {problem}")
+        raise SystemExit(1)
+    print(f"Schema matches {args.dart}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+의성어/의태어 콘텐츠 파이프라인 증분 빌드
+
+  extract    JMdict_e.xml                  -> onomatopoeia_data.json
+  match      onomatopoeia_data.json        -> onomatopoeia_with_examples.json  (+ Tatoeba)
+  categorize onomatopoeia_with_examples.json -> onomatopoeia_final.json
+  convert    onomatopoeia_final.json       -> onomatopoeia_app.json
+
+각 단계의 설정 지문(키워드 테이블, 매핑, 원본 파일)과 입력 파일 해시를
+.pipeline_state.json에 기록하여 입력과 설정이 그대로인 단계는 건너뛴다.
+단어 단위 결과는 stage_cache(.stage_cache.sqlite)에 단계별로 저장되어
+바뀐 단어만 다시 계산한다 (각 스크립트를 따로 실행할 때와 캐시를 공유).
+
+사용 예:
+  python build_pipeline.py              # 전체
+  python build_pipeline.py categorize   # categorize와 그 선행 단계만
+  python build_pipeline.py --force convert
+"""
+
+import argparse
+import hashlib
+import json
+import os
+
+from categorize_and_translate import KOREAN_DICT, RECATEGORY_KEYWORDS, categorize_and_translate
+from convert_to_app_format import CATEGORY_MAPPING, convert_item
+from extract_onomatopoeia import CATEGORY_KEYWORDS, ONOMATOPOEIA_TAGS, TAG_FIELDS, iter_jmdict_words
+from id_registry import ONOMATOPOEIA_REGISTRY_FILE, IdRegistry
+from json_stream import write_json_array
+from process_tatoeba import corpus_sources, load_corpus, match_examples
+from stage_cache import DEFAULT_CACHE_FILE, StageCache, fingerprint, run_incremental
+from tatoeba_cache import source_hash
+
+STATE_FILE = ".pipeline_state.json"
+
+def file_fingerprint(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def save_json(data, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+def build_stages(args):
+    """단계 정의 (선행 단계가 항상 앞에 오는 순서)
+
+    단어 단위 단계의 process(records, cache, force)는 같은 순서의 출력 목록을 반환한다.
+    config는 입력 파일이 그대로일 때 단계 전체를 건너뛸지 판단하는 데 쓴다.
+    """
+    def match(records, cache, force):
+        return match_examples(records, lambda: load_corpus(args.tatoeba_cache), args.matcher,
+                              args.max_examples, args.workers, cache, force)
+
+    def convert(records, cache, force):
+        return run_incremental(cache, "convert", records,
+                               lambda items: [convert_item(item) for item in items],
+                               CATEGORY_MAPPING, force)
+
+    def extract():
+        # id는 JMdict 순번 대신 레지스트리에서 (extract_onomatopoeia.py와 같은 파일 사용)
+        registry = IdRegistry(ONOMATOPOEIA_REGISTRY_FILE, fields=("word", "reading"))
+        write_json_array(registry.assign_iter(iter_jmdict_words(args.jmdict, ONOMATOPOEIA_TAGS, TAG_FIELDS)),
+                         "onomatopoeia_data.json")
+        registry.save()
+
+    return [
+        {
+            "name": "extract",
+            "deps": [],
+            "output": "onomatopoeia_data.json",
+            "config": lambda: fingerprint([ONOMATOPOEIA_TAGS, list(TAG_FIELDS), CATEGORY_KEYWORDS,
+                                           source_hash([args.jmdict]).hex()]),
+            "run": extract,
+        },
+        {
+            "name": "match",
+            "deps": ["extract"],
+            "input": "onomatopoeia_data.json",
+            "output": "onomatopoeia_with_examples.json",
+            # 첫 예문만 사용하므로 matcher/max-examples는 결과에 영향이 없음
+            "config": lambda: fingerprint(source_hash(corpus_sources().values()).hex()),
+            "process": match,
+        },
+        {
+            "name": "categorize",
+            "deps": ["match"],
+            "input": "onomatopoeia_with_examples.json",
+            "output": "onomatopoeia_final.json",
+            "config": lambda: fingerprint([RECATEGORY_KEYWORDS, KOREAN_DICT]),
+            "process": categorize_and_translate,
+        },
+        {
+            "name": "convert",
+            "deps": ["categorize"],
+            "input": "onomatopoeia_final.json",
+            "output": "onomatopoeia_app.json",
+            "config": lambda: fingerprint(CATEGORY_MAPPING),
+            "process": convert,
+        },
+    ]
+
+def select_stages(stages, targets):
+    """targets와 그 선행 단계 (targets가 비어 있으면 전체)"""
+    if not targets:
+        return stages
+    by_name = {stage["name"]: stage for stage in stages}
+    needed = set()
+    todo = list(targets)
+    while todo:
+        name = todo.pop()
+        if name not in needed:
+            needed.add(name)
+            todo.extend(by_name[name]["deps"])
+    return [stage for stage in stages if stage["name"] in needed]
+
+def run_file_stage(stage, state, force=False):
+    """입력 파일 하나를 통째로 처리하는 단계 (extract)"""
+    name = stage["name"]
+    config = stage["config"]()
+    previous = state.get(name, {})
+    if not force and previous.get("config") == config and os.path.exists(stage["output"]):
+        print(f"[{name}] up to date")
+        return
+    print(f"[{name}] running...")
+    stage["run"]()
+    state[name] = {"config": config}
+    print(f"[{name}] wrote {stage['output']}")
+
+def run_record_stage(stage, state, cache, force=False):
+    """단어 단위 단계: 입력/설정이 그대로면 건너뛰고, 아니면 바뀐 단어만 다시 계산"""
+    name = stage["name"]
+    config = stage["config"]()
+    input_hash = file_fingerprint(stage["input"])
+    previous = state.get(name, {})
+    if (not force and previous.get("config") == config and previous.get("input") == input_hash
+            and os.path.exists(stage["output"])):
+        print(f"[{name}] up to date")
+        return
+
+    print(f"[{name}] running...")
+    outputs = stage["process"](load_json(stage["input"]), cache, force)
+    save_json(outputs, stage["output"])
+    state[name] = {"config": config, "input": input_hash}
+    print(f"[{name}] wrote {stage['output']}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="의성어/의태어 파이프라인 증분 빌드")
+    parser.add_argument("targets", nargs="*",
+                        help="실행할 단계 extract/match/categorize/convert (선행 단계 포함, 기본: 전체)")
+    parser.add_argument("--force", action="store_true", help="지정한 단계(없으면 전체)를 처음부터 다시 계산")
+    parser.add_argument("--state", default=STATE_FILE, help="빌드 상태 파일")
+    parser.add_argument("--stage-cache", default=DEFAULT_CACHE_FILE, help="단어별 결과 캐시")
+    parser.add_argument("--jmdict", default="JMdict_e.xml")
+    parser.add_argument("--tatoeba-cache", default="tatoeba_cache.bin",
+                        help="전처리 코퍼스 캐시 파일 (process_tatoeba.py --cache)")
+    parser.add_argument("--matcher", choices=["index", "automaton"], default="index")
+    parser.add_argument("--max-examples", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=1)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    stages = build_stages(args)
+    unknown = set(args.targets) - {stage["name"] for stage in stages}
+    if unknown:
+        raise SystemExit(f"Unknown stage: {', '.join(sorted(unknown))}")
+    state = load_json(args.state) if os.path.exists(args.state) else {}
+    cache = StageCache(args.stage_cache)
+
+    for stage in select_stages(stages, args.targets):
+        force = args.force and (not args.targets or stage["name"] in args.targets)
+        if "process" in stage:
+            run_record_stage(stage, state, cache, force)
+        else:
+            run_file_stage(stage, state, force)
+        # 단계마다 저장 (중간에 중단되어도 끝난 단계는 유지)
+        save_json(state, args.state)
+    cache.close()
+
+if __name__ == "__main__":
+    main()
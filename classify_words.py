@@ -13,10 +13,16 @@ GPT-4o mini API 사용
 - basic: 기본 동사/형용사/부사
 """
 
+import argparse
 import json
 import os
+import sys
 from openai import OpenAI
 
+from batch_journal import run_batches
+from llm_cache import ResponseCache, cached_completion
+from token_budget import estimate_tokens, pack_batches
+
 # OpenAI API 키 설정 (환경변수 또는 직접 입력)
 api_key = os.getenv("OPENAI_API_KEY")
 if not api_key:
@@ -24,6 +30,9 @@ if not api_key:
 
 client = OpenAI(api_key=api_key)
 
+# 응답 캐시 (재실행 시 같은 배치는 API를 다시 호출하지 않음)
+cache = ResponseCache()
+
 # 카테고리 정의
 CATEGORIES = {
     "daily": "일상생활 (집, 가구, 시간, 숫자, 색깔, 위치 등)",
@@ -36,7 +45,34 @@ CATEGORIES = {
     "basic": "기본 동사, 형용사, 부사, 조사 (다른 카테고리에 맞지 않는 경우)"
 }
 
-def classify_words_batch(words, batch_size=50):
+MAX_TOKENS = 4000
+
+class TruncatedResponse(Exception):
+    """max_tokens에 걸려 응답이 잘림 (배치를 나눠 다시 요청해야 함)"""
+
+def parse_classification(response):
+    """응답에서 {"word": "category"} JSON 추출"""
+    if response.get("finish_reason") == "length":
+        raise TruncatedResponse("response hit max_tokens")
+    result_text = response["content"].strip()
+    
+    # JSON 추출 (```json 블록이 있을 경우 처리)
+    if "```json" in result_text:
+        result_text = result_text.split("```json")[1].split("```")[0].strip()
+    elif "```" in result_text:
+        result_text = result_text.split("```")[1].split("```")[0].strip()
+    
+    return json.loads(result_text)
+
+def word_line(w):
+    return f"{w['word']} ({w['reading']}): {w['definition']}"
+
+def word_costs(w):
+    """(프롬프트 토큰, 응답 토큰) 추정 - 응답은 "word": "category", 한 항목"""
+    return (estimate_tokens(word_line(w)) + 1,
+            estimate_tokens(f'"{w["word"]}": "shopping",') + 2)
+
+def classify_words_batch(words):
     """단어 배치를 GPT-4o mini로 분류"""
     
     categories_desc = "\n".join([f"- {k}: {v}" for k, v in CATEGORIES.items()])
@@ -54,38 +90,77 @@ JSON 형식으로 응답해주세요: {{"word": "category", ...}}
     
     word_list = []
     for w in words:
-        word_list.append(f"{w['word']} ({w['reading']}): {w['definition']}")
+        word_list.append(word_line(w))
     
     prompt += "\n".join(word_list)
     
+    request = {
+        "model": "gpt-4o-mini",
+        "messages": [
+            {"role": "system", "content": "You are a Japanese language expert. Classify Japanese words into categories. Respond only with valid JSON."},
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": 0.3,
+        "max_tokens": MAX_TOKENS
+    }
+    
+    # 실패는 호출한 쪽(배치 실행기)이 재시도하도록 예외를 그대로 전달
+    return cached_completion(client, cache, request, parse=parse_classification)
+
+def word_key(w):
+    """저널 항목 키 (입력 파일이 바뀌어도 다른 단어와 섞이지 않도록 id + 단어)"""
+    return f"{w['id']}:{w['word']}"
+
+def classify_batch(batch):
+    """배치 분류 -> {word key: category}
+
+    응답이 잘리면 배치를 반으로 나눠 바로 다시 요청하고,
+    응답 전체가 비거나 파싱에 실패하면 예외 (배치 재시도),
+    응답에서 빠진 단어는 결과에서 제외 (해당 단어만 재시도).
+    """
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a Japanese language expert. Classify Japanese words into categories. Respond only with valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=4000
-        )
-        
-        result_text = response.choices[0].message.content.strip()
-        
-        # JSON 추출 (```json 블록이 있을 경우 처리)
-        if "```json" in result_text:
-            result_text = result_text.split("```json")[1].split("```")[0].strip()
-        elif "```" in result_text:
-            result_text = result_text.split("```")[1].split("```")[0].strip()
-        
-        return json.loads(result_text)
+        classifications = classify_words_batch(batch)
+    except (TruncatedResponse, json.JSONDecodeError) as e:
+        if len(batch) == 1:
+            raise
+        half = len(batch) // 2
+        print(f"  ↳ {type(e).__name__} for {len(batch)} words, splitting into {half} + {len(batch) - half}")
+        results = classify_batch(batch[:half])
+        results.update(classify_batch(batch[half:]))
+        return results
+    if not classifications:
+        raise ValueError("empty classification response")
     
-    except Exception as e:
-        print(f"Error: {e}")
-        return {}
+    results = {}
+    for w in batch:
+        if w['word'] not in classifications:
+            continue
+        category = classifications[w['word']]
+        
+        # 유효한 카테고리인지 확인
+        if category not in CATEGORIES:
+            category = "basic"
+        results[word_key(w)] = category
+    return results
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="JLPT 단어 카테고리 분류 (중단 후 이어하기 지원)")
+    parser.add_argument("--input", default=r"c:\Users\hooni\Desktop\jlpt_vocab_app\assets\data\words_n5_n3.json")
+    parser.add_argument("--output", default=r"c:\Users\hooni\Desktop\daily_japanese_app\assets\data\words.json")
+    parser.add_argument("--journal", default="classify_journal.jsonl", help="완료된 배치 저널 (JSONL)")
+    parser.add_argument("--max-batch-size", type=int, default=150, help="배치당 최대 단어 수")
+    parser.add_argument("--prompt-budget", type=int, default=6000, help="배치당 단어 목록 프롬프트 토큰 예산")
+    parser.add_argument("--response-budget", type=int, default=int(MAX_TOKENS * 0.8),
+                        help="배치당 예상 응답 토큰 예산 (max_tokens보다 여유 있게)")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 요청 수")
+    parser.add_argument("--retries", type=int, default=3, help="실패한 배치 재시도 횟수")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    
     # JLPT N5-N4 데이터 로드
-    input_path = r"c:\Users\hooni\Desktop\jlpt_vocab_app\assets\data\words_n5_n3.json"
+    input_path = args.input
     
     with open(input_path, 'r', encoding='utf-8') as f:
         all_words = json.load(f)
@@ -94,44 +169,40 @@ def main():
     words = [w for w in all_words if w.get('level') in ['N5', 'N4']]
     print(f"Total words to classify: {len(words)}")
     
-    # 배치로 분류
-    batch_size = 40
-    classified_words = []
+    # 토큰 예산에 맞춰 배치로 분류 (완료된 배치는 저널에 기록, 실패한 배치는 재시도)
+    categories, unresolved = run_batches(
+        words, classify_batch, args.journal, word_key,
+        make_batches=lambda items: pack_batches(
+            items, word_costs, (args.prompt_budget, args.response_budget), args.max_batch_size),
+        max_retries=args.retries, concurrency=args.concurrency)
     
-    for i in range(0, len(words), batch_size):
-        batch = words[i:i+batch_size]
-        print(f"Processing batch {i//batch_size + 1}/{(len(words)-1)//batch_size + 1}...")
-        
-        classifications = classify_words_batch(batch)
-        
-        for w in batch:
-            word_key = w['word']
-            category = classifications.get(word_key, "basic")
-            
-            # 유효한 카테고리인지 확인
-            if category not in CATEGORIES:
-                category = "basic"
-            
-            classified_word = {
-                "id": w['id'],
-                "word": w['word'],
-                "reading": w['reading'],
-                "definition": w['definition'],
-                "category": category,
-                "korean": w.get('korean', ''),
-                "chinese": w.get('chinese', ''),
-                "spanish": "",  # 나중에 추가
-                "vietnamese": "",  # 나중에 추가
-                "example": w.get('example', ''),
-                "example_reading": w.get('example_reading', ''),
-                "example_meaning": w.get('example_meaning', ''),
-                "level": w.get('level', 'N5')
-            }
-            classified_words.append(classified_word)
+    if unresolved:
+        print(f"\n✗ {len(unresolved)} words could not be classified after {args.retries} retries.")
+        print(f"  Completed batches are saved in {args.journal}; run again to resume.")
+        sys.exit(1)
+    
+    classified_words = []
+    for w in words:
+        classified_word = {
+            "id": w['id'],
+            "word": w['word'],
+            "reading": w['reading'],
+            "definition": w['definition'],
+            "category": categories[word_key(w)],
+            "korean": w.get('korean', ''),
+            "chinese": w.get('chinese', ''),
+            "spanish": "",  # 나중에 추가
+            "vietnamese": "",  # 나중에 추가
+            "example": w.get('example', ''),
+            "example_reading": w.get('example_reading', ''),
+            "example_meaning": w.get('example_meaning', ''),
+            "level": w.get('level', 'N5')
+        }
+        classified_words.append(classified_word)
     
     # 결과 저장
-    output_path = r"c:\Users\hooni\Desktop\daily_japanese_app\assets\data\words.json"
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    output_path = args.output
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
     
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(classified_words, f, ensure_ascii=False, indent=2)
@@ -148,6 +219,9 @@ def main():
     
     print(f"\nTotal: {len(classified_words)} words")
     print(f"Saved to: {output_path}")
+    
+    stats = cache.stats()
+    print(f"Response cache: {stats['hits']} hits, {stats['misses']} misses ({stats['entries']} entries)")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+words.json 두 버전의 차이(delta)로 DB 업데이트
+
+DatabaseHelper._upgradeDB는 버전이 바뀌면 테이블을 지우고 words.json 전체를 다시 넣어
+즐겨찾기(isFavorite)와 번역 캐시가 사라진다. 이 도구는 두 버전을 id 기준으로 비교해
+바뀐 행만 고치는 delta를 만든다.
+
+- 비교 단위는 build_db.word_row로 만든 words 행 (앱 DB에 들어가는 값 그대로)
+- delta: 삭제 id 목록, 추가 행, 수정(id -> 바뀐 컬럼만). 그대로 실행할 SQL로 저장
+- SQL은 먼저 DB의 words가 이전 버전인지(행 수, 최대 id, id 합, 단어/뜻 글자 수 합) 확인하고,
+  다르면 CHECK 제약 오류(delta_base_mismatch)로 트랜잭션 전체를 중단한다
+- SQL은 isFavorite를 건드리지 않고, translations(createdAt = 0 행)와 words_fts는
+  바뀐 단어만 words 행에서 다시 만든다 (json_extract / json_each 사용)
+- --verify: 이전/새 words.json으로 미리 만든 DB(build_db.py)를 만들고, 이전 DB에 즐겨찾기를
+  표시한 뒤 delta SQL을 적용한 결과가 새 DB와 같은지(즐겨찾기 유지 포함) 확인
+
+사용 예:
+  git show HEAD~1:assets/data/words.json > /tmp/old_words.json
+  python delta_update.py /tmp/old_words.json assets/data/words.json --output words_delta.sql --verify
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+
+from build_db import FTS_COLUMNS, FTS_TABLE, WORD_COLUMNS, build_db, verify_schema, word_row
+from normalize_words import TRANSLATION_FIELDS, load_normalized
+
+# delta가 다루는 컬럼 (isFavorite는 사용자 데이터라 제외)
+DELTA_COLUMNS = tuple(column for column in WORD_COLUMNS if column != "isFavorite")
+# 바뀌면 words_fts 행을 다시 만들어야 하는 컬럼
+FTS_SOURCE_COLUMNS = ("word", "hiragana", "definition", "translations")
+
+def word_rows(words):
+    """단어 목록 -> {id: {컬럼: 값}} (DB에 들어가는 값)"""
+    rows = {}
+    for word in words:
+        row = dict(zip(WORD_COLUMNS, word_row(word)))
+        rows[row["id"]] = {column: row[column] for column in DELTA_COLUMNS}
+    return rows
+
+def _length(value):
+    return 0 if value is None else len(str(value))
+
+def base_check(rows):
+    """delta를 적용할 DB의 words가 이 버전인지 확인할 값 (SQL의 _base_guard와 같은 계산)"""
+    return {
+        "count": len(rows),
+        "max_id": max(rows, default=0),
+        "id_sum": sum(rows),
+        "text_length": sum(_length(row["word"]) + _length(row["definition"]) for row in rows.values()),
+    }
+
+def diff_words(old_words, new_words):
+    """두 버전의 words 행 비교 -> delta dict"""
+    old_rows = word_rows(old_words)
+    new_rows = word_rows(new_words)
+    delta = {
+        "base": base_check(old_rows),
+        "delete": sorted(set(old_rows) - set(new_rows)),
+        "insert": [new_rows[word_id] for word_id in sorted(set(new_rows) - set(old_rows))],
+        "update": {},
+    }
+    for word_id in sorted(set(old_rows) & set(new_rows)):
+        old, new = old_rows[word_id], new_rows[word_id]
+        changed = {column: new[column] for column in DELTA_COLUMNS if old[column] != new[column]}
+        if changed:
+            delta["update"][word_id] = changed
+    return delta
+
+def _literal(value):
+    if value is None:
+        return "NULL"
+    if isinstance(value, int):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+def _id_list(ids):
+    return "(" + ", ".join(str(word_id) for word_id in ids) + ")"
+
+def _base_guard(base):
+    """DB가 이전 버전이 아니면 CHECK 제약 오류로 중단하는 SQL"""
+    return [
+        "DROP TABLE IF EXISTS temp.delta_base",
+        "CREATE TEMP TABLE delta_base (ok INTEGER NOT NULL CONSTRAINT delta_base_mismatch CHECK (ok = 1))",
+        f"INSERT INTO temp.delta_base (ok) SELECT count(*) = {base['count']} "
+        f"AND coalesce(max(id), 0) = {base['max_id']} AND coalesce(sum(id), 0) = {base['id_sum']} "
+        "AND coalesce(sum(length(coalesce(word, '')) + length(coalesce(definition, ''))), 0) = "
+        f"{base['text_length']} FROM words",
+        "DROP TABLE temp.delta_base",
+    ]
+
+def delta_sql(delta, fts=True):
+    """delta -> 실행할 SQL 문자열 (한 트랜잭션 안에서 실행)"""
+    statements = _base_guard(delta["base"])
+    deleted = delta["delete"]
+    if deleted:
+        statements.append(f"DELETE FROM words WHERE id IN {_id_list(deleted)}")
+        statements.append(f"DELETE FROM translations WHERE wordId IN {_id_list(deleted)}")
+        if fts:
+            statements.append(f"DELETE FROM {FTS_TABLE} WHERE rowid IN {_id_list(deleted)}")
+
+    for word_id, changed in sorted(delta["update"].items()):
+        assignments = ", ".join(f"{column} = {_literal(value)}" for column, value in changed.items())
+        statements.append(f"UPDATE words SET {assignments} WHERE id = {word_id}")
+
+    for row in delta["insert"]:
+        values = ", ".join(_literal(row[column]) for column in DELTA_COLUMNS)
+        statements.append(f"INSERT INTO words ({', '.join(DELTA_COLUMNS)}) VALUES ({values})")
+
+    inserted = [row["id"] for row in delta["insert"]]
+    refresh_translations = sorted(inserted + [word_id for word_id, changed in delta["update"].items()
+                                              if "translations" in changed])
+    if refresh_translations:
+        ids = _id_list(refresh_translations)
+        # 미리 넣은 번역(createdAt = 0)만 교체, 앱에서 저장한 번역 캐시는 같은 필드가 아니면 유지
+        statements.append(f"DELETE FROM translations WHERE wordId IN {ids} AND createdAt = 0")
+        for field_type in ("definition", "example"):
+            statements.append(
+                "INSERT OR REPLACE INTO translations (wordId, languageCode, fieldType, translatedText, createdAt) "
+                f"SELECT words.id, t.key, '{field_type}', json_extract(t.value, '$.{field_type}'), 0 "
+                f"FROM words, json_each(words.translations) t WHERE words.id IN {ids} "
+                f"AND coalesce(json_extract(t.value, '$.{field_type}'), '') != ''")
+
+    refresh_fts = sorted(inserted + [word_id for word_id, changed in delta["update"].items()
+                                     if any(column in changed for column in FTS_SOURCE_COLUMNS)])
+    if fts and refresh_fts:
+        ids = _id_list(refresh_fts)
+        translated = ", ".join(f"coalesce(json_extract(translations, '$.{code}.definition'), '')"
+                               for code in TRANSLATION_FIELDS)
+        statements.append(f"DELETE FROM {FTS_TABLE} WHERE rowid IN {ids}")
+        statements.append(f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(FTS_COLUMNS)}) "
+                          f"SELECT id, word, hiragana, definition, {translated} FROM words WHERE id IN {ids}")
+
+    return "".join(statement + ";\n" for statement in statements)
+
+def apply_delta_sql(db_file, sql):
+    """delta SQL을 한 트랜잭션으로 적용 (이전 버전 DB가 아니면 sqlite3.IntegrityError, 아무것도 바꾸지 않음)"""
+    conn = sqlite3.connect(db_file)
+    try:
+        conn.executescript("BEGIN;\n" + sql + "COMMIT;\n")
+    finally:
+        conn.close()
+
+def verify_delta(old_db, new_db, sql, fts=True):
+    """이전 DB에 즐겨찾기를 표시하고 delta SQL을 적용해 새 DB와 비교. 차이 목록 반환"""
+    problems = []
+    with tempfile.TemporaryDirectory() as tmp:
+        patched_db = os.path.join(tmp, "patched.db")
+        shutil.copyfile(old_db, patched_db)
+        conn = sqlite3.connect(patched_db)
+        with conn:
+            conn.execute("UPDATE words SET isFavorite = 1 WHERE id % 7 = 0")
+        favorites = {row[0] for row in conn.execute("SELECT id FROM words WHERE isFavorite = 1")}
+        conn.close()
+
+        apply_delta_sql(patched_db, sql)
+
+        patched = sqlite3.connect(patched_db)
+        expected = sqlite3.connect(new_db)
+        columns = ", ".join(DELTA_COLUMNS)
+        checks = [
+            ("words", f"SELECT {columns} FROM words ORDER BY id"),
+            ("translations", "SELECT wordId, languageCode, fieldType, translatedText, createdAt "
+                             "FROM translations ORDER BY wordId, languageCode, fieldType"),
+        ]
+        if fts:
+            checks.append((FTS_TABLE, f"SELECT rowid, * FROM {FTS_TABLE} ORDER BY rowid"))
+        for name, query in checks:
+            actual_rows, expected_rows = patched.execute(query).fetchall(), expected.execute(query).fetchall()
+            if actual_rows != expected_rows:
+                differing = len(set(actual_rows) ^ set(expected_rows))
+                problems.append(f"{name}: {differing} rows differ")
+
+        kept = {row[0] for row in patched.execute("SELECT id FROM words WHERE isFavorite = 1")}
+        surviving = {row[0] for row in patched.execute("SELECT id FROM words")} & favorites
+        if kept != surviving:
+            problems.append(f"favorites: expected {len(surviving)} kept, got {len(kept)}")
+        if fts:
+            match = f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH ? ORDER BY rowid"
+            for query in ("します", "hospital"):
+                if patched.execute(match, (query,)).fetchall() != expected.execute(match, (query,)).fetchall():
+                    problems.append(f"{FTS_TABLE}: search '{query}' differs")
+        patched.close()
+        expected.close()
+        problems.extend(f"schema: {problem}" for problem in verify_schema(patched_db))
+    return problems
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="words.json 두 버전의 delta SQL 만들기")
+    parser.add_argument("old", help="이전 words.json")
+    parser.add_argument("new", help="새 words.json")
+    parser.add_argument("--output", default="words_delta.sql", help="delta SQL 파일")
+    parser.add_argument("--no-fts", action="store_true", help="검색 색인(words_fts) 갱신 SQL을 만들지 않음")
+    parser.add_argument("--verify", action="store_true",
+                        help="이전 DB에 delta를 적용한 결과가 새 DB와 같은지 확인")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    fts = not args.no_fts
+    old_words, _ = load_normalized(args.old)
+    new_words, _ = load_normalized(args.new)
+
+    delta = diff_words(old_words, new_words)
+    sql = delta_sql(delta, fts)
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(sql)
+    touched = len(delta["delete"]) + len(delta["insert"]) + len(delta["update"])
+    print(f"Delete: {len(delta['delete'])}, insert: {len(delta['insert'])}, "
+          f"update: {len(delta['update'])} ({touched} of {len(new_words)} words touched)")
+    print(f"Saved to {args.output} ({os.path.getsize(args.output) / 1024:.1f} KB)")
+
+    if args.verify:
+        with tempfile.TemporaryDirectory() as tmp:
+            old_db = os.path.join(tmp, "old.db")
+            new_db = os.path.join(tmp, "new.db")
+            build_db(old_words, old_db, fts=fts)
+            build_db(new_words, new_db, fts=fts)
+            problems = verify_delta(old_db, new_db, sql, fts)
+            print(f"Full DB: {os.path.getsize(new_db) / 1024:.1f} KB")
+        if problems:
+            print("Delta does not reproduce the new DB:")
+            for problem in problems:
+                print(f"  {problem}")
+            raise SystemExit(1)
+        print("Verified: old DB + delta == new DB (favorites kept)")
+
+if __name__ == "__main__":
+    main()
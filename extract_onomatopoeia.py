@@ -1,38 +1,59 @@
 #!/usr/bin/env python3
 """
 JMdict에서 의성어/의태어(on-mim) 추출
+id는 JMdict 안의 순번이 아니라 id 레지스트리(onomatopoeia_ids.json)에서 받는다 (사전이 갱신되어도 유지).
+레지스트리는 커밋하지 않으므로 id는 같은 작업 디렉터리에서 다시 실행할 때만 유지된다.
+--tag로 다른 태그를 추출하면 태그별 레지스트리(jmdict_<태그>_ids.json)를 따로 쓴다.
 License: CC-BY-SA 4.0 (JMdict)
 """
 
+import argparse
 import xml.etree.ElementTree as ET
-import json
 import re
 
-def extract_onomatopoeia(xml_file):
-    print("Parsing JMdict XML...")
-    tree = ET.parse(xml_file)
-    root = tree.getroot()
-    
-    onomatopoeia_list = []
+from id_registry import ONOMATOPOEIA_REGISTRY_FILE, IdRegistry
+from json_stream import write_json_array
+from keyword_classifier import classify, compile_classifier
+
+# 기본 필터: 의성어/의태어 (pos/misc 태그 텍스트에 포함된 키워드)
+ONOMATOPOEIA_TAGS = ('onomatopoeic', 'mimetic')
+TAG_FIELDS = ('pos', 'misc')
+
+def iter_entries(xml_file):
+    """JMdict <entry>를 스트리밍으로 하나씩 생성
+
+    iterparse로 읽으며, 처리가 끝난 entry는 루트에서 제거해 메모리를 일정하게 유지한다.
+    """
+    context = ET.iterparse(xml_file, events=('start', 'end'))
+    _, root = next(context)
+    for event, elem in context:
+        if event == 'end' and elem.tag == 'entry':
+            yield elem
+            root.clear()
+
+def entry_has_tag(entry, keywords, fields=TAG_FIELDS):
+    """entry의 sense 중 fields 태그 텍스트에 keywords 중 하나가 있는지"""
+    for sense in entry.findall('sense'):
+        for field in fields:
+            for tag in sense.findall(field):
+                if tag.text and any(k in tag.text.lower() for k in keywords):
+                    return True
+    return False
+
+def registry_file_for(keywords):
+    """태그 키워드별 id 레지스트리 파일 (기본 태그면 onomatopoeia_ids.json)"""
+    keywords = sorted({k.lower() for k in keywords})
+    if keywords == sorted(ONOMATOPOEIA_TAGS):
+        return ONOMATOPOEIA_REGISTRY_FILE
+    return "jmdict_" + "_".join(re.sub(r'[^0-9a-z]+', '-', k).strip('-') for k in keywords) + "_ids.json"
+
+def iter_jmdict_words(xml_file, keywords=ONOMATOPOEIA_TAGS, fields=TAG_FIELDS):
+    """keywords 태그가 붙은 JMdict 단어를 레코드로 하나씩 생성"""
+    keywords = tuple(k.lower() for k in keywords)
     word_id = 0
     
-    for entry in root.findall('entry'):
-        # Check if it's onomatopoeia (on-mim)
-        is_onomatopoeia = False
-        pos_tags = []
-        
-        for sense in entry.findall('sense'):
-            for pos in sense.findall('pos'):
-                if pos.text:
-                    pos_tags.append(pos.text)
-                    if 'onomatopoeic' in pos.text.lower() or 'mimetic' in pos.text.lower():
-                        is_onomatopoeia = True
-            
-            for misc in sense.findall('misc'):
-                if misc.text and ('onomatopoeic' in misc.text.lower() or 'mimetic' in misc.text.lower()):
-                    is_onomatopoeia = True
-        
-        if not is_onomatopoeia:
+    for entry in iter_entries(xml_file):
+        if not entry_has_tag(entry, keywords, fields):
             continue
         
         word_id += 1
@@ -50,7 +71,6 @@ def extract_onomatopoeia(xml_file):
         
         # Get definitions
         definitions = []
-        examples = []
         
         for sense in entry.findall('sense'):
             for gloss in sense.findall('gloss'):
@@ -65,7 +85,7 @@ def extract_onomatopoeia(xml_file):
         # Categorize based on content
         category = categorize_onomatopoeia(word, reading, definition)
         
-        onomatopoeia_list.append({
+        yield {
             "id": word_id,
             "word": word,
             "reading": reading,
@@ -77,99 +97,90 @@ def extract_onomatopoeia(xml_file):
             "example_reading": "",
             "example_meaning": "",
             "source": "JMdict (CC-BY-SA 4.0)"
-        })
-    
-    return onomatopoeia_list
+        }
 
-def categorize_onomatopoeia(word, reading, definition):
-    """카테고리 분류"""
-    definition_lower = definition.lower()
-    
+def extract_onomatopoeia(xml_file):
+    print("Parsing JMdict XML...")
+    return list(iter_jmdict_words(xml_file))
+
+# 카테고리 키워드 테이블 (우선순위 순)
+CATEGORY_KEYWORDS = [
     # 소리 관련 (의성어)
-    sound_keywords = ['sound', 'noise', 'cry', 'bang', 'crash', 'ring', 'splash', 'thud', 
-                      'knock', 'click', 'crackle', 'rumble', 'roar', 'buzz', 'hum']
+    ("소리 (Sound)", ['sound', 'noise', 'cry', 'bang', 'crash', 'ring', 'splash', 'thud',
+                    'knock', 'click', 'crackle', 'rumble', 'roar', 'buzz', 'hum']),
+    
+    # 동물 소리
+    ("동물 소리 (Animal Sounds)", ['bark', 'meow', 'chirp', 'tweet', 'growl', 'howl', 'squeak',
+                               'animal', 'dog', 'cat', 'bird', 'crow', 'cock']),
     
     # 움직임/동작
-    motion_keywords = ['walk', 'run', 'move', 'roll', 'spin', 'shake', 'wobble', 'sway',
-                       'jump', 'bounce', 'tumble', 'slip', 'slide', 'rush', 'dash']
+    ("움직임 (Motion)", ['walk', 'run', 'move', 'roll', 'spin', 'shake', 'wobble', 'sway',
+                      'jump', 'bounce', 'tumble', 'slip', 'slide', 'rush', 'dash']),
     
     # 감정/심리
-    emotion_keywords = ['feel', 'nervous', 'anxious', 'excited', 'happy', 'sad', 'angry',
-                        'worry', 'thrill', 'flutter', 'pound', 'heart', 'irritat', 'frustrat']
+    ("감정 (Emotion)", ['feel', 'nervous', 'anxious', 'excited', 'happy', 'sad', 'angry',
+                      'worry', 'thrill', 'flutter', 'pound', 'heart', 'irritat', 'frustrat']),
     
     # 상태/모양
-    state_keywords = ['shiny', 'sparkle', 'glitter', 'smooth', 'rough', 'soft', 'hard',
-                      'wet', 'dry', 'sticky', 'slippery', 'fluffy', 'crisp', 'damp']
+    ("상태/모양 (State/Appearance)", ['shiny', 'sparkle', 'glitter', 'smooth', 'rough', 'soft', 'hard',
+                                  'wet', 'dry', 'sticky', 'slippery', 'fluffy', 'crisp', 'damp']),
     
     # 먹기/맛
-    eating_keywords = ['eat', 'chew', 'gulp', 'sip', 'bite', 'munch', 'crunch', 'slurp',
-                       'taste', 'delicious', 'chewy']
+    ("먹기/맛 (Eating/Taste)", ['eat', 'chew', 'gulp', 'sip', 'bite', 'munch', 'crunch', 'slurp',
+                             'taste', 'delicious', 'chewy']),
     
     # 날씨/자연
-    weather_keywords = ['rain', 'wind', 'thunder', 'lightning', 'snow', 'sun', 'cloud',
-                        'storm', 'drizzle', 'pour']
-    
-    # 동물 소리
-    animal_keywords = ['bark', 'meow', 'chirp', 'tweet', 'growl', 'howl', 'squeak',
-                       'animal', 'dog', 'cat', 'bird', 'crow', 'cock']
-    
-    for keyword in sound_keywords:
-        if keyword in definition_lower:
-            return "소리 (Sound)"
-    
-    for keyword in animal_keywords:
-        if keyword in definition_lower:
-            return "동물 소리 (Animal Sounds)"
-    
-    for keyword in motion_keywords:
-        if keyword in definition_lower:
-            return "움직임 (Motion)"
-    
-    for keyword in emotion_keywords:
-        if keyword in definition_lower:
-            return "감정 (Emotion)"
-    
-    for keyword in state_keywords:
-        if keyword in definition_lower:
-            return "상태/모양 (State/Appearance)"
-    
-    for keyword in eating_keywords:
-        if keyword in definition_lower:
-            return "먹기/맛 (Eating/Taste)"
-    
-    for keyword in weather_keywords:
-        if keyword in definition_lower:
-            return "날씨/자연 (Weather/Nature)"
-    
-    return "기타 (Others)"
+    ("날씨/자연 (Weather/Nature)", ['rain', 'wind', 'thunder', 'lightning', 'snow', 'sun', 'cloud',
+                                'storm', 'drizzle', 'pour']),
+]
+
+CATEGORY_CLASSIFIER = compile_classifier(CATEGORY_KEYWORDS)
 
-def main():
-    xml_file = "JMdict_e.xml"
+def categorize_onomatopoeia(word, reading, definition):
+    """카테고리 분류"""
+    return classify(CATEGORY_CLASSIFIER, definition, default="기타 (Others)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="JMdict 태그별 단어 추출")
+    parser.add_argument('--input', default="JMdict_e.xml")
+    parser.add_argument('--output', default="onomatopoeia_data.json")
+    parser.add_argument('--tag', action='append', dest='tags',
+                        help="pos/misc 태그 텍스트에 포함될 키워드 (여러 번 지정 가능, 기본: onomatopoeic, mimetic)")
+    parser.add_argument('--field', action='append', dest='fields', choices=TAG_FIELDS,
+                        help="검사할 태그 (기본: pos, misc)")
+    parser.add_argument('--ids', default=None,
+                        help="id 레지스트리 파일 (기본: 태그별, 의성어/의태어는 onomatopoeia_ids.json)")
+    args = parser.parse_args(argv)
+    
+    print("Parsing JMdict XML (streaming)...")
+    categories = {}
+    samples = []
     
-    onomatopoeia_list = extract_onomatopoeia(xml_file)
+    def tracked(items):
+        # 저장하면서 통계/샘플 수집
+        for item in items:
+            categories[item['category']] = categories.get(item['category'], 0) + 1
+            if len(samples) < 5:
+                samples.append(item)
+            yield item
     
-    print(f"\nTotal onomatopoeia found: {len(onomatopoeia_list)}")
+    tags = args.tags or ONOMATOPOEIA_TAGS
+    registry = IdRegistry(args.ids or registry_file_for(tags), fields=('word', 'reading'))
+    words = iter_jmdict_words(args.input, tags, args.fields or TAG_FIELDS)
+    write_json_array(tracked(registry.assign_iter(words)), args.output)
+    registry.save()
     
-    # Category statistics
-    categories = {}
-    for item in onomatopoeia_list:
-        cat = item['category']
-        categories[cat] = categories.get(cat, 0) + 1
+    print(f"\nTotal words found: {sum(categories.values())}")
     
     print("\nCategory distribution:")
     for cat, count in sorted(categories.items(), key=lambda x: -x[1]):
         print(f"  {cat}: {count}")
     
-    # Save to JSON
-    output_file = "onomatopoeia_data.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(onomatopoeia_list, f, ensure_ascii=False, indent=2)
-    
-    print(f"\nData saved to {output_file}")
+    print(f"\nData saved to {args.output}")
     
     # Print sample
     print("\nSample data:")
-    for item in onomatopoeia_list[:5]:
+    for item in samples:
         print(f"  {item['word']} ({item['reading']}): {item['definition'][:50]}...")
 
 if __name__ == "__main__":
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+후리가나(ruby) 분할 미리 계산
+
+FuriganaText 위젯의 _parseFurigana가 카드를 그릴 때마다 하던 한자-읽기 맞추기를
+파이프라인에서 단어/예문마다 한 번만 하고, 결과를 assets/data/furigana.json으로 저장한다.
+앱에서 읽는 코드가 생기기 전까지는 pubspec.yaml 에셋에 넣지 않는다.
+생성물이므로 daily_japanese.db처럼 커밋하지 않는다 (필요할 때 이 스크립트로 다시 만듦).
+
+- 표기에서 읽기가 필요한 부분(한자, 숫자, 영문 등)은 그룹(1글자 이상), 나머지(가나, 문장부호)는
+  그대로 읽기에 나타나야 하는 리터럴로 보고 읽기 전체와 맞춘다 (DP, 표기 길이 x 읽기 길이에 비례).
+  가타카나는 히라가나로 접어서 비교한다 (예문 읽기는 クラス를 くらす로 적음).
+- 읽기에 한자가 남아 있거나, 맞출 수 없거나, 여러 가지로 나뉠 수 있는 경우는
+  검토 목록(furigana_review.json)에 남긴다. 여러 가지인 경우는 가장 짧은 분할을 저장한다.
+
+출력 형식 (id 문자열 -> 필드 -> [표기, 읽기 또는 null] 목록, 읽기가 필요 없는 단어는 생략):
+  {"12": {"word": [["知識習得", "ちしきしゅうとく"]],
+          "example": [["知識習得", "ちしきしゅうとく"], ["は", null], ...]}}
+
+사용 예:
+  python furigana.py
+  python furigana.py --input assets/data/words.json --output assets/data/furigana.json
+"""
+
+import argparse
+import json
+import re
+import time
+
+from kana_normalize import katakana_to_hiragana
+from normalize_words import load_normalized
+
+# 읽기(루비)가 필요한 글자: 한자(々〆 포함), 작은 ヵヶ, 숫자/영문(반각, 전각), %, 하이픈 (Wi-Fi, 123-4567)
+RUBY_CHARS = r'㐀-䶿一-鿿豈-﫿々〆ヵヶ0-9A-Za-z０-９Ａ-Ｚａ-ｚ%％\-'
+_RUBY_RUN = re.compile(f'[{RUBY_CHARS}]+')
+_KANJI = re.compile(r'[㐀-䶿一-鿿豈-﫿々〆]')
+
+# 단어 필드: 필드 이름 -> (표기 키 목록, 읽기 키 목록). word_row와 같은 우선순위
+FURIGANA_FIELDS = {
+    'word': (('kanji', 'word'), ('hiragana', 'reading')),
+    'example': (('example_jp',), ('example_reading',)),
+}
+
+def _first(word, keys):
+    for key in keys:
+        if word.get(key):
+            return word[key]
+    return None
+
+def _group_spans(literals, reading):
+    """reading = literals[0] + 그룹 + literals[1] + ... + literals[-1] 로 나누기 (그룹은 1글자 이상)
+
+    (앞 그룹부터 가장 짧게 나눈 분할, 가장 길게 나눈 분할)을 그룹별 [(시작, 끝)]으로 반환,
+    맞출 수 없으면 None. 둘이 다르면 나누는 방법이 여러 가지다.
+    """
+    n = len(reading)
+    last = len(literals) - 1
+    # ok[i][p]: reading[p:]가 literals[i]로 시작해 나머지 그룹/리터럴과 끝까지 맞음
+    ok = [[False] * (n + 1) for _ in range(last + 1)]
+    tail = n - len(literals[last])
+    if tail >= 0 and reading.endswith(literals[last]):
+        ok[last][tail] = True
+    for i in range(last - 1, -1, -1):
+        following = ok[i + 1]
+        # later[x]: x보다 뒤에서 literals[i + 1]부터 맞출 수 있는 위치가 있음
+        later = [False] * (n + 1)
+        for x in range(n - 1, -1, -1):
+            later[x] = later[x + 1] or following[x + 1]
+        literal = literals[i]
+        row = ok[i]
+        for p in range(n - len(literal)):
+            row[p] = later[p + len(literal)] and reading.startswith(literal, p)
+    if not ok[0][0]:
+        return None
+
+    def spans(pick):
+        result = []
+        pos = 0
+        for i in range(last):
+            start = pos + len(literals[i])
+            pos = pick(q for q in range(start + 1, n + 1) if ok[i + 1][q])
+            result.append((start, pos))
+        return result
+    return spans(min), spans(max)
+
+def align(text, reading):
+    """표기와 읽기 맞추기. (분할 [(표기, 읽기 또는 None)], 문제) 반환
+
+    문제가 없으면 None, 맞추지 못하면 분할도 None.
+    """
+    runs = list(_RUBY_RUN.finditer(text))
+    folded_text = katakana_to_hiragana(text)
+    folded_reading = katakana_to_hiragana(reading)
+    if not runs:
+        if folded_text != folded_reading:
+            return None, "kana mismatch"
+        return [(text, None)], None
+
+    literals = []
+    pos = 0
+    for run in runs:
+        literals.append(folded_text[pos:run.start()])
+        pos = run.end()
+    literals.append(folded_text[pos:])
+    alignments = _group_spans(literals, folded_reading)
+    if alignments is None:
+        return None, "no alignment"
+    shortest, longest = alignments
+
+    segments = []
+    problem = None
+    pos = 0
+    for i, run in enumerate(runs):
+        if run.start() > pos:
+            segments.append((text[pos:run.start()], None))
+        start, end = shortest[i]
+        part = reading[start:end]
+        if _KANJI.search(part):
+            problem = "kanji in reading"
+        same = folded_reading[start:end] == folded_text[run.start():run.end()]
+        segments.append((run.group(), None if same else part))
+        pos = run.end()
+    if pos < len(text):
+        segments.append((text[pos:], None))
+
+    if problem is None and shortest != longest:
+        problem = "ambiguous"
+    return segments, problem
+
+def verify_segments(segments, text, reading):
+    """분할이 표기와 읽기를 빠짐없이 덮는지 확인"""
+    return (''.join(part for part, _ in segments) == text
+            and katakana_to_hiragana(''.join(ruby or part for part, ruby in segments))
+            == katakana_to_hiragana(reading))
+
+def word_furigana(word):
+    """단어 하나의 {필드: 분할}과 검토 목록 [(필드, 표기, 읽기, 문제)]"""
+    result = {}
+    review = []
+    for field, (text_keys, reading_keys) in FURIGANA_FIELDS.items():
+        text = _first(word, text_keys)
+        reading = _first(word, reading_keys)
+        if not text or not reading:
+            continue
+        segments, problem = align(text, reading)
+        if segments is not None and not verify_segments(segments, text, reading):
+            segments, problem = None, "segments do not cover text"
+        if problem:
+            review.append((field, text, reading, problem))
+        if segments and any(ruby for _, ruby in segments):
+            result[field] = [list(segment) for segment in segments]
+    return result, review
+
+def build_furigana(words):
+    """단어 목록 -> (에셋 dict, 검토 목록)"""
+    asset = {}
+    review = []
+    for word in words:
+        result, problems = word_furigana(word)
+        if result:
+            asset[str(word['id'])] = result
+        for field, text, reading, problem in problems:
+            review.append({'id': word['id'], 'field': field, 'text': text,
+                           'reading': reading, 'problem': problem})
+    return asset, review
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="후리가나 분할 미리 계산")
+    parser.add_argument('--input', default='assets/data/words.json')
+    parser.add_argument('--output', default='assets/data/furigana.json')
+    parser.add_argument('--review', default='furigana_review.json', help="검토가 필요한 항목을 저장할 파일")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    words, _ = load_normalized(args.input)
+
+    start = time.perf_counter()
+    asset, review = build_furigana(words)
+    elapsed = time.perf_counter() - start
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(asset, f, ensure_ascii=False, separators=(',', ':'))
+    with open(args.review, 'w', encoding='utf-8') as f:
+        json.dump(review, f, ensure_ascii=False, indent=2)
+
+    print(f"Words: {len(words)}, with furigana: {len(asset)} ({elapsed * 1000:.1f} ms)")
+    print(f"Saved to {args.output}")
+    if review:
+        counts = {}
+        for item in review:
+            counts[item['problem']] = counts.get(item['problem'], 0) + 1
+        print(f"Needs review: {len(review)} ({', '.join(f'{p} {n}' for p, n in sorted(counts.items()))})"
+              f" -> {args.review}")
+
+if __name__ == "__main__":
+    main()
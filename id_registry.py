@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+단어 id 레지스트리
+
+정규화한 (단어, 읽기, 카테고리) -> id 대응을 파일에 저장해 두고, 파이프라인 스크립트가
+id를 max+1이나 순번으로 새로 매기지 않고 여기서 받아 쓰게 한다.
+- 한 번 쓴 id는 다른 단어에 다시 주지 않는다 (단어를 지워도 대응은 남아 있고, next_id는 줄지 않음).
+  같은 단어를 다시 추가하면 예전 id를 돌려받는다.
+- 같은 목록 안에 키가 같은 단어가 여러 개면 두 번째부터 "#2", "#3"... 을 붙여 구분한다.
+  단어에 이미 id가 있으면 그 id가 등록된 키를 먼저 쓰고, 나머지만 목록 순서대로 남은 키를 받는다
+  (중복 중 하나를 지우거나 순서를 바꿔도 다른 쪽 id가 바뀌지 않음).
+- assign: 레지스트리 기준으로 id를 매김 (새로 만든 단어, JMdict 추출 등)
+  sync: 이미 id가 있는 목록(words.json)을 기준으로 레지스트리를 갱신 (손으로 고친 내용 반영)
+
+사용 예:
+  python id_registry.py stats
+  python id_registry.py sync assets/data/words.json
+"""
+
+import argparse
+import json
+import os
+
+from kana_normalize import normalize_key
+
+DEFAULT_REGISTRY_FILE = "word_ids.json"
+# JMdict 의성어/의태어 추출(extract_onomatopoeia.py)용. 카테고리는 키워드 표로 매번 다시 정해지므로 키에서 뺀다.
+# 의성어 데이터(onomatopoeia_*.json)처럼 JMdict를 받은 곳에서만 만들어지므로 커밋하지 않는다 (id는 로컬 전용)
+ONOMATOPOEIA_REGISTRY_FILE = "onomatopoeia_ids.json"
+ID_FIELDS = ("word", "reading", "category")
+
+def _base_key(key):
+    """"#n"을 뗀 기본 키"""
+    base, sep, count = key.rpartition("#")
+    return base if sep and count.isdigit() else key
+
+class IdRegistry:
+    def __init__(self, path=DEFAULT_REGISTRY_FILE, fields=ID_FIELDS):
+        self.path = path
+        self.fields = tuple(fields)
+        self.ids = {}
+        self.next_id = 1
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.fields = tuple(data.get("fields", self.fields))
+            self.ids = data["ids"]
+            self.next_id = data["next_id"]
+        self._keys_by_id = {word_id: key for key, word_id in self.ids.items()}
+        self.dirty = False  # 불러온 뒤 바뀐 대응이 있는지 (저장이 필요한지)
+
+    def key(self, word):
+        """정규화한 키 ('\\t'로 연결). reading이 없으면 hiragana 사용"""
+        parts = []
+        for field in self.fields:
+            value = word.get(field)
+            if not value and field == "reading":
+                value = word.get("hiragana")
+            parts.append(normalize_key(str(value or "")))
+        return "\t".join(parts)
+
+    @staticmethod
+    def _next_key(base, used, counts):
+        """목록 안에서 겹치지 않는 키: 기본 키, "#2", "#3"... 중 used에 없는 첫 키
+
+        counts: 기본 키 -> 다음에 확인할 번호
+        """
+        count = counts.get(base, 1)
+        key = base if count == 1 else f"{base}#{count}"
+        while key in used:
+            count += 1
+            key = f"{base}#{count}"
+        counts[base] = count + 1  # 같은 키가 많아도 처음부터 다시 찾지 않음
+        used.add(key)
+        return key
+
+    def _bind(self, key, word_id):
+        old_key = self._keys_by_id.get(word_id)
+        if old_key is not None and old_key != key:
+            del self.ids[old_key]  # 같은 id가 두 키에 걸려 있지 않도록 (단어를 고친 경우)
+        old_id = self.ids.get(key)
+        if old_id is not None and old_id != word_id:
+            del self._keys_by_id[old_id]
+        self.ids[key] = word_id
+        self._keys_by_id[word_id] = key
+        self.next_id = max(self.next_id, word_id + 1)
+        self.dirty = True
+
+    def lookup(self, word):
+        return self.ids.get(self.key(word))
+
+    def allocate(self, word):
+        """word에 새 id를 주고 레지스트리에 기록"""
+        word_id = self.next_id
+        self._bind(self.key(word), word_id)
+        return word_id
+
+    def assign_iter(self, words):
+        """레지스트리 기준으로 word['id']를 채우며 yield (한 단어씩 처리, 목록을 모아 두지 않음)
+
+        등록된 키는 그 id, 처음 보는 키는 단어에 있던 id가 아직 아무 키에도 쓰인 적 없으면
+        그대로 (기존 데이터로 레지스트리를 처음 만들 때), 아니면 새 id.
+        단어에 있던 id는 믿지 않으므로 (JMdict 순번 등) 중복 키는 목록 순서로만 구분한다.
+        """
+        used = set()
+        counts = {}
+        for word in words:
+            key = self._next_key(self.key(word), used, counts)
+            word_id = self.ids.get(key)
+            if word_id is None:
+                current = word.get("id")
+                if isinstance(current, int) and current > 0 and current not in self._keys_by_id:
+                    word_id = current
+                else:
+                    word_id = self.next_id
+                self._bind(key, word_id)
+            word["id"] = word_id
+            yield word
+
+    def assign(self, words):
+        """assign_iter를 목록 전체에 적용. 새로 등록한 키 수 반환"""
+        before = len(self.ids)
+        for _ in self.assign_iter(words):
+            pass
+        return len(self.ids) - before
+
+    def sync_iter(self, words, changes):
+        """words의 id를 기준으로 레지스트리를 갱신하며 yield (단어는 읽는 대로 내보냄)
+
+        1) 단어의 id가 같은 기본 키(또는 그 "#n")에 등록되어 있으면 그 키 (바로 확인 끝, 바꿀 것 없음)
+        2) 나머지(새 단어, 고친 단어)는 (기본 키, id)만 모아 두었다가, 끝까지 읽은 뒤 목록 순서대로
+           기본 키, "#2", "#3"... 중 1)에서 쓰이지 않은 첫 키를 주고 반영한다.
+           (뒤에 나오는 단어가 id로 가져갈 키를 앞 단어가 쓰지 않도록 목록 끝까지 기다림)
+        레지스트리와 id가 달랐던 단어는 changes에 (키, 이전 id, 새 id)로 추가한다.
+        """
+        used = set()
+        pending = []
+        for word in words:
+            base = self.key(word)
+            key = self._keys_by_id.get(word["id"])
+            if key is None or key in used or (key != base and _base_key(key) != base):
+                pending.append((base, word["id"]))
+            else:
+                used.add(key)
+            yield word
+        counts = {}
+        rebind = []
+        for base, word_id in pending:
+            key = self._next_key(base, used, counts)
+            previous = self.ids.get(key)
+            if previous != word_id:
+                if previous is not None:
+                    changes.append((key, previous, word_id))
+                rebind.append((key, word_id))
+        # 모든 변경을 먼저 모은 뒤 반영 (id를 서로 바꾼 경우도 양쪽 모두 보고)
+        for key, word_id in rebind:
+            self._bind(key, word_id)
+
+    def sync(self, words):
+        changes = []
+        for _ in self.sync_iter(words, changes):
+            pass
+        return changes
+
+    def save(self):
+        tmp_file = self.path + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump({"fields": list(self.fields), "next_id": self.next_id,
+                       "ids": dict(sorted(self.ids.items(), key=lambda item: item[1]))},
+                      f, ensure_ascii=False, indent=1)
+            f.write("\n")
+        os.replace(tmp_file, self.path)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="단어 id 레지스트리")
+    parser.add_argument("--registry", default=DEFAULT_REGISTRY_FILE)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="등록된 키 수와 다음 id")
+    sync = sub.add_parser("sync", help="words.json의 id로 레지스트리 갱신")
+    sync.add_argument("words", nargs="?", default="assets/data/words.json")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    registry = IdRegistry(args.registry)
+    if args.command == "sync":
+        from json_stream import iter_json_file
+        changes = registry.sync(iter_json_file(args.words))
+        registry.save()
+        for key, previous, word_id in changes:
+            print(f"  {key.replace(chr(9), ' / ')}: {previous} -> {word_id}")
+        print(f"Synced {args.words}: {len(changes)} ids changed")
+    print(f"{args.registry}: {len(registry.ids)} keys, next id {registry.next_id}")
+
+if __name__ == "__main__":
+    main()
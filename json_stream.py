@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+스트리밍 JSON 배열 디코더
+LLM 응답이 조각(chunk)으로 도착하는 동안 배열의 각 원소가 완성되는 즉시 꺼낸다.
+원소 하나가 깨져도 나머지 원소는 그대로 사용할 수 있다.
+"""
+
+import json
+import re
+
+class ArrayItemSplitter:
+    """텍스트 조각을 받아 최상위 JSON 배열의 원소 문자열을 잘라내는 상태 기계
+
+    배열 앞의 텍스트(```json 등)는 무시한다.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._started = False
+        self._finished = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._item_start = None
+
+    @property
+    def finished(self):
+        """닫는 ']'까지 읽었는지"""
+        return self._finished
+
+    def feed(self, text):
+        """조각을 추가하고 새로 완성된 원소 문자열 목록을 반환"""
+        if self._finished:
+            return []
+        items = []
+        self._buffer += text
+        buf = self._buffer
+        i = self._pos
+        while i < len(buf) and not self._finished:
+            ch = buf[i]
+            if not self._started:
+                if ch == '[':
+                    self._started = True
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+                if self._depth == 0 and self._item_start is None:
+                    self._item_start = i
+            elif ch in '{[':
+                if self._depth == 0 and self._item_start is None:
+                    self._item_start = i
+                self._depth += 1
+            elif ch in '}]':
+                if self._depth == 0:
+                    # 배열 끝 (마지막 원소가 스칼라면 여기서 완성)
+                    self._emit(items, i)
+                    self._finished = True
+                else:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        self._emit(items, i + 1)
+            elif ch == ',' and self._depth == 0:
+                self._emit(items, i)
+            elif not ch.isspace() and self._depth == 0 and self._item_start is None:
+                self._item_start = i
+            i += 1
+
+        # 완성된 원소는 버퍼에서 제거
+        keep = self._item_start if self._item_start is not None else i
+        self._buffer = buf[keep:]
+        self._pos = i - keep
+        if self._item_start is not None:
+            self._item_start = 0
+        return items
+
+    def _emit(self, items, end):
+        if self._item_start is not None:
+            raw = self._buffer[self._item_start:end].strip()
+            if raw:
+                items.append(raw)
+            self._item_start = None
+
+def decode_items(raw_items):
+    """원소 문자열 -> (값, 오류) 쌍. 파싱에 실패하면 값은 None"""
+    for raw in raw_items:
+        try:
+            yield json.loads(raw), None
+        except json.JSONDecodeError as e:
+            yield None, f"invalid JSON element: {e} ({raw[:60]!r})"
+
+def iter_array_items(chunks):
+    """텍스트 조각 iterable -> (값, 오류) 스트림
+
+    배열이 끝난 뒤의 조각도 끝까지 소비한다 (스트림/캐시 저장이 정상 종료되도록).
+    """
+    splitter = ArrayItemSplitter()
+    for chunk in chunks:
+        yield from decode_items(splitter.feed(chunk))
+
+async def aiter_array_items(chunks):
+    """비동기 텍스트 조각 -> (값, 오류) 스트림"""
+    splitter = ArrayItemSplitter()
+    async for chunk in chunks:
+        for pair in decode_items(splitter.feed(chunk)):
+            yield pair
+
+_DECODER = json.JSONDecoder()
+_SEPARATORS = re.compile(r'[\s,]*')
+_WHITESPACE = re.compile(r'\s*')
+
+def iter_json_file(path, chunk_size=1 << 20):
+    """디스크의 큰 JSON 배열 파일을 원소 단위로 읽기 (전체를 메모리에 올리지 않음)
+
+    원소 디코딩은 json의 C 디코더(raw_decode)를 그대로 쓰므로 json.load와 속도가 비슷하다.
+    """
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        buf = f.read(chunk_size)
+        eof = not buf
+        pos = buf.find('[') + 1
+        if not pos:
+            raise ValueError(f"{path}: not a JSON array")
+        while True:
+            pos = _SEPARATORS.match(buf, pos).end()
+            if pos < len(buf) and buf[pos] == ']':
+                return
+            try:
+                value, end = _DECODER.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                end = None
+            if end is not None:
+                # 값 뒤에 ',' 또는 ']'가 보여야 완성. 조각 경계에서 잘린 숫자("1." -> 1)는 더 읽는다
+                after = _WHITESPACE.match(buf, end).end()
+                if after < len(buf) and buf[after] in ',]':
+                    yield value
+                    pos = end
+                    continue
+                if eof:
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buf, after)
+            more = f.read(chunk_size)
+            eof = not more
+            buf = buf[pos:] + more
+            pos = 0
+
+def write_json_array(items, output_file):
+    """레코드를 하나씩 JSON 배열로 기록 (json.dump(indent=2)와 같은 출력)"""
+    with open(output_file, 'w', encoding='utf-8') as f:
+        first = True
+        for item in items:
+            text = json.dumps(item, ensure_ascii=False, indent=2)
+            f.write('[\n  ' if first else ',\n  ')
+            f.write(text.replace('\n', '\n  '))
+            first = False
+        f.write('[]' if first else '\n]')
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+가나/문자 폭 정규화 (공용 모듈)
+
+- 히라가나 <-> 가타카나: str.translate 테이블 (글자 수가 바뀌지 않아 위치 대응이 유지됨)
+- 문자 폭: NFKC (전각 영숫자 -> 반각, 반각 가타카나 -> 전각, ｶﾞ 같은 탁점 조합까지 처리)
+- 사전 조회 키: normalize_key = NFKC + 가타카나를 히라가나로 + 소문자 (lru_cache)
+
+사전은 keyed()로 정규화 키를 미리 만들어 두고, 단어마다 normalize_key 한 번과
+dict 조회 한 번으로 찾는다.
+"""
+
+import unicodedata
+from functools import lru_cache
+
+# ぁ(3041)..ゖ(3096) <-> ァ(30A1)..ヶ(30F6)
+HIRAGANA_TO_KATAKANA = {code: code + 0x60 for code in range(0x3041, 0x3097)}
+KATAKANA_TO_HIRAGANA = {code: code - 0x60 for code in range(0x30A1, 0x30F7)}
+
+def hiragana_to_katakana(text):
+    """히라가나를 카타카나로 변환"""
+    return text.translate(HIRAGANA_TO_KATAKANA)
+
+def katakana_to_hiragana(text):
+    """카타카나를 히라가나로 변환"""
+    return text.translate(KATAKANA_TO_HIRAGANA)
+
+def fold_width(text):
+    """전각/반각 차이 없애기 (NFKC). 이미 정규형이면 같은 문자열을 그대로 반환"""
+    return unicodedata.normalize('NFKC', text)
+
+@lru_cache(maxsize=1 << 16)
+def normalize_key(text):
+    """조회용 키: 폭, 히라가나/가타카나, 대소문자 차이를 없앤 문자열"""
+    return fold_width(text).translate(KATAKANA_TO_HIRAGANA).lower()
+
+def keyed(mapping):
+    """mapping의 키를 normalize_key로 바꾼 dict (같은 키가 되면 먼저 나온 항목 우선)"""
+    result = {}
+    for key, value in mapping.items():
+        result.setdefault(normalize_key(key), value)
+    return result
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+키워드 테이블 기반 카테고리 분류기
+카테고리별 키워드 목록을 하나의 정규식(접두사 트리 형태)으로 컴파일하여
+정의문을 한 번만 스캔한다. 우선순위는 테이블 순서 (먼저 나온 카테고리 우선).
+"""
+
+import re
+
+def _trie_regex(keywords):
+    """키워드 목록을 접두사 트리 형태의 정규식으로 (긴 매치 우선)"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in node.items() if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # 여기서 끝나는 키워드도 있으면 더 긴 쪽을 먼저 시도
+            body = '(?:' + body + ')?' if len(branches) > 1 or len(body) > 1 else body + '?'
+        return body
+
+    return build(trie)
+
+def compile_classifier(table):
+    """[(category, [keyword, ...]), ...] (우선순위 순)을 분류기로 컴파일
+
+    같은 키워드가 여러 카테고리에 있으면 우선순위가 높은 쪽을 따른다.
+    키워드가 하나도 없으면 pattern은 None이고 classify는 항상 default를 돌려준다.
+    """
+    categories = []
+    keywords = []
+    seen = {}
+    for rank, (category, category_keywords) in enumerate(table):
+        categories.append(category)
+        for keyword in category_keywords:
+            keyword = keyword.lower()
+            if not keyword or keyword in seen:
+                continue
+            seen[keyword] = rank
+            keywords.append(keyword)
+    # 한 위치에서 매치되는 키워드들은 서로 접두사 관계이므로, trie 정규식이
+    # 고르는 가장 긴 키워드의 rank를 "접두사 키워드 중 최소 rank"로 두면 정확하다
+    rank_of = {}
+    for keyword in keywords:
+        rank_of[keyword] = min(seen[keyword[:i]] for i in range(1, len(keyword) + 1)
+                               if keyword[:i] in seen)
+    # 빈 정규식은 위치 0에서 빈 문자열로 매치되므로 만들지 않는다
+    pattern = re.compile(_trie_regex(keywords)) if keywords else None
+    return {
+        'pattern': pattern,
+        'rank_of': rank_of,
+        'keywords': keywords,
+        'categories': categories,
+    }
+
+def classify(classifier, text, default=None):
+    """text에 키워드가 있는 카테고리 중 우선순위가 가장 높은 것 (없으면 default)"""
+    if classifier['pattern'] is None:
+        return default
+    rank_of = classifier['rank_of']
+    search = classifier['pattern'].search
+    text = text.lower()
+    best = None
+    pos = 0
+    # 매치 시작 다음 위치부터 다시 검색하여 겹치는 키워드도 모두 확인
+    while True:
+        match = search(text, pos)
+        if match is None:
+            break
+        rank = rank_of[match.group()]
+        if best is None or rank < best:
+            best = rank
+            if best == 0:
+                break
+        pos = match.start() + 1
+    return classifier['categories'][best] if best is not None else default
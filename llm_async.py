@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+비동기 LLM 호출 유틸리티
+동시 실행 제한, 요청/토큰 속도 제한, 지수 백오프 재시도
+"""
+
+import asyncio
+import random
+import time
+
+class RateLimiter:
+    """분당 요청 수(rpm)와 분당 토큰 수(tpm)를 제한하는 토큰 버킷
+
+    값이 None이면 해당 제한은 적용하지 않는다.
+    """
+
+    def __init__(self, rpm=None, tpm=None):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm or 0)
+        self._tokens = float(tpm or 0)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rpm:
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    async def acquire(self, tokens=0):
+        """요청 1건과 tokens만큼의 예산이 생길 때까지 대기"""
+        if self.tpm:
+            tokens = min(tokens, self.tpm)
+        async with self._lock:
+            while True:
+                self._refill()
+                wait = 0.0
+                if self.rpm and self._requests < 1:
+                    wait = max(wait, (1 - self._requests) * 60 / self.rpm)
+                if self.tpm and self._tokens < tokens:
+                    wait = max(wait, (tokens - self._tokens) * 60 / self.tpm)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            if self.rpm:
+                self._requests -= 1
+            if self.tpm:
+                self._tokens -= tokens
+
+async def with_retries(func, retries=5, base_delay=1.0, max_delay=60.0, label=""):
+    """func()를 실행하고 실패하면 지수 백오프(+지터)로 재시도"""
+    for attempt in range(retries + 1):
+        try:
+            return await func()
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = min(max_delay, base_delay * (2 ** attempt)) * (0.5 + random.random() / 2)
+            print(f"  retry {attempt + 1}/{retries} {label} in {delay:.1f}s: {e}")
+            await asyncio.sleep(delay)
+
+def estimate_request_tokens(messages, max_tokens):
+    """속도 제한용 대략적인 토큰 수 (프롬프트 4자당 1토큰 + 최대 응답 토큰)"""
+    prompt_chars = sum(len(m['content']) for m in messages)
+    return prompt_chars // 4 + max_tokens
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+OpenAI 응답 캐시 (SQLite)
+(model, messages, temperature, max_tokens)의 해시를 키로 응답을 저장하여
+재실행/이어하기 시 같은 요청에 API를 다시 호출하지 않는다.
+
+사용 예:
+  python llm_cache.py stats
+  python llm_cache.py clear
+"""
+
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import nullcontext
+
+DEFAULT_CACHE_FILE = ".llm_cache.sqlite"
+KEY_FIELDS = ("model", "messages", "temperature", "max_tokens")
+
+def cache_key(request):
+    """요청의 내용 해시 (KEY_FIELDS만 사용, 키 순서 무관)"""
+    payload = {field: request.get(field) for field in KEY_FIELDS}
+    data = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """LRU(최근 접근 시각) 기준으로 항목 수/크기를 제한하는 응답 캐시"""
+
+    def __init__(self, path=DEFAULT_CACHE_FILE, max_entries=None, max_bytes=200 * 1024 * 1024):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+        self._conn.commit()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            return json.loads(row[0])
+
+    def put(self, key, value):
+        data = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data.encode("utf-8")), now, now))
+            self._evict()
+            self._conn.commit()
+
+    def discard(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def _evict(self):
+        # 가장 오래 접근하지 않은 항목부터 삭제
+        if self.max_entries is not None:
+            self._conn.execute("""
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )""", (self.max_entries,))
+        if self.max_bytes is not None:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                for key, size in self._conn.execute(
+                        "SELECT key, size FROM responses ORDER BY accessed_at ASC").fetchall():
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    total -= size
+                    if total <= self.max_bytes:
+                        break
+
+    def stats(self):
+        with self._lock:
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {"entries": count, "bytes": size, "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+def _lookup(cache, request, parse):
+    """캐시 조회. 끝까지 받지 못한 응답(이전 버전에서 저장)이나 parse할 수 없는 응답은 버리고 None"""
+    if cache is None:
+        return None, None
+    key = cache_key(request)
+    cached = cache.get(key)
+    if cached is not None and cached.get("finish_reason") != "stop":
+        cache.discard(key)
+        cached = None
+    if cached is not None:
+        try:
+            return key, (parse(cached) if parse else cached)
+        except Exception:
+            cache.discard(key)
+    return key, None
+
+def _store(cache, key, response, parse):
+    """새 응답을 parse하고, 성공했고 finish_reason이 "stop"일 때만 캐시에 저장
+
+    잘린 응답("length" 등)은 parse가 받아들여도 (일부 결과를 쓰고 나머지를 다시 요청) 캐시하지 않는다.
+    """
+    choice = response.choices[0]
+    result = {"content": choice.message.content, "finish_reason": choice.finish_reason}
+    value = parse(result) if parse else result
+    if cache is not None and choice.finish_reason == "stop":
+        cache.put(key, result)
+    return value
+
+def cached_completion(client, cache, request, parse=None):
+    """chat.completions.create(**request)를 캐시를 거쳐 호출
+
+    응답은 {"content", "finish_reason"}이며, parse가 주어지면 parse(응답)을 반환한다.
+    parse가 예외를 던지는 응답과 끝까지 받지 못한 응답(finish_reason이 "stop"이 아님)은 캐시하지 않는다.
+    """
+    key, value = _lookup(cache, request, parse)
+    if value is not None:
+        return value
+    response = client.chat.completions.create(**request)
+    return _store(cache, key, response, parse)
+
+async def cached_completion_async(aclient, cache, request, parse=None, guard=None):
+    """cached_completion의 비동기 버전 (AsyncOpenAI 클라이언트)
+
+    guard는 캐시 미스로 실제 API를 호출할 때만 진입하는 async context manager
+    팩토리 (동시 실행/속도 제한용)이다.
+    """
+    key, value = _lookup(cache, request, parse)
+    if value is not None:
+        return value
+    async with (guard() if guard else nullcontext()):
+        response = await aclient.chat.completions.create(**request)
+    return _store(cache, key, response, parse)
+
+async def stream_completion_async(aclient, cache, request, guard=None):
+    """스트리밍 요청: 응답 텍스트 조각을 도착하는 대로 yield
+
+    캐시 히트면 저장된 응답 전체를 한 조각으로 돌려준다.
+    스트림을 끝까지 받고 finish_reason이 "stop"인 경우에만 {"content", "finish_reason"}로
+    캐시에 저장한다. 받은 내용이 검증에 실패하면 호출한 쪽에서 discard_response로 지워야
+    재시도할 때 같은 응답을 다시 받지 않는다.
+    """
+    key = cache_key(request) if cache is not None else None
+    cached = cache.get(key) if cache is not None else None
+    if cached is not None:
+        if cached.get("finish_reason") == "stop":
+            yield cached["content"]
+            return
+        cache.discard(key)  # 이전 버전에서 저장된 잘린 응답
+    parts = []
+    finish_reason = None
+    async with (guard() if guard else nullcontext()):
+        stream = await aclient.chat.completions.create(**request, stream=True)
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+            text = choice.delta.content if choice.delta else None
+            if text:
+                parts.append(text)
+                yield text
+    if cache is not None and finish_reason == "stop":
+        cache.put(key, {"content": "".join(parts), "finish_reason": finish_reason})
+
+def discard_response(cache, request):
+    """request의 캐시된 응답 삭제 (받아들일 수 없는 응답이 재시도 때 다시 쓰이지 않도록)"""
+    if cache is not None:
+        cache.discard(cache_key(request))
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_CACHE_FILE
+    cache = ResponseCache(path)
+    if command == "clear":
+        cache.clear()
+        print(f"Cleared {path}")
+    else:
+        stats = cache.stats()
+        print(f"{path}: {stats['entries']} entries, {stats['bytes'] / 1024:.1f} KB")
+
+if __name__ == "__main__":
+    main()
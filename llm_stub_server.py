@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+OpenAI chat-completions 호환 로컬 스텁 서버 (API 비용 없이 파이프라인 테스트용)
+
+사용 예:
+  python llm_stub_server.py --port 8765 --delay 2 --fail-rate 0.2
+  OPENAI_API_KEY=stub python add_categories.py --base-url http://127.0.0.1:8765/v1
+
+- 단어 생성 프롬프트("Generate exactly N ...")에는 N개의 가짜 단어 배열을,
+- 분류 프롬프트("단어 목록:")에는 {"word": "daily", ...}를 돌려준다.
+- --fail-rate 비율만큼 429 응답을 보내 재시도 로직을 확인할 수 있다.
+- --truncate-over N: 항목이 N개보다 많으면 잘린 JSON과 finish_reason "length"를 돌려준다.
+- "stream": true 요청에는 SSE(chat.completion.chunk)로 응답을 조각내어 보낸다.
+- --bad-rate 비율만큼 생성 단어의 필드를 비워 스키마 검사를 확인할 수 있다.
+"""
+
+import argparse
+import itertools
+import json
+import random
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_word_ids = itertools.count(1)
+
+def fake_words(count, bad_rate=0.0):
+    # 요청마다 다른 단어를 만들어 분할 요청 간 중복이 생기지 않게 함
+    words = [{
+        "word": f"単語{i}",
+        "reading": f"たんご{i}",
+        "meaning_en": f"word {i}",
+        "meaning_ko": f"단어 {i}",
+        "meaning_zh": f"单词 {i}",
+        "meaning_es": f"palabra {i}",
+        "meaning_vi": f"từ {i}",
+        "example_ja": f"単語{i}を使います。",
+        "example_reading": f"たんご{i}をつかいます。",
+        "example_en": f"I use word {i}.",
+    } for i in itertools.islice(_word_ids, count)]
+    for word in words:
+        if random.random() < bad_rate:
+            word["meaning_ko"] = ""
+    return words
+
+def fake_classification(prompt):
+    words = prompt.split("단어 목록:", 1)[1].strip().splitlines()
+    return {line.split(" (", 1)[0]: "daily" for line in words if line.strip()}
+
+def build_content(messages, truncate_over=None, bad_rate=0.0):
+    """(content, finish_reason)"""
+    prompt = messages[-1]["content"] if messages else ""
+    if "단어 목록:" in prompt:
+        result = fake_classification(prompt)
+    else:
+        match = re.search(r"Generate exactly (\d+)", prompt)
+        result = fake_words(int(match.group(1)) if match else 1, bad_rate)
+    content = json.dumps(result, ensure_ascii=False)
+    if truncate_over is not None and len(result) > truncate_over:
+        return content[:len(content) // 2], "length"
+    return content, "stop"
+
+class StubHandler(BaseHTTPRequestHandler):
+    delay = 0.0
+    fail_rate = 0.0
+    truncate_over = None
+    bad_rate = 0.0
+
+    def _send_json(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+
+        stream = request.get("stream", False)
+        if not stream:
+            time.sleep(self.delay)
+        if random.random() < self.fail_rate:
+            self._send_json(429, {"error": {"message": "stub rate limit", "type": "rate_limit_error"}})
+            return
+
+        content, finish_reason = build_content(request.get("messages", []), self.truncate_over, self.bad_rate)
+        if stream:
+            self._send_stream(request, content, finish_reason)
+            return
+        self._send_json(200, {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": finish_reason,
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": len(content) // 4,
+                      "total_tokens": len(content) // 4},
+        })
+
+    def _send_stream(self, request, content, finish_reason, piece_size=40):
+        # --delay 동안 조각을 나눠 보냄 (첫 조각까지의 시간이 짧아지는지 확인용)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        pieces = [content[i:i + piece_size] for i in range(0, len(content), piece_size)]
+        pause = self.delay / max(1, len(pieces))
+
+        def chunk(delta, finish=None):
+            body = {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": request.get("model", "stub"),
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+            }
+            self.wfile.write(f"data: {json.dumps(body, ensure_ascii=False)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        chunk({"role": "assistant", "content": ""})
+        for piece in pieces:
+            time.sleep(pause)
+            chunk({"content": piece})
+        chunk({}, finish_reason)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI chat-completions 스텁 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="응답 지연 (초)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="429 응답 비율 (0~1)")
+    parser.add_argument("--bad-rate", type=float, default=0.0, help="필드를 비운 단어를 섞는 비율 (0~1)")
+    parser.add_argument("--truncate-over", type=int, default=None, help="항목 수가 이보다 많으면 응답을 자름")
+    args = parser.parse_args()
+
+    StubHandler.delay = args.delay
+    StubHandler.fail_rate = args.fail_rate
+    StubHandler.truncate_over = args.truncate_over
+    StubHandler.bad_rate = args.bad_rate
+    server = ThreadingHTTPServer((args.host, args.port), StubHandler)
+    print(f"Stub OpenAI server on http://{args.host}:{args.port}/v1")
+    server.serve_forever()
+
+if __name__ == "__main__":
+    main()
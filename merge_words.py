@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+새 단어(new_words_*.json) -> words.json 병합 (중복 제거)
+
+한 번의 패스로:
+- 정규화 키(normalize_key(word), normalize_key(reading)) 색인으로 같은 단어를 찾는다.
+  히라가나/가타카나/전각 표기만 다른 단어도 같은 단어로 본다.
+  이미 있는 단어와 겹치면 새 단어는 버리고, 기존 단어에 비어 있는 필드만 채운다.
+- 예문(example_jp)은 문자 3-gram shingle의 MinHash를 LSH 버킷에 넣어
+  서로 다른 단어인데 예문이 거의 같은 경우(Jaccard >= 0.8)를 찾아 보고한다 (검토용, 삭제하지 않음).
+- 새 단어는 normalize_words.normalize_word로 정규 스키마로 바꿔 추가한다.
+- 기존 words.json 안의 중복은 보고만 한다 (id가 즐겨찾기에 저장되어 있으므로 지우지 않음).
+- 추가되는 새 단어는 id 레지스트리(word_ids.json)에서 id를 받는다 (중복으로 건너뛴 단어는 id를 쓰지 않음).
+
+사용 예:
+  python merge_words.py new_words_bank.json new_words_home.json
+  python merge_words.py new_words_*.json --check      # 저장하지 않고 보고만
+"""
+
+import argparse
+import os
+import random
+import re
+import time
+import zlib
+
+from json_stream import iter_json_file, write_json_array
+from id_registry import IdRegistry
+from kana_normalize import normalize_key
+from normalize_words import normalize_word
+
+# MinHash 서명 길이 = BANDS x ROWS. 밴드 하나가 통째로 같으면 후보 (임계값 약 (1/BANDS)^(1/ROWS) = 0.7)
+BANDS = 4
+ROWS = 4
+SHINGLE_SIZE = 3
+SIMILARITY = 0.8
+# 예문 하나당 실제로 비교할 후보 수 상한 (같은 틀의 예문이 많아도 O(n)을 유지)
+MAX_CANDIDATES = 8
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240611)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(BANDS * ROWS)]
+_IGNORED = re.compile(r'[\s、。,.!?！？「」『』（）()・〜~]')
+
+def word_key(word):
+    """중복 판단 키: (단어, 읽기)의 정규화 형태"""
+    reading = word.get('reading') or word.get('hiragana') or ''
+    return normalize_key(word.get('word') or ''), normalize_key(reading)
+
+def shingles(text, size=SHINGLE_SIZE):
+    """예문의 문자 n-gram 집합 (폭/가나/문장부호 차이 무시)"""
+    text = _IGNORED.sub('', normalize_key(text))
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+class ExampleIndex:
+    """MinHash + LSH로 거의 같은 예문 찾기 (예문 하나당 O(1) 평균)"""
+
+    def __init__(self, threshold=SIMILARITY):
+        self.threshold = threshold
+        self._buckets = {}
+        self._shingles = {}
+        self._hashes = {}  # shingle -> 순열별 해시 (흔한 shingle은 한 번만 계산)
+
+    def _signature(self, shingle_set):
+        hashes = self._hashes
+        for shingle in shingle_set:
+            if shingle not in hashes:
+                h = zlib.crc32(shingle.encode('utf-8'))
+                hashes[shingle] = tuple((a * h + b) % _PRIME for a, b in _PERMUTATIONS)
+        return tuple(map(min, zip(*[hashes[shingle] for shingle in shingle_set])))
+
+    def _find(self, shingle_set, keys):
+        """같은 버킷의 예문 중 먼저 추가된 순서로 MAX_CANDIDATES개까지 실제 Jaccard 확인"""
+        checked = set()
+        for key in keys:
+            for other_id in self._buckets.get(key, ()):
+                if other_id in checked:
+                    continue
+                if len(checked) >= MAX_CANDIDATES:
+                    return None
+                checked.add(other_id)
+                other = self._shingles[other_id]
+                similarity = len(shingle_set & other) / len(shingle_set | other)
+                if similarity >= self.threshold:
+                    return other_id, similarity
+        return None
+
+    def add(self, word_id, text, find=True):
+        """예문을 색인에 추가하고, 먼저 추가된 비슷한 예문이 있으면 (id, 유사도) 반환
+
+        find=False면 추가만 한다.
+        """
+        shingle_set = shingles(text)
+        if not shingle_set:
+            return None
+        signature = self._signature(shingle_set)
+        keys = [(band, signature[band * ROWS:(band + 1) * ROWS]) for band in range(BANDS)]
+        found = self._find(shingle_set, keys) if find else None
+        for key in keys:
+            self._buckets.setdefault(key, []).append(word_id)
+        self._shingles[word_id] = shingle_set
+        return found
+
+def new_report():
+    return {
+        'added': 0,
+        'already_merged': 0,        # 같은 id로 이미 들어 있는 단어 (재실행)
+        'duplicates': [],           # (새 단어, 기존 id, 새 단어 카테고리)
+        'filled': 0,                # 중복 단어에서 채운 빈 필드 수
+        'existing_duplicates': [],  # (id, 먼저 나온 id) words.json 안의 기존 중복
+        'near_examples': [],        # (id, 비슷한 예문의 id, 유사도)
+        'renumbered': 0,            # 원래 id와 다른 id를 부여한 수
+    }
+
+def _fill_missing(kept, duplicate):
+    filled = 0
+    for field, value in duplicate.items():
+        if field != 'id' and value not in (None, '') and kept.get(field) in (None, ''):
+            kept[field] = value
+            filled += 1
+    return filled
+
+def merge_words(existing_words, new_words, report=None, registry=None):
+    """기존 단어 + 새 단어 -> (병합된 목록, report)
+
+    기존 단어는 순서와 id를 그대로 두고 (빈 필드만 채움), 새 단어는 겹치지 않는 것만 뒤에 붙인다.
+    registry(IdRegistry)가 있으면 추가되는 단어의 id를 레지스트리에서 받는다 (예전에 쓰던 키면 그 id,
+    아니면 새 id). 없으면 id가 없거나 기존 단어와 겹치는 단어만 max+1.
+    """
+    report = report if report is not None else new_report()
+    merged = []
+    by_key = {}
+    by_id = {}
+    examples = ExampleIndex()
+
+    def index_example(word, find):
+        text = word.get('example_jp')
+        if text:
+            near = examples.add(word['id'], text, find)
+            if near is not None:
+                report['near_examples'].append((word['id'], near[0], round(near[1], 3)))
+
+    for word in existing_words:
+        key = word_key(word)
+        if key in by_key:
+            report['existing_duplicates'].append((word['id'], by_key[key]['id']))
+        else:
+            by_key[key] = word
+        by_id[word['id']] = word
+        merged.append(word)
+        # 기존 단어끼리의 비슷한 예문은 보고하지 않음 (새 단어가 관련된 것만)
+        index_example(word, find=False)
+
+    next_id = max(by_id, default=0) + 1
+    for word in new_words:
+        word, _ = normalize_word(word)
+        key = word_key(word)
+        same_id = by_id.get(word.get('id'))
+        if same_id is not None and word_key(same_id) == key:
+            report['already_merged'] += 1
+            continue
+        kept = by_key.get(key)
+        if kept is not None:
+            report['duplicates'].append((word.get('word'), kept['id'], word.get('category')))
+            report['filled'] += _fill_missing(kept, word)
+            continue
+        if registry is not None:
+            # 중복 검사를 통과한 단어에만 레지스트리 id를 준다 (건너뛴 중복이 id를 쓰지 않도록)
+            word_id = registry.lookup(word)
+            if word_id is None or word_id in by_id:
+                word_id = registry.allocate(word)
+            if word_id != word.get('id'):
+                word['id'] = word_id
+                report['renumbered'] += 1
+        elif not isinstance(word.get('id'), int) or same_id is not None:
+            word['id'] = next_id
+            report['renumbered'] += 1
+        next_id = max(next_id, word['id'] + 1)
+        by_id[word['id']] = word
+        by_key[key] = word
+        merged.append(word)
+        report['added'] += 1
+        index_example(word, find=True)
+    return merged, report
+
+def print_report(report):
+    print(f"Added: {report['added']}, already merged: {report['already_merged']}, "
+          f"duplicates skipped: {len(report['duplicates'])} (filled {report['filled']} empty fields), "
+          f"renumbered: {report['renumbered']}")
+    for word, kept_id, category in report['duplicates'][:20]:
+        print(f"  {word} ({category}) -> existing ID:{kept_id}")
+    if len(report['duplicates']) > 20:
+        print(f"  ... {len(report['duplicates']) - 20} more")
+    if report['existing_duplicates']:
+        print(f"Duplicates already in words.json (kept): {len(report['existing_duplicates'])}")
+    if report['near_examples']:
+        print(f"Near-duplicate examples (review): {len(report['near_examples'])}")
+        for word_id, other_id, similarity in report['near_examples'][:20]:
+            print(f"  ID:{word_id} ~ ID:{other_id} ({similarity:.2f})")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="새 단어를 words.json에 중복 없이 병합")
+    parser.add_argument('inputs', nargs='+', help="new_words_*.json 파일")
+    parser.add_argument('--words', default='assets/data/words.json')
+    parser.add_argument('--registry', default='word_ids.json', help="id 레지스트리 파일")
+    parser.add_argument('--check', action='store_true', help="저장하지 않고 보고만")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    existing_words = list(iter_json_file(args.words))
+    new_words = [word for path in args.inputs for word in iter_json_file(path)]
+    print(f"Existing words: {len(existing_words)}, new words: {len(new_words)}")
+
+    start = time.perf_counter()
+    registry = IdRegistry(args.registry)
+    registry.sync(existing_words)
+    merged, report = merge_words(existing_words, new_words, registry=registry)
+    elapsed = time.perf_counter() - start
+    print_report(report)
+    print(f"\nTotal words: {len(merged)} (merged in {elapsed:.2f}s)")
+
+    if not args.check:
+        tmp_file = args.words + '.tmp'
+        write_json_array(merged, tmp_file)
+        os.replace(tmp_file, args.words)
+        registry.sync(merged)
+        registry.save()
+        print(f"Saved to {args.words}")
+
+if __name__ == "__main__":
+    main()
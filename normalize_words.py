@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+words.json 스키마 정규화 및 검증
+
+add_categories.py는 meaning_en/example_ja 형식으로, 앱은 definition/example_jp 형식으로
+읽기 때문에 words.json에 여러 형태의 레코드가 섞여 있다. 한 번의 스트리밍 패스로
+- 별칭 키(meaning_*, example_ja)를 앱이 읽는 키로 합치고 (둘 다 있으면 기존 키 우선, 다르면 충돌로 집계)
+- 필드 순서를 CANONICAL_FIELDS로 맞추고 (그 외 필드는 뒤에 유지)
+- id 없음/중복, 빈 단어, 빈 뜻(definition) 레코드를 제외하고
+- 언어별 번역/예문 번역 누락 수를 보고한다.
+제외된 레코드가 있어도 다른 단어의 id는 바꾸지 않는다 (즐겨찾기가 id로 저장됨).
+id 레지스트리(word_ids.json)와 id가 다른 단어(재번호)는 보고하고, 저장할 때 레지스트리도 갱신한다.
+레코드는 읽는 대로 써 나가므로 메모리는 파일 크기가 아니라 레지스트리 크기에 비례한다
+(레지스트리는 새 단어/고친 단어의 (키, id)만 끝까지 모아 두었다가 반영).
+속도: 단어 10만 개(60MB)에 --check --no-registry 약 2초, 레지스트리 포함 약 2.4초.
+JSON 디코딩만 약 1.25초라 1초 안에는 끝나지 않는다 (실제 words.json 1193개는 약 40ms).
+
+사용 예:
+  python normalize_words.py                 # assets/data/words.json 정규화 후 저장
+  python normalize_words.py --check         # 검증만 (제외 대상이나 레지스트리와 다른 id가 있으면 exit 1)
+"""
+
+import argparse
+import os
+import time
+from collections import Counter
+from operator import itemgetter
+
+from id_registry import DEFAULT_REGISTRY_FILE, IdRegistry
+from json_stream import iter_json_file, write_json_array
+
+# 앱(DatabaseHelper._loadInitialData, Word.fromJson)이 읽는 필드, 저장 순서
+CANONICAL_FIELDS = (
+    'id', 'word', 'kanji', 'reading', 'hiragana', 'category', 'part_of_speech', 'definition',
+    'example', 'example_jp', 'example_reading', 'example_en',
+    'korean', 'chinese', 'spanish', 'vietnamese',
+    'example_ko', 'example_zh', 'example_es', 'example_vi',
+)
+
+# 별칭 키 -> 앱이 읽는 키
+FIELD_ALIASES = {
+    'meaning_en': 'definition',
+    'meaning_ko': 'korean',
+    'meaning_zh': 'chinese',
+    'meaning_es': 'spanish',
+    'meaning_vi': 'vietnamese',
+    'example_ja': 'example_jp',
+}
+
+# 언어 코드 -> (뜻 번역 필드, 예문 번역 필드)
+TRANSLATION_FIELDS = {
+    'ko': ('korean', 'example_ko'),
+    'zh': ('chinese', 'example_zh'),
+    'es': ('spanish', 'example_es'),
+    'vi': ('vietnamese', 'example_vi'),
+}
+
+_CANONICAL = frozenset(CANONICAL_FIELDS)
+_plans = {}
+
+def _plan(keys):
+    """키 구성(순서 포함)별 변환 계획: 출력 키, 읽을 키, 둘 다 있는 (별칭, 기존 키) 목록
+
+    이미 정규 형태(별칭 없음, CANONICAL_FIELDS 순서)면 None.
+    """
+    present = set(keys)
+    source = {}
+    both = []
+    for alias, field in FIELD_ALIASES.items():
+        if alias in present:
+            if field in present:
+                both.append((alias, field))
+            else:
+                source[field] = alias
+    names = [field for field in CANONICAL_FIELDS if field in present or field in source]
+    names += [key for key in keys if key not in _CANONICAL and key not in FIELD_ALIASES]
+    if tuple(names) == keys:
+        return None
+    return tuple(names), itemgetter(*(source.get(name, name) for name in names)), tuple(both)
+
+def normalize_word(word):
+    """레코드 하나를 정규 스키마로. (정규화된 dict, 값이 달랐던 별칭 키 목록)
+
+    레코드 모양(키 목록)은 몇 가지뿐이라 모양별 계획을 캐시해 두고 값만 옮긴다.
+    """
+    keys = tuple(word)
+    try:
+        plan = _plans[keys]
+    except KeyError:
+        plan = _plans[keys] = _plan(keys)
+    if plan is None:
+        return word, []
+    names, getter, both = plan
+    values = getter(word)
+    record = dict(zip(names, values)) if len(names) > 1 else {names[0]: values}
+    conflicts = []
+    for alias, field in both:
+        current = record[field]
+        if current is None or current == '':
+            record[field] = word[alias]
+        elif word[alias] != current:
+            conflicts.append(alias)
+    return record, conflicts
+
+def _blank(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+def validate_word(record, seen_ids):
+    """제외 사유 (문제가 없으면 None). seen_ids에 id를 추가한다"""
+    word_id = record.get('id')
+    if not isinstance(word_id, int):
+        return "missing id"
+    if word_id in seen_ids:
+        return "duplicate id"
+    seen_ids.add(word_id)
+    if _blank(record.get('word')):
+        return "empty word"
+    if _blank(record.get('definition')):
+        return "empty definition"
+    return None
+
+def new_report():
+    return {
+        'total': 0,
+        'accepted': 0,
+        'rejected': [],          # (id, word, 사유)
+        'collapsed': 0,          # 별칭 키가 있던 레코드 수
+        'conflicts': Counter(),  # 별칭 키 -> 기존 키와 값이 다른 레코드 수
+        'missing': Counter(),    # 번역 필드 -> 비어 있는 레코드 수
+        'extra': Counter(),      # CANONICAL_FIELDS 밖의 필드
+    }
+
+def normalize_words(words, report):
+    """단어 iterable을 정규화/검증하며 통과한 레코드를 yield (report에 집계)"""
+    seen_ids = set()
+    missing = report['missing']
+    translation_fields = [field for fields in TRANSLATION_FIELDS.values() for field in fields]
+    for word in words:
+        report['total'] += 1
+        record, conflicts = normalize_word(word)
+        if len(record) != len(word):
+            report['collapsed'] += 1
+        if conflicts:
+            report['conflicts'].update(conflicts)
+        problem = validate_word(record, seen_ids)
+        if problem:
+            report['rejected'].append((record.get('id'), record.get('word'), problem))
+            continue
+        for field in translation_fields:
+            value = record.get(field)
+            if value is None or (value.__class__ is str and not value.strip()):
+                missing[field] += 1
+        if not _CANONICAL.issuperset(record):
+            report['extra'].update(field for field in record if field not in _CANONICAL)
+        report['accepted'] += 1
+        yield record
+
+def load_normalized(path):
+    """파일을 읽어 정규화된 단어 목록과 report 반환 (내보내기 스크립트의 빌드 게이트)
+
+    제외 대상 레코드가 있으면 목록을 출력하고 종료한다.
+    """
+    report = new_report()
+    words = list(normalize_words(iter_json_file(path), report))
+    if report['rejected']:
+        for word_id, word, problem in report['rejected']:
+            print(f"  ID:{word_id}, Word:{word} ({problem})")
+        raise SystemExit(f"{len(report['rejected'])} invalid words in {path} "
+                         f"(see python normalize_words.py --check)")
+    return words, report
+
+def print_report(report):
+    print(f"Total words: {report['total']}")
+    print(f"Accepted: {report['accepted']}, rejected: {len(report['rejected'])}")
+    for word_id, word, problem in report['rejected']:
+        print(f"  ID:{word_id}, Word:{word} ({problem})")
+    print(f"Collapsed alias keys in {report['collapsed']} words")
+    for alias, count in sorted(report['conflicts'].items()):
+        print(f"  {alias} differs from {FIELD_ALIASES[alias]} in {count} words (kept {FIELD_ALIASES[alias]})")
+    print("Missing translations:")
+    for code, (field, example_field) in TRANSLATION_FIELDS.items():
+        print(f"  {code}: {field} {report['missing'][field]}, "
+              f"{example_field} {report['missing'][example_field]}")
+    if report['extra']:
+        print("Other fields: " + ", ".join(f"{field} ({count})"
+                                           for field, count in sorted(report['extra'].items())))
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="words.json 스키마 정규화 및 검증")
+    parser.add_argument('--input', default='assets/data/words.json')
+    parser.add_argument('--output', default=None, help="저장할 파일 (기본: 입력 파일에 덮어쓰기)")
+    parser.add_argument('--check', action='store_true',
+                        help="저장하지 않고 검증만 (제외 대상이나 레지스트리와 다른 id가 있으면 exit 1)")
+    parser.add_argument('--registry', default=DEFAULT_REGISTRY_FILE, help="id 레지스트리 파일")
+    parser.add_argument('--no-registry', action='store_true', help="id 레지스트리를 확인/갱신하지 않음")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = new_report()
+    start = time.perf_counter()
+    records = normalize_words(iter_json_file(args.input), report)
+    registry = None if args.no_registry else IdRegistry(args.registry)
+    id_changes = []
+    if registry is not None:
+        records = registry.sync_iter(records, id_changes)
+
+    if args.check:
+        for _ in records:
+            pass
+    else:
+        output_file = args.output or args.input
+        tmp_file = output_file + '.tmp'
+        write_json_array(records, tmp_file)
+        os.replace(tmp_file, output_file)
+        if registry is not None and registry.dirty:
+            registry.save()
+
+    elapsed = time.perf_counter() - start
+    print_report(report)
+    if id_changes:
+        print(f"IDs differ from {args.registry}: {len(id_changes)}")
+        for key, previous, word_id in id_changes[:20]:
+            print(f"  {key.replace(chr(9), ' / ')}: {previous} -> {word_id}")
+    if args.check:
+        print(f"\nChecked {args.input} in {elapsed:.2f}s")
+        if report['rejected'] or id_changes:
+            raise SystemExit(1)
+    else:
+        print(f"\nSaved to {args.output or args.input} in {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -4,126 +4,378 @@ Tatoeba 데이터 처리 및 의성어/의태어 예문 매칭
 License: CC-BY 2.0 (Tatoeba)
 """
 
+import argparse
 import bz2
 import tarfile
 import json
+import multiprocessing
 import os
 import re
+from array import array
+from bisect import bisect_left
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 
-def extract_bz2(bz2_file, output_file):
-    """bz2 파일 압축 해제"""
-    print(f"Extracting {bz2_file}...")
-    with bz2.open(bz2_file, 'rt', encoding='utf-8') as f:
-        content = f.read()
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f"  -> {output_file}")
+from aho_corasick import build_automaton, iter_matches
+from kana_normalize import fold_width
+from stage_cache import DEFAULT_CACHE_FILE, StageCache, run_incremental
+from tatoeba_cache import open_cache, source_hash, write_cache
+
+def iter_lines(source, member_name='links.csv'):
+    """텍스트/bz2/tar.bz2 파일을 디스크에 풀지 않고 한 줄씩 읽기
 
-def extract_tar_bz2(tar_file, output_dir='.'):
-    """tar.bz2 파일 압축 해제"""
-    print(f"Extracting {tar_file}...")
-    with tarfile.open(tar_file, 'r:bz2') as tar:
-        tar.extractall(output_dir)
-    print(f"  -> extracted to {output_dir}")
+    .tar.bz2는 스트림 모드('r|bz2')로 열어 member_name 멤버만 읽는다.
+    """
+    if source.endswith('.tar.bz2'):
+        with tarfile.open(source, 'r|bz2') as tar:
+            for member in tar:
+                if member.isfile() and os.path.basename(member.name) == member_name:
+                    # 스트림 모드의 멤버는 seekable하지 않아 TextIOWrapper를 쓸 수 없음
+                    for raw in tar.extractfile(member):
+                        yield raw.decode('utf-8')
+                    return
+        raise FileNotFoundError(f"{member_name} not found in {source}")
+    elif source.endswith('.bz2'):
+        with bz2.open(source, 'rt', encoding='utf-8') as f:
+            yield from f
+    else:
+        with open(source, 'r', encoding='utf-8') as f:
+            yield from f
+
+def resolve_source(plain_file, archive_file):
+    """이미 압축 해제된 파일이 있으면 그것을, 없으면 압축 파일을 사용"""
+    return plain_file if os.path.exists(plain_file) else archive_file
 
 def load_sentences(tsv_file):
-    """문장 파일 로드 (id -> text)"""
+    """문장 파일 로드 (int id -> text), .tsv 또는 .tsv.bz2"""
     sentences = {}
-    with open(tsv_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            parts = line.strip().split('\t')
-            if len(parts) >= 3:
-                sent_id = parts[0]
-                text = parts[2]
-                sentences[sent_id] = text
+    for line in iter_lines(tsv_file):
+        parts = line.strip().split('\t')
+        if len(parts) >= 3:
+            sent_id = int(parts[0])
+            text = parts[2]
+            sentences[sent_id] = text
     return sentences
 
-def load_links(links_file):
-    """번역 링크 파일 로드"""
-    links = defaultdict(list)
-    with open(links_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            parts = line.strip().split('\t')
-            if len(parts) >= 2:
-                src_id, tgt_id = parts[0], parts[1]
-                links[src_id].append(tgt_id)
-    return links
-
-def find_examples_for_word(word, jpn_sentences):
-    """단어가 포함된 예문 찾기"""
+def load_links(links_file, sources=None, targets=None):
+    """번역 링크 파일 로드, links.csv 또는 links.tar.bz2
+
+    sources가 주어지면 그 안에 있는 문장에서 나가는 링크만,
+    targets(컨테이너 목록)가 주어지면 그중 하나에 있는 문장으로 가는 링크만 남긴다.
+    결과는 build_link_table()의 CSR 링크 테이블이다.
+    """
+    src_ids = array('I')
+    tgt_ids = array('I')
+    for line in iter_lines(links_file):
+        parts = line.strip().split('\t')
+        if len(parts) >= 2:
+            src_id, tgt_id = int(parts[0]), int(parts[1])
+            if sources is not None and src_id not in sources:
+                continue
+            if targets is not None and not any(tgt_id in t for t in targets):
+                continue
+            src_ids.append(src_id)
+            tgt_ids.append(tgt_id)
+    return build_link_table(src_ids, tgt_ids)
+
+def build_link_table(src_ids, tgt_ids):
+    """(src, tgt) 쌍을 CSR 형태로 압축
+
+    keys: 정렬된 고유 src id, offsets[i]:offsets[i+1]: keys[i]의 targets 구간.
+    같은 src의 target 순서는 입력 순서를 유지한다.
+    """
+    if any(src_ids[i] > src_ids[i + 1] for i in range(len(src_ids) - 1)):
+        order = sorted(range(len(src_ids)), key=src_ids.__getitem__)
+        src_ids = array('I', (src_ids[i] for i in order))
+        tgt_ids = array('I', (tgt_ids[i] for i in order))
+
+    keys = array('I')
+    offsets = array('I', [0])
+    for pos, src_id in enumerate(src_ids):
+        if not keys or keys[-1] != src_id:
+            if keys:
+                offsets.append(pos)
+            keys.append(src_id)
+    if keys:
+        offsets.append(len(src_ids))
+    return {'keys': keys, 'offsets': offsets, 'targets': tgt_ids}
+
+def get_links(table, sent_id):
+    """sent_id에 연결된 target id 목록 (이진 탐색)"""
+    keys = table['keys']
+    i = bisect_left(keys, sent_id)
+    if i == len(keys) or keys[i] != sent_id:
+        return ()
+    offsets = table['offsets']
+    return table['targets'][offsets[i]:offsets[i + 1]]
+
+def build_ngram_index(jpn_sentences, n=2):
+    """문자 n-gram 역색인 생성 (gram -> 문장 번호 posting list)
+
+    posting list는 문장 순서대로 정렬된 array('I')이며,
+    문장 번호는 index['ids'] / index['texts']의 위치를 가리킨다.
+    n-gram은 폭을 통일한 문장(index['keys'], fold_width)에서 뽑는다.
+    """
+    ids = list(jpn_sentences.keys())
+    texts = list(jpn_sentences.values())
+    keys = [fold_width(text) for text in texts]
+    postings = defaultdict(lambda: array('I'))
+    for pos, key in enumerate(keys):
+        grams = {key[i:i + n] for i in range(len(key) - n + 1)}
+        for gram in grams:
+            postings[gram].append(pos)
+    return {'n': n, 'ids': ids, 'texts': texts, 'keys': keys, 'postings': dict(postings)}
+
+def lookup_candidates(term, index):
+    """term의 모든 n-gram을 포함하는 문장 번호 (정렬됨, 부분 문자열 검증 전)
+
+    term이 n보다 짧으면 None을 반환한다 (색인으로 좁힐 수 없음).
+    """
+    n = index['n']
+    if len(term) < n:
+        return None
+    grams = {term[i:i + n] for i in range(len(term) - n + 1)}
+    lists = []
+    for gram in grams:
+        posting = index['postings'].get(gram)
+        if posting is None:
+            return []
+        lists.append(posting)
+    # 가장 짧은 posting list부터 교집합
+    lists.sort(key=len)
+    candidates = set(lists[0])
+    for posting in lists[1:]:
+        candidates.intersection_update(posting)
+        if not candidates:
+            return []
+    return sorted(candidates)
+
+def find_examples_for_word(word, jpn_sentences, index=None, limit=5):
+    """단어가 포함된 예문 찾기
+
+    index가 주어지면 n-gram 후보만 부분 문자열로 검증하고 (jpn_sentences는 쓰지 않음),
+    없으면 전체 문장을 선형 탐색한다. 결과 순서는 두 경우 모두 같다.
+    전각/반각 차이는 무시하고 (fold_width) 예문은 원문 그대로 반환한다.
+    """
     examples = []
+    word = fold_width(word)
+    candidates = lookup_candidates(word, index) if index is not None else None
+    if candidates is not None:
+        ids, texts, keys = index['ids'], index['texts'], index['keys']
+        for pos in candidates:
+            if word in keys[pos]:
+                examples.append((ids[pos], texts[pos]))
+                if len(examples) >= limit:
+                    break
+        return examples
+
     # 정확한 단어 매칭 (히라가나/카타카나 모두 검색)
-    for sent_id, text in jpn_sentences.items():
-        if word in text:
+    if index is not None:
+        items = zip(index['ids'], index['texts'], index['keys'])
+    else:
+        items = ((sent_id, text, fold_width(text)) for sent_id, text in jpn_sentences.items())
+    for sent_id, text, key in items:
+        if word in key:
             examples.append((sent_id, text))
-            if len(examples) >= 5:  # 최대 5개
+            if len(examples) >= limit:  # 최대 5개
                 break
     return examples
 
-def main():
-    # 1. 압축 해제
-    if not os.path.exists('jpn_sentences.tsv'):
-        extract_bz2('jpn_sentences.tsv.bz2', 'jpn_sentences.tsv')
-    
-    if not os.path.exists('eng_sentences.tsv'):
-        extract_bz2('eng_sentences.tsv.bz2', 'eng_sentences.tsv')
-    
-    if not os.path.exists('kor_sentences.tsv'):
-        extract_bz2('kor_sentences.tsv.bz2', 'kor_sentences.tsv')
-    
-    if not os.path.exists('links.csv'):
-        extract_tar_bz2('links.tar.bz2')
-    
-    # 2. 데이터 로드
+def get_search_terms(word_data):
+    """단어 또는 읽기로 예문 검색 (검색 순서대로)"""
+    word = word_data['word']
+    reading = word_data['reading']
+    search_terms = [word]
+    if reading and reading != word:
+        search_terms.append(reading)
+    return search_terms
+
+def scan_sentences(automaton, n_terms, items, limit):
+    """(sent_id, text)들을 한 번씩 스캔하여 패턴 번호별 예문 목록 (최대 limit개)"""
+    results = [[] for _ in range(n_terms)]
+    remaining = n_terms
+    for sent_id, text in items:
+        seen = set()
+        for _, idx in iter_matches(automaton, fold_width(text)):
+            if idx in seen:
+                continue
+            seen.add(idx)
+            found = results[idx]
+            if len(found) < limit:
+                found.append((sent_id, text))
+                if len(found) == limit:
+                    remaining -= 1
+        if not remaining:
+            break
+    return results
+
+# 워커 프로세스와 공유하는 데이터 (fork 시 복사 없이 상속됨). 풀을 쓰는 동안만 채워 둔다
+_SHARED = {}
+
+def _set_shared(shared):
+    _SHARED.clear()
+    _SHARED.update(shared)
+
+def _scan_shard(start, end, limit):
+    """워커: 코퍼스 [start, end) 구간을 오토마톤으로 스캔"""
+    items = zip(_SHARED['ids'][start:end], _SHARED['texts'][start:end])
+    return scan_sentences(_SHARED['automaton'], _SHARED['n_terms'], items, limit)
+
+def _match_terms_shard(terms, limit):
+    """워커: 검색어 묶음을 n-gram 색인으로 검색"""
+    return [find_examples_for_word(t, None, _SHARED['index'], limit) for t in terms]
+
+@contextmanager
+def _process_pool(workers, shared):
+    """fork가 가능하면 부모 메모리를 그대로 상속하고, 아니면 initializer로 복사
+
+    풀이 끝나면 부모의 _SHARED를 비워 오토마톤/색인/문장 목록을 계속 붙잡고 있지 않게 한다.
+    """
+    _set_shared(shared)
+    try:
+        if 'fork' in multiprocessing.get_all_start_methods():
+            executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork'))
+        else:
+            executor = ProcessPoolExecutor(workers, initializer=_set_shared, initargs=(shared,))
+        with executor:
+            yield executor
+    finally:
+        _SHARED.clear()
+
+def _shard_bounds(total, shards):
+    step = -(-total // shards) if total else 1
+    return [(start, min(start + step, total)) for start in range(0, total, step)]
+
+def match_all_terms(terms, jpn_sentences, limit=5, workers=1):
+    """모든 검색어를 하나의 오토마톤으로 컴파일하여 코퍼스를 한 번만 스캔
+
+    term -> [(sent_id, text), ...] (문장 순서, 최대 limit개)를 반환한다.
+    각 term의 결과는 find_examples_for_word와 같다.
+    workers > 1이면 코퍼스를 구간으로 나눠 병렬 스캔하고 구간 순서대로 합친다.
+    폭만 다른 검색어는 같은 패턴(fold_width)으로 한 번만 찾는다.
+    """
+    terms = list(dict.fromkeys(t for t in terms if t))
+    keys = list(dict.fromkeys(fold_width(t) for t in terms))
+    automaton = build_automaton(keys)
+    if workers <= 1:
+        results = scan_sentences(automaton, len(keys), jpn_sentences.items(), limit)
+        by_key = dict(zip(keys, results))
+        return {t: by_key[fold_width(t)] for t in terms}
+
+    shared = {'ids': list(jpn_sentences.keys()), 'texts': list(jpn_sentences.values()),
+              'automaton': automaton, 'n_terms': len(keys)}
+    bounds = _shard_bounds(len(shared['ids']), workers * 4)
+    with _process_pool(workers, shared) as executor:
+        futures = [executor.submit(_scan_shard, start, end, limit) for start, end in bounds]
+        shard_results = [future.result() for future in futures]
+
+    results = [[] for _ in keys]
+    for shard in shard_results:
+        for found, part in zip(results, shard):
+            if len(found) < limit:
+                found.extend(part[:limit - len(found)])
+    by_key = dict(zip(keys, results))
+    return {t: by_key[fold_width(t)] for t in terms}
+
+def match_terms_with_index(terms, index, limit=5, workers=1):
+    """검색어 목록을 n-gram 색인으로 검색 (workers > 1이면 검색어를 나눠 병렬 처리)"""
+    terms = list(dict.fromkeys(terms))
+    if workers <= 1:
+        return {t: find_examples_for_word(t, None, index, limit) for t in terms}
+
+    bounds = _shard_bounds(len(terms), workers * 4)
+    with _process_pool(workers, {'index': index}) as executor:
+        futures = [executor.submit(_match_terms_shard, terms[start:end], limit)
+                   for start, end in bounds]
+        results = [r for future in futures for r in future.result()]
+    return dict(zip(terms, results))
+
+def corpus_sources():
+    """언어/링크별 원본 파일 경로"""
+    return {
+        'jpn': resolve_source('jpn_sentences.tsv', 'jpn_sentences.tsv.bz2'),
+        'eng': resolve_source('eng_sentences.tsv', 'eng_sentences.tsv.bz2'),
+        'kor': resolve_source('kor_sentences.tsv', 'kor_sentences.tsv.bz2'),
+        'links': resolve_source('links.csv', 'links.tar.bz2'),
+    }
+
+def load_corpus(cache_file=None):
+    """문장/링크 로드. cache_file이 있으면 유효한 캐시는 mmap으로 열고,
+    없거나 원본이 바뀌었으면 원본을 파싱한 뒤 캐시를 다시 만든다."""
+    sources = corpus_sources()
+
+    digest = None
+    if cache_file:
+        digest = source_hash(sources.values())
+        corpus = open_cache(cache_file, digest)
+        if corpus is not None:
+            print(f"\nLoaded corpus cache {cache_file}")
+            return corpus
+
     print("\nLoading sentences...")
-    jpn_sentences = load_sentences('jpn_sentences.tsv')
-    print(f"  Japanese sentences: {len(jpn_sentences)}")
-    
-    eng_sentences = load_sentences('eng_sentences.tsv')
-    print(f"  English sentences: {len(eng_sentences)}")
-    
-    kor_sentences = load_sentences('kor_sentences.tsv')
-    print(f"  Korean sentences: {len(kor_sentences)}")
-    
+    corpus = {}
+    for lang in ('jpn', 'eng', 'kor'):
+        corpus[lang] = load_sentences(sources[lang])
+
     print("\nLoading links...")
-    links = load_links('links.csv')
-    print(f"  Links loaded: {len(links)}")
+    corpus['links'] = load_links(sources['links'], sources=corpus['jpn'],
+                                 targets=(corpus['eng'], corpus['kor']))
+
+    if cache_file:
+        write_cache(cache_file, digest, corpus, corpus['links'])
+        print(f"\nWrote corpus cache {cache_file}")
+    return corpus
+
+def attach_examples(onomatopoeia, corpus, matcher='index', max_examples=5, workers=1):
+    """단어마다 첫 검색어로 찾은 예문과 번역(example, example_meaning, example_korean)을 채움
+
+    단어끼리는 서로 영향을 주지 않으므로 일부 단어만 넘겨도 결과는 같다.
+    반환값: 예문을 찾은 단어 수
+    """
+    jpn_sentences = corpus['jpn']
+    eng_sentences = corpus['eng']
+    kor_sentences = corpus['kor']
+    links = corpus['links']
     
-    # 3. 의성어/의태어 데이터 로드
-    print("\nLoading onomatopoeia data...")
-    with open('onomatopoeia_data.json', 'r', encoding='utf-8') as f:
-        onomatopoeia = json.load(f)
-    print(f"  Words: {len(onomatopoeia)}")
+    all_terms = [t for word_data in onomatopoeia for t in get_search_terms(word_data)]
+    examples_by_term = None
+    if matcher == 'automaton':
+        print("\nScanning corpus with Aho-Corasick automaton...")
+        examples_by_term = match_all_terms(all_terms, jpn_sentences, max_examples,
+                                           workers=workers)
+        print(f"  Terms: {len(examples_by_term)}")
+    else:
+        print("\nBuilding n-gram index...")
+        index = build_ngram_index(jpn_sentences)
+        print(f"  Distinct bigrams: {len(index['postings'])}")
+        if workers > 1:
+            print(f"  Searching {len(set(all_terms))} terms with {workers} workers...")
+            examples_by_term = match_terms_with_index(all_terms, index, max_examples,
+                                                      workers=workers)
     
-    # 4. 예문 매칭
     print("\nMatching examples...")
     matched_count = 0
     
     for i, word_data in enumerate(onomatopoeia):
-        word = word_data['word']
-        reading = word_data['reading']
-        
-        # 단어 또는 읽기로 예문 검색
-        search_terms = [word]
-        if reading and reading != word:
-            search_terms.append(reading)
-        
-        for search_term in search_terms:
-            examples = find_examples_for_word(search_term, jpn_sentences)
+        for search_term in get_search_terms(word_data):
+            if examples_by_term is not None:
+                examples = examples_by_term.get(search_term, [])
+            else:
+                examples = find_examples_for_word(search_term, jpn_sentences, index,
+                                                  limit=max_examples)
             
             if examples:
                 sent_id, jpn_text = examples[0]
                 word_data['example'] = jpn_text
                 
                 # 영어 번역 찾기
-                if sent_id in links:
-                    for linked_id in links[sent_id]:
-                        if linked_id in eng_sentences:
-                            word_data['example_meaning'] = eng_sentences[linked_id]
-                            break
-                        if linked_id in kor_sentences:
-                            word_data['example_korean'] = kor_sentences[linked_id]
+                for linked_id in get_links(links, sent_id):
+                    if linked_id in eng_sentences:
+                        word_data['example_meaning'] = eng_sentences[linked_id]
+                        break
+                    if linked_id in kor_sentences:
+                        word_data['example_korean'] = kor_sentences[linked_id]
                 
                 matched_count += 1
                 break
@@ -131,9 +383,75 @@ def main():
         if (i + 1) % 100 == 0:
             print(f"  Processed {i + 1}/{len(onomatopoeia)} words...")
     
+    return matched_count
+
+# match 단계가 읽는 필드(get_search_terms)와 채우는 필드(attach_examples)
+MATCH_READS = ('word', 'reading')
+MATCH_WRITES = ('example', 'example_meaning', 'example_korean')
+
+def match_examples(onomatopoeia, corpus_loader, matcher='index', max_examples=5, workers=1,
+                   cache=None, force=False):
+    """attach_examples를 바뀐 단어에만 실행 (stage_cache 'match' 단계)
+
+    코퍼스는 다시 계산할 단어가 있을 때만 corpus_loader()로 로드한다.
+    예문은 첫 매칭만 쓰므로 matcher/max_examples는 결과에 영향이 없어 지문에서 제외한다.
+    검색어는 word/reading에서만 나오므로 지문에는 그 두 필드만 넣는다 (뜻을 고쳐도 다시 매칭하지 않음).
+    """
+    def process(records):
+        attach_examples(records, corpus_loader(), matcher, max_examples, workers)
+        return records
+
+    config = source_hash(corpus_sources().values()).hex()
+    return run_incremental(cache, 'match', onomatopoeia, process, config, force,
+                           reads=MATCH_READS, writes=MATCH_WRITES)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tatoeba 예문 매칭")
+    parser.add_argument('--matcher', choices=['index', 'automaton'], default='index',
+                        help="index: 단어별 n-gram 색인 검색, automaton: 전체 단어 Aho-Corasick 1회 스캔")
+    parser.add_argument('--max-examples', type=int, default=5,
+                        help="검색어당 수집할 최대 예문 수")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="예문 매칭에 사용할 프로세스 수 (결과는 직렬 실행과 동일)")
+    parser.add_argument('--cache', default='tatoeba_cache.bin',
+                        help="전처리 코퍼스 캐시 파일 (mmap)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="캐시를 읽거나 쓰지 않고 원본만 파싱")
+    parser.add_argument('--stage-cache', default=DEFAULT_CACHE_FILE,
+                        help="단어별 매칭 결과 캐시 (바뀐 단어만 다시 매칭)")
+    parser.add_argument('--full', action='store_true',
+                        help="단어별 캐시를 무시하고 전체를 다시 매칭")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    
+    # 1. 의성어/의태어 데이터 로드
+    print("Loading onomatopoeia data...")
+    with open('onomatopoeia_data.json', 'r', encoding='utf-8') as f:
+        onomatopoeia = json.load(f)
+    print(f"  Words: {len(onomatopoeia)}")
+    
+    # 2. 코퍼스 로드 (압축 파일은 스트리밍으로 바로 읽음, 다시 매칭할 단어가 있을 때만)
+    def corpus_loader():
+        corpus = load_corpus(None if args.no_cache else args.cache)
+        print(f"  Japanese sentences: {len(corpus['jpn'])}")
+        print(f"  English sentences: {len(corpus['eng'])}")
+        print(f"  Korean sentences: {len(corpus['kor'])}")
+        print(f"  Links loaded: {len(corpus['links']['targets'])} from {len(corpus['links']['keys'])} sentences")
+        return corpus
+    
+    # 3. 예문 매칭
+    print("\nMatching examples (changed words only)...")
+    stage_cache = StageCache(args.stage_cache)
+    onomatopoeia = match_examples(onomatopoeia, corpus_loader, args.matcher, args.max_examples,
+                                  args.workers, stage_cache, force=args.full)
+    stage_cache.close()
+    matched_count = sum(1 for word_data in onomatopoeia if word_data.get('example'))
+    
     print(f"\n예문 매칭 완료: {matched_count}/{len(onomatopoeia)} ({matched_count*100//len(onomatopoeia)}%)")
     
-    # 5. 저장
+    # 4. 저장
     output_file = 'onomatopoeia_with_examples.json'
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(onomatopoeia, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+파이프라인 단계별 단어 단위 결과 캐시 (SQLite)
+
+단계 이름과 단어 id마다 (입력 지문, 출력)을 저장한다.
+입력 지문은 단어 내용 + 단계 설정(키워드 테이블 등)의 해시이므로,
+다시 실행하면 지문이 같은 단어는 이전 출력을 그대로 쓰고 바뀐 단어만 계산한다.
+
+사용 예:
+  python stage_cache.py stats
+  python stage_cache.py clear [stage]
+"""
+
+import copy
+import hashlib
+import json
+import sqlite3
+import sys
+
+DEFAULT_CACHE_FILE = ".stage_cache.sqlite"
+
+def fingerprint(value):
+    """JSON으로 표현 가능한 값의 내용 해시"""
+    data = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+class StageCache:
+    def __init__(self, path=DEFAULT_CACHE_FILE):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS records (
+                stage TEXT NOT NULL,
+                key TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                output TEXT NOT NULL,
+                PRIMARY KEY (stage, key)
+            )
+        """)
+        self._conn.commit()
+
+    def load(self, stage):
+        """key -> (fingerprint, 출력 JSON 문자열)"""
+        rows = self._conn.execute(
+            "SELECT key, fingerprint, output FROM records WHERE stage = ?", (stage,))
+        return {key: (fp, output) for key, fp, output in rows}
+
+    def update(self, stage, entries, keep_keys):
+        """entries [(key, fingerprint, output)]를 저장하고 keep_keys에 없는 항목은 삭제"""
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO records (stage, key, fingerprint, output) VALUES (?, ?, ?, ?)",
+                [(stage, key, fp, json.dumps(output, ensure_ascii=False)) for key, fp, output in entries])
+            stale = [(stage, key) for (key,) in self._conn.execute(
+                "SELECT key FROM records WHERE stage = ?", (stage,)) if key not in keep_keys]
+            self._conn.executemany("DELETE FROM records WHERE stage = ? AND key = ?", stale)
+
+    def stats(self):
+        return dict(self._conn.execute("SELECT stage, COUNT(*) FROM records GROUP BY stage"))
+
+    def clear(self, stage=None):
+        with self._conn:
+            if stage is None:
+                self._conn.execute("DELETE FROM records")
+            else:
+                self._conn.execute("DELETE FROM records WHERE stage = ?", (stage,))
+
+    def close(self):
+        self._conn.close()
+
+def record_key(record):
+    return str(record["id"])
+
+def _changes(record, result, writes):
+    """result에서 writes 필드 중 record와 다른 값 (result의 키 순서)"""
+    return {field: value for field, value in result.items()
+            if field in writes and (field not in record or record[field] != value)}
+
+def run_incremental(cache, stage, records, process, config, force=False, key=record_key,
+                    reads=None, writes=None):
+    """process(records)를 바뀐 단어에만 실행하고 나머지는 캐시된 출력을 사용
+
+    process는 단어 목록(복사본)을 받아 같은 순서의 출력 목록을 반환하며,
+    단어끼리 서로 영향을 주지 않아야 한다. config는 결과에 영향을 주는 단계 설정이다.
+    cache가 None이면 전체를 그대로 처리한다.
+    force면 지문과 상관없이 모두 다시 계산하고 캐시를 덮어쓴다.
+    reads/writes(필드 이름 목록)를 주면 reads 필드만 지문에 넣고, 캐시에는 writes 필드 중
+    바뀐 값만 저장해 현재 단어에 덮어쓴다 (다른 필드를 고쳐도 다시 계산하지 않음).
+    반환값: 입력과 같은 순서의 출력 목록
+    """
+    if cache is None:
+        return process(records)
+
+    config_fp = fingerprint(config)
+    previous = {} if force else cache.load(stage)
+    outputs = [None] * len(records)
+    fingerprints = []
+    dirty = []
+    for i, record in enumerate(records):
+        source = record if reads is None else {field: record.get(field) for field in reads}
+        fp = fingerprint([config_fp, source])
+        fingerprints.append(fp)
+        cached = previous.get(key(record))
+        if cached is not None and cached[0] == fp:
+            output = json.loads(cached[1])
+            outputs[i] = output if reads is None else {**copy.deepcopy(record), **output}
+        else:
+            dirty.append(i)
+
+    print(f"  [{stage}] {len(dirty)} changed, {len(records) - len(dirty)} reused")
+    entries = []
+    if dirty:
+        results = process([copy.deepcopy(records[i]) for i in dirty])
+        for i, result in zip(dirty, results):
+            outputs[i] = result
+            stored = result if reads is None else _changes(records[i], result, writes)
+            entries.append((key(records[i]), fingerprints[i], stored))
+    cache.update(stage, entries, {key(record) for record in records})
+    return outputs
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    cache = StageCache()
+    if command == "clear":
+        stage = sys.argv[2] if len(sys.argv) > 2 else None
+        cache.clear(stage)
+        print(f"Cleared {stage or 'all stages'} in {cache.path}")
+    else:
+        for stage, count in sorted(cache.stats().items()):
+            print(f"  {stage}: {count} words")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tatoeba 전처리 코퍼스 캐시 (mmap)
+
+한 번 파싱한 문장/링크를 바이너리 파일로 저장하고, 이후 실행에서는
+mmap으로 열어 파싱 없이 바로 사용한다.
+
+파일 구조 (모든 정수는 네이티브 바이트 순서, 섹션은 8바이트 정렬):
+  MAGIC(8) | version(u32) | source hash(20, sha1) | section count(u32)
+  이후 섹션마다: length(u64) | data | padding
+  섹션 순서: 언어별 [ids(u32), order(u32), offsets(u64), utf-8 blob],
+             링크 [keys(u32), offsets(u32), targets(u32)]
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+
+MAGIC = b'TTBCACHE'
+CACHE_VERSION = 1
+HEADER = struct.Struct('<8sI20sI')
+LENGTH = struct.Struct('<Q')
+LANGUAGES = ('jpn', 'eng', 'kor')
+
+def source_hash(paths):
+    """원본 파일 지문 (파일명, 크기, 수정 시각) + 바이트 순서
+
+    수백 MB 압축 파일 전체를 해시하지 않도록 stat 정보만 사용한다.
+    """
+    h = hashlib.sha1(sys.byteorder.encode())
+    for path in paths:
+        st = os.stat(path)
+        h.update(f"{os.path.basename(path)}\0{st.st_size}\0{st.st_mtime_ns}\0".encode())
+    return h.digest()
+
+class MappedSentences(Mapping):
+    """mmap 버퍼 위의 읽기 전용 id -> text 매핑 (원래 파일 순서 유지)"""
+
+    def __init__(self, ids, order, offsets, blob):
+        self._ids = ids
+        self._order = order
+        self._offsets = offsets
+        self._blob = blob
+
+    def _position(self, sent_id):
+        i = bisect_left(self._order, sent_id, key=self._ids.__getitem__)
+        if i < len(self._order) and self._ids[self._order[i]] == sent_id:
+            return self._order[i]
+        return -1
+
+    def _text(self, pos):
+        return str(self._blob[self._offsets[pos]:self._offsets[pos + 1]], 'utf-8')
+
+    def __getitem__(self, sent_id):
+        pos = self._position(sent_id)
+        if pos < 0:
+            raise KeyError(sent_id)
+        return self._text(pos)
+
+    def __contains__(self, sent_id):
+        return self._position(sent_id) >= 0
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def values(self):
+        return (self._text(pos) for pos in range(len(self._ids)))
+
+    def items(self):
+        return ((self._ids[pos], self._text(pos)) for pos in range(len(self._ids)))
+
+def _sentence_sections(sentences):
+    ids = array('I', sentences.keys())
+    order = array('I', sorted(range(len(ids)), key=ids.__getitem__))
+    offsets = array('Q', [0])
+    chunks = []
+    total = 0
+    for text in sentences.values():
+        data = text.encode('utf-8')
+        chunks.append(data)
+        total += len(data)
+        offsets.append(total)
+    return [ids, order, offsets, b''.join(chunks)]
+
+def write_cache(cache_file, digest, sentences_by_lang, links):
+    """코퍼스를 캐시 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+    sections = []
+    for lang in LANGUAGES:
+        sections.extend(_sentence_sections(sentences_by_lang[lang]))
+    sections.extend([links['keys'], links['offsets'], links['targets']])
+
+    tmp_file = cache_file + '.tmp'
+    with open(tmp_file, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, CACHE_VERSION, digest, len(sections)))
+        for section in sections:
+            data = section.tobytes() if isinstance(section, array) else section
+            f.write(LENGTH.pack(len(data)))
+            f.write(data)
+            f.write(b'\0' * (-len(data) % 8))
+    os.replace(tmp_file, cache_file)
+
+def open_cache(cache_file, digest):
+    """캐시를 mmap으로 열기. 없거나 버전/원본 지문이 다르면 None"""
+    if not os.path.exists(cache_file):
+        return None
+    with open(cache_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < HEADER.size:
+            return None
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, cached_digest, count = HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or version != CACHE_VERSION or cached_digest != digest:
+        buf.close()
+        return None
+
+    view = memoryview(buf)
+    sections = []
+    pos = HEADER.size
+    for _ in range(count):
+        (length,) = LENGTH.unpack_from(buf, pos)
+        pos += LENGTH.size
+        sections.append(view[pos:pos + length])
+        pos += length + (-length % 8)
+
+    corpus = {'mmap': buf}
+    for i, lang in enumerate(LANGUAGES):
+        ids, order, offsets, blob = sections[i * 4:i * 4 + 4]
+        corpus[lang] = MappedSentences(ids.cast('I'), order.cast('I'), offsets.cast('Q'), blob)
+    keys, offsets, targets = sections[len(LANGUAGES) * 4:]
+    corpus['links'] = {'keys': keys.cast('I'), 'offsets': offsets.cast('I'),
+                       'targets': targets.cast('I')}
+    return corpus
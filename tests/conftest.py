@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 파이프라인 스크립트는 저장소 최상위 모듈이므로 최상위를 import 경로에 추가
+sys.path.insert(0, ROOT)
+
+@pytest.fixture
+def repo_root(monkeypatch):
+    """저장소 최상위에서 실행 (lib/db/database_helper.dart 등 상대 경로를 읽는 스크립트용)"""
+    monkeypatch.chdir(ROOT)
+    return ROOT
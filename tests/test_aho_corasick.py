@@ -0,0 +1,21 @@
+import random
+
+from aho_corasick import build_automaton, iter_matches
+
+def _brute_force(patterns, text):
+    return sorted((start + len(pattern) - 1, idx)
+                  for idx, pattern in enumerate(patterns) if pattern
+                  for start in range(len(text)) if text.startswith(pattern, start))
+
+def test_overlapping_and_nested_patterns():
+    patterns = ["he", "she", "his", "hers", "", "ドキドキ", "ドキ"]
+    automaton = build_automaton(patterns)
+    text = "ushers ドキドキドキ"
+    assert sorted(iter_matches(automaton, text)) == _brute_force(patterns, text)
+
+def test_matches_brute_force_on_random_text():
+    rng = random.Random(7)
+    for _ in range(200):
+        patterns = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(6)]
+        text = "".join(rng.choice("abcd") for _ in range(40))
+        assert sorted(iter_matches(build_automaton(patterns), text)) == _brute_force(patterns, text)
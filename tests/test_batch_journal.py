@@ -0,0 +1,43 @@
+import threading
+
+import batch_journal
+from batch_journal import append_record, fixed_batches, load_journal, run_batches
+
+def test_load_journal_skips_failed_and_truncated_lines(tmp_path):
+    journal = str(tmp_path / "journal.jsonl")
+    append_record(journal, {"batch": "1", "status": "ok", "results": {"a": 1}})
+    append_record(journal, {"batch": "2", "status": "failed", "error": "x", "keys": ["b"]})
+    with open(journal, "a", encoding="utf-8") as f:
+        f.write('{"batch": "3", "status": "ok", "resu')
+    assert load_journal(journal) == {"a": 1}
+
+def test_retries_failed_and_missing_items_then_resumes(tmp_path):
+    journal = str(tmp_path / "journal.jsonl")
+    items = list("abcdef")
+    calls = []
+
+    def flaky(batch):
+        calls.append(list(batch))
+        if len(calls) == 1:
+            raise RuntimeError("rate limited")
+        return {item: item.upper() for item in batch if item != "e" or len(calls) > 3}
+
+    done, pending = run_batches(items, flaky, journal, lambda item: item,
+                                lambda pending: fixed_batches(pending, 2), retry_delay=0)
+    assert done == {item: item.upper() for item in items}
+    assert pending == []
+
+    calls.clear()
+    done, pending = run_batches(items, flaky, journal, lambda item: item,
+                                lambda pending: fixed_batches(pending, 2), retry_delay=0)
+    assert calls == [] and pending == [] and len(done) == 6
+
+def test_append_record_without_lock_uses_shared_lock(tmp_path):
+    journal = tmp_path / "journal.jsonl"
+    writer = threading.Thread(target=append_record, args=(str(journal), {"batch": "1", "status": "ok", "results": {}}))
+    with batch_journal._APPEND_LOCK:
+        writer.start()
+        writer.join(0.2)
+        assert writer.is_alive() and not journal.exists()
+    writer.join()
+    assert journal.read_text(encoding="utf-8").count("\n") == 1
@@ -0,0 +1,99 @@
+import json
+import os
+import random
+import shutil
+import sqlite3
+
+import pytest
+
+from build_db import (DART_HELPER, WORD_COLUMNS, build_db, dart_schema, load_words_by_category, search_words,
+                      verify_schema, word_row)
+from normalize_words import load_normalized
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DART_FILE = os.path.join(ROOT, DART_HELPER)
+
+@pytest.fixture(scope="module")
+def words():
+    words, _ = load_normalized(os.path.join(ROOT, "assets", "data", "words.json"))
+    return words
+
+@pytest.fixture(scope="module")
+def db_file(words, tmp_path_factory):
+    db_file = str(tmp_path_factory.mktemp("db") / "daily_japanese.db")
+    build_db(words, db_file, DART_FILE)
+    return db_file
+
+@pytest.fixture
+def conn(db_file):
+    conn = sqlite3.connect(db_file)
+    yield conn
+    conn.close()
+
+def test_schema_matches_create_db(db_file):
+    assert verify_schema(db_file, DART_FILE) == []
+
+def test_user_version_matches_open_database(conn):
+    _, version = dart_schema(DART_FILE)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == version
+
+def test_schema_difference_is_reported(db_file, tmp_path):
+    changed = str(tmp_path / "changed.db")
+    shutil.copyfile(db_file, changed)
+    conn = sqlite3.connect(changed)
+    conn.execute("ALTER TABLE words ADD COLUMN extra TEXT")
+    conn.commit()
+    conn.close()
+    assert [problem for problem in verify_schema(changed, DART_FILE) if problem.startswith("table words")]
+
+def test_rows_follow_load_initial_data(conn, words):
+    rows = conn.execute(f"SELECT {', '.join(WORD_COLUMNS)} FROM words ORDER BY id").fetchall()
+    assert rows == sorted(word_row(word) for word in words)
+    row = dict(zip(WORD_COLUMNS, word_row({"id": 1, "word": "猫", "reading": "ねこ", "definition": "cat",
+                                            "korean": "고양이", "example_jp": "猫がいる。"})))
+    assert (row["kanji"], row["hiragana"], row["isFavorite"]) == ("猫", "ねこ", 0)
+    assert json.loads(row["translations"]) == {"ko": {"definition": "고양이", "example": ""}}
+    assert ":" in row["translations"] and ", " not in row["translations"]  # Dart json.encode 형식
+
+def _like_search(conn, query):
+    """DatabaseHelper.searchWords와 같은 LIKE 쿼리"""
+    return conn.execute("SELECT * FROM words WHERE word LIKE ? OR definition LIKE ? OR hiragana LIKE ? "
+                        "ORDER BY word ASC", [f"%{query}%"] * 3).fetchall()
+
+def _queries(words):
+    rng = random.Random(11)
+    queries = ["hospital", "HOSPITAL", "します", "to ", "xyzzy", "ね", "の", 'a "quote"']
+    for word in rng.sample(words, 60):
+        for text in (word["word"], word.get("reading") or "", word["definition"]):
+            if len(text) >= 2:
+                start = rng.randrange(len(text) - 1)
+                queries.append(text[start:start + rng.randint(2, 6)])
+    return [query for query in queries if "%" not in query and "_" not in query]
+
+def test_fts_search_matches_like(conn, words):
+    for query in _queries(words):
+        assert sorted(search_words(conn, query)) == sorted(_like_search(conn, query)), query
+
+def test_fts_search_orders_by_word(conn):
+    rows = search_words(conn, "ing")
+    assert rows and [row[1] for row in rows] == sorted(row[1] for row in rows)
+
+def test_translations_table_matches_translations_json(conn):
+    expected = set()
+    for word_id, translations in conn.execute("SELECT id, translations FROM words WHERE translations IS NOT NULL"):
+        for code, texts in json.loads(translations).items():
+            for field_type in ("definition", "example"):
+                if texts.get(field_type):
+                    expected.add((word_id, code, field_type, texts[field_type], 0))
+    actual = set(conn.execute("SELECT wordId, languageCode, fieldType, translatedText, createdAt FROM translations"))
+    assert expected and actual == expected
+
+def test_load_words_by_category_joins_translations(conn):
+    category = conn.execute("SELECT category FROM words GROUP BY category ORDER BY count(*) DESC").fetchone()[0]
+    rows = load_words_by_category(conn, category, "ko")
+    assert [row[0] for row in rows] == [row[0] for row in conn.execute(
+        "SELECT id FROM words WHERE category = ? ORDER BY id", (category,))]
+    for row in rows:
+        (translations,) = conn.execute("SELECT translations FROM words WHERE id = ?", (row[0],)).fetchone()
+        ko = json.loads(translations).get("ko", {}) if translations else {}
+        assert row[-2:] == (ko.get("definition") or None, ko.get("example") or None)
@@ -0,0 +1,57 @@
+import sqlite3
+
+import pytest
+
+from build_db import build_db
+from delta_update import apply_delta_sql, delta_sql, diff_words, verify_delta
+
+def _word(word_id, word, definition, **fields):
+    record = {"id": word_id, "word": word, "reading": word, "definition": definition, "category": "daily"}
+    record.update(fields)
+    return record
+
+OLD = [
+    _word(1, "病院", "hospital", korean="병원"),
+    _word(2, "します", "to do"),
+    _word(3, "猫", "cat", korean="고양이", example_jp="猫がいる。", example_ko="고양이가 있다."),
+    _word(4, "犬", "dog"),
+]
+NEW = [
+    _word(1, "病院", "hospital; clinic", korean="병원"),
+    _word(3, "猫", "cat", korean="고양이!", example_jp="猫がいる。", example_ko="고양이가 있다."),
+    _word(4, "犬", "dog"),
+    _word(7, "鳥", "bird", korean="새"),
+]
+
+@pytest.fixture
+def dbs(repo_root, tmp_path):
+    old_db, new_db = str(tmp_path / "old.db"), str(tmp_path / "new.db")
+    build_db(OLD, old_db)
+    build_db(NEW, new_db)
+    return old_db, new_db
+
+def test_diff_words():
+    delta = diff_words(OLD, NEW)
+    assert delta["delete"] == [2]
+    assert [row["id"] for row in delta["insert"]] == [7]
+    assert sorted(delta["update"]) == [1, 3]
+    assert set(delta["update"][1]) == {"definition"}
+    assert delta["base"]["count"] == 4 and delta["base"]["max_id"] == 4
+
+def test_verify_delta_on_modified_deck(dbs):
+    old_db, new_db = dbs
+    assert verify_delta(old_db, new_db, delta_sql(diff_words(OLD, NEW))) == []
+
+def test_incomplete_delta_is_reported(dbs):
+    old_db, new_db = dbs
+    delta = diff_words(OLD, NEW)
+    del delta["update"][1]
+    assert verify_delta(old_db, new_db, delta_sql(delta))
+
+def test_delta_refuses_wrong_base(dbs):
+    _, new_db = dbs
+    with pytest.raises(sqlite3.IntegrityError, match="delta_base_mismatch"):
+        apply_delta_sql(new_db, delta_sql(diff_words(OLD, NEW)))
+    conn = sqlite3.connect(new_db)
+    assert conn.execute("SELECT count(*) FROM words").fetchone()[0] == len(NEW)
+    conn.close()
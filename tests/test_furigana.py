@@ -0,0 +1,24 @@
+import time
+
+from furigana import align
+
+def test_aligns_kanji_runs_between_kana():
+    segments, problem = align("食べ物", "たべもの")
+    assert segments == [("食", "た"), ("べ", None), ("物", "もの")]
+    assert problem is None
+
+def test_folds_katakana_in_reading():
+    segments, problem = align("クラスに行く", "くらすにいく")
+    assert segments == [("クラスに", None), ("行", "い"), ("く", None)]
+    assert problem is None
+
+def test_reports_ambiguous_and_unaligned():
+    assert align("日日", "ひび") == ([("日日", "ひび")], None)
+    assert align("漢の字", "かののの")[1] == "ambiguous"
+    assert align("漢ね", "かな") == (None, "no alignment")
+
+def test_unalignable_reading_is_not_exponential():
+    start = time.perf_counter()
+    for k in (14, 40, 100):
+        assert align("の".join(["漢"] * k) + "ね", "かの" * k + "な") == (None, "no alignment")
+    assert time.perf_counter() - start < 1.0
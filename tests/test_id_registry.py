@@ -0,0 +1,115 @@
+import json
+
+import pytest
+
+from id_registry import IdRegistry
+
+def _word(word_id, word, category="daily", reading=None):
+    return {"id": word_id, "word": word, "reading": reading or word, "category": category}
+
+@pytest.fixture
+def registry(tmp_path):
+    return IdRegistry(str(tmp_path / "ids.json"))
+
+def test_save_and_reload(registry):
+    registry.sync([_word(1, "あ"), _word(2, "い")])
+    registry.save()
+    reloaded = IdRegistry(registry.path)
+    assert reloaded.ids == registry.ids
+    assert reloaded.next_id == 3
+
+def test_key_ignores_kana_and_width_differences(registry):
+    registry.sync([_word(1, "グッスリ")])
+    assert registry.lookup(_word(None, "ぐっすり")) == 1
+    assert registry.lookup(_word(None, "ぐっすり", category="home")) is None
+
+def test_deleted_word_keeps_its_id(registry):
+    registry.sync([_word(1, "あ"), _word(2, "い"), _word(3, "う")])
+    assert registry.sync([_word(1, "あ"), _word(3, "う")]) == []
+    new = [_word(None, "え"), _word(None, "い")]
+    registry.assign(new)
+    assert [word["id"] for word in new] == [4, 2]
+
+def test_swapped_ids(registry):
+    registry.sync([_word(1, "あ"), _word(2, "い")])
+    changes = registry.sync([_word(2, "あ"), _word(1, "い")])
+    assert sorted(changes) == [("あ\tあ\tdaily", 1, 2), ("い\tい\tdaily", 2, 1)]
+    assert registry.ids == {"あ\tあ\tdaily": 2, "い\tい\tdaily": 1}
+    assert registry.sync([_word(2, "あ"), _word(1, "い")]) == []
+
+def test_edited_word_moves_its_id(registry):
+    registry.sync([_word(1, "あ"), _word(2, "い")])
+    assert registry.sync([_word(1, "あ"), _word(2, "う")]) == []
+    assert registry.ids == {"あ\tあ\tdaily": 1, "う\tう\tdaily": 2}
+
+def _duplicates():
+    return [_word(1, "あ"), _word(2, "遊ぶ", reading="あそぶ"), _word(3, "い"), _word(4, "遊ぶ", reading="あそぶ")]
+
+def test_delete_first_duplicate(registry):
+    words = _duplicates()
+    registry.sync(words)
+    assert registry.sync([word for word in words if word["id"] != 2]) == []
+    assert registry.sync(words) == []
+
+def test_reorder_duplicates(registry):
+    words = _duplicates()
+    registry.sync(words)
+    assert registry.sync(list(reversed(words))) == []
+
+def test_insert_duplicate(registry):
+    words = _duplicates()
+    registry.sync(words)
+    inserted = _word(5, "遊ぶ", reading="あそぶ")
+    assert registry.sync([inserted] + words) == []
+    assert registry.sync(words + [inserted]) == []
+    assert registry.next_id == 6
+
+def test_assign_reuses_ids_of_duplicates_by_position(registry):
+    words = [_word(None, "あ"), _word(None, "あ")]
+    registry.assign(words)
+    again = [_word(7, "あ"), _word(3, "あ")]
+    registry.assign(again)
+    assert [word["id"] for word in again] == [1, 2]
+
+def test_assign_keeps_unregistered_ids(registry):
+    words = [_word(10, "あ"), _word(20, "い"), _word(10, "う")]
+    registry.assign(words)
+    assert [word["id"] for word in words] == [10, 20, 21]
+    assert registry.next_id == 22
+
+def test_assign_iter_is_lazy(registry):
+    read = []
+
+    def source():
+        for word in [_word(None, "あ"), _word(None, "あ"), _word(None, "い")]:
+            read.append(word["word"])
+            yield word
+
+    assigned = registry.assign_iter(source())
+    assert next(assigned)["id"] == 1
+    assert read == ["あ"]
+    assert [word["id"] for word in assigned] == [2, 3]
+
+def test_registry_file_format(registry):
+    registry.sync([_word(2, "い"), _word(1, "あ")])
+    registry.save()
+    with open(registry.path, encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["fields"] == ["word", "reading", "category"]
+    assert list(data["ids"].values()) == [1, 2]
+
+def test_sync_iter_yields_before_reading_everything(registry):
+    registry.sync([_word(1, "あ"), _word(2, "い")])
+    read = []
+
+    def source():
+        for word in [_word(1, "あ"), _word(3, "う"), _word(2, "い")]:
+            read.append(word["id"])
+            yield word
+
+    changes = []
+    synced = registry.sync_iter(source(), changes)
+    assert next(synced)["id"] == 1
+    assert read == [1]
+    assert [word["id"] for word in synced] == [3, 2]
+    assert changes == [] and registry.lookup(_word(None, "う")) == 3
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from json_stream import ArrayItemSplitter, iter_array_items, iter_json_file, write_json_array
+
+DOC = ('﻿[\n  {"id": 1, "word": "食べる", "note": "a \\"quoted\\" [bracket], {brace}"},\n'
+       '  1.5, -2e-3, 10E+2, 0, true, false, null, "\\u3042\\\\",\n'
+       '  [1, [2.25, {"x": []}]], {}, []\n]\n')
+
+def _write(tmp_path, text):
+    path = tmp_path / "doc.json"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+def test_iter_json_file_every_chunk_size(tmp_path):
+    path = _write(tmp_path, DOC)
+    expected = json.loads(DOC.lstrip("﻿"))
+    for chunk_size in range(1, len(DOC) + 1):
+        assert list(iter_json_file(path, chunk_size)) == expected, chunk_size
+
+def test_iter_json_file_number_across_chunks(tmp_path):
+    path = _write(tmp_path, "[1.5, 2]")
+    assert list(iter_json_file(path, chunk_size=1)) == [1.5, 2]
+
+@pytest.mark.parametrize("text", ["[1 2]", "[1, 2", '[{"a": 1}', "[1.]"])
+def test_iter_json_file_rejects_malformed(tmp_path, text):
+    path = _write(tmp_path, text)
+    for chunk_size in (1, 3, 1 << 20):
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_file(path, chunk_size))
+
+def test_iter_json_file_empty_array(tmp_path):
+    assert list(iter_json_file(_write(tmp_path, " [ ] "))) == []
+
+def test_write_json_array_matches_json_dump(tmp_path):
+    items = json.loads(DOC.lstrip("﻿"))
+    path = str(tmp_path / "out.json")
+    write_json_array(iter(items), path)
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == json.dumps(items, ensure_ascii=False, indent=2)
+    write_json_array([], path)
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == "[]"
+
+def test_splitter_every_chunk_size():
+    text = "```json\n" + DOC.lstrip("﻿") + "```"
+    expected = json.loads(DOC.lstrip("﻿"))
+    for size in range(1, len(text) + 1):
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        assert [value for value, _ in iter_array_items(chunks)] == expected, size
+
+def test_splitter_keeps_items_after_broken_one():
+    pairs = list(iter_array_items(['[{"a": 1}, {"b": }, ', '{"c": 3}]']))
+    assert [value for value, _ in pairs] == [{"a": 1}, None, {"c": 3}]
+    assert pairs[1][1].startswith("invalid JSON element")
+
+def test_splitter_ignores_text_after_array():
+    splitter = ArrayItemSplitter()
+    assert splitter.feed('[1, 2] trailing [3]') == ["1", "2"]
+    assert splitter.finished
+    assert splitter.feed("[4]") == []
@@ -0,0 +1,31 @@
+import pytest
+
+from kana_normalize import fold_width, hiragana_to_katakana, katakana_to_hiragana, keyed, normalize_key
+
+@pytest.mark.parametrize("variant", ["どきどき", "ドキドキ", "ﾄﾞｷﾄﾞｷ", "ドキどき"])
+def test_normalize_key_folds_kana_and_width(variant):
+    assert normalize_key(variant) == "どきどき"
+
+def test_normalize_key_folds_latin_width_and_case():
+    assert normalize_key("ＡＢＣ") == normalize_key("Abc") == "abc"
+    assert normalize_key("ｶﾞｷﾞ") == "がぎ"  # 반각 탁점 조합
+    assert normalize_key("ヴ") == "ゔ" and normalize_key("ヵヶ") == "ゕゖ"
+
+def test_normalize_key_keeps_other_text():
+    assert normalize_key("漢字ー、。") == "漢字ー、。"
+    assert normalize_key("") == ""
+
+def test_kana_conversion_keeps_length_and_round_trips():
+    hiragana = "".join(chr(code) for code in range(0x3041, 0x3097))
+    katakana = hiragana_to_katakana(hiragana)
+    assert len(katakana) == len(hiragana)
+    assert katakana_to_hiragana(katakana) == hiragana
+    assert hiragana_to_katakana("ねこ・ネコ") == "ネコ・ネコ"
+
+def test_fold_width_returns_normalized_text_unchanged():
+    text = "猫がいる。"
+    assert fold_width(text) == text
+    assert fold_width("ｷﾗｷﾗ１２") == "キラキラ12"
+
+def test_keyed_keeps_first_entry():
+    assert keyed({"ネコ": 1, "ねこ": 2, "ｲﾇ": 3}) == {"ねこ": 1, "いぬ": 3}
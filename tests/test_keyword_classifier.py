@@ -0,0 +1,40 @@
+import random
+
+import pytest
+
+from bench_classifier import legacy_classify
+from categorize_and_translate import RECATEGORY_CLASSIFIER, RECATEGORY_KEYWORDS
+from extract_onomatopoeia import CATEGORY_CLASSIFIER, CATEGORY_KEYWORDS
+from keyword_classifier import classify, compile_classifier
+
+TABLES = [
+    (CATEGORY_KEYWORDS, CATEGORY_CLASSIFIER),
+    (list(RECATEGORY_KEYWORDS.items()), RECATEGORY_CLASSIFIER),
+]
+
+def _definitions(table, count=2000):
+    """키워드 조각, 겹치는 키워드, 대문자가 섞인 정의문"""
+    rng = random.Random(7)
+    keywords = [keyword for _, category_keywords in table for keyword in category_keywords]
+    filler = ["the", "a", "sound", "of", "ing", "ly", "(on-mim)", "ra", "s"]
+    for _ in range(count):
+        parts = [rng.choice(keywords if rng.random() < 0.4 else filler) for _ in range(rng.randint(0, 6))]
+        text = "".join(part + rng.choice(["", " ", "; "]) for part in parts)
+        yield text.upper() if rng.random() < 0.1 else text
+
+@pytest.mark.parametrize("table, classifier", TABLES)
+def test_matches_legacy_loop(table, classifier):
+    for definition in _definitions(table):
+        assert classify(classifier, definition) == legacy_classify(table, definition), definition
+
+def test_first_category_wins_for_prefix_keywords():
+    classifier = compile_classifier([("short", ["ra"]), ("long", ["rain"])])
+    assert classify(classifier, "rain") == "short"
+    classifier = compile_classifier([("long", ["rain"]), ("short", ["ra"])])
+    assert classify(classifier, "rain") == "long"
+    assert classify(classifier, "raw") == "short"
+
+def test_no_keywords_returns_default():
+    classifier = compile_classifier([("empty", []), ("blank", [""])])
+    assert classify(classifier, "anything", default="other") == "other"
+    assert classify(classifier, "", default="other") == "other"
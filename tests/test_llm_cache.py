@@ -0,0 +1,152 @@
+import asyncio
+import functools
+import importlib
+import threading
+from http.server import ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from llm_async import RateLimiter, with_retries
+from llm_cache import ResponseCache, cache_key, cached_completion, stream_completion_async
+from llm_stub_server import StubHandler
+
+REQUEST = {"model": "m", "messages": [{"role": "user", "content": "hi"}], "temperature": 0, "max_tokens": 10}
+
+def _response(content, finish_reason="stop"):
+    message = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason=finish_reason)])
+
+class FakeClient:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **request):
+        self.calls += 1
+        return self.responses.pop(0)
+
+class FakeStreamClient:
+    """chunks: [(text, finish_reason)] 를 스트림 조각으로 돌려주는 AsyncOpenAI 대역"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, stream=False, **request):
+        self.calls += 1
+
+        async def generate():
+            for text, finish_reason in self.chunks:
+                delta = SimpleNamespace(content=text)
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)])
+        return generate()
+
+def _collect(aclient, cache):
+    async def run():
+        return "".join([text async for text in stream_completion_async(aclient, cache, REQUEST)])
+    return asyncio.run(run())
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    yield cache
+    cache.close()
+
+def test_cache_key_ignores_other_fields_and_key_order():
+    reordered = dict(reversed(list(REQUEST.items())), stream=True)
+    assert cache_key(reordered) == cache_key(REQUEST)
+    assert cache_key(dict(REQUEST, temperature=1)) != cache_key(REQUEST)
+
+def test_evicts_least_recently_accessed(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    cache.close()
+
+def test_cached_completion_stores_only_parsed_responses(cache):
+    client = FakeClient(_response("not json"), _response("[1]"))
+    with pytest.raises(ValueError):
+        cached_completion(client, cache, REQUEST, parse=lambda r: int(r["content"]))
+    assert cache.stats()["entries"] == 0
+    assert cached_completion(client, cache, REQUEST, parse=lambda r: r["content"]) == "[1]"
+    assert cached_completion(client, cache, REQUEST, parse=lambda r: r["content"]) == "[1]"
+    assert client.calls == 2
+
+def test_cached_completion_does_not_store_truncated_responses(cache):
+    client = FakeClient(_response("[1, ", "length"), _response("[1]"))
+    assert cached_completion(client, cache, REQUEST, parse=lambda r: r["content"]) == "[1, "
+    assert cache.stats()["entries"] == 0
+    assert cached_completion(client, cache, REQUEST, parse=lambda r: r["content"]) == "[1]"
+    assert client.calls == 2
+
+def test_cached_completion_drops_truncated_entry_from_older_cache(cache):
+    cache.put(cache_key(REQUEST), {"content": "[1, ", "finish_reason": "length"})
+    client = FakeClient(_response("[1]"))
+    assert cached_completion(client, cache, REQUEST) == {"content": "[1]", "finish_reason": "stop"}
+    assert client.calls == 1
+
+def test_stream_caches_only_finished_responses(cache):
+    truncated = FakeStreamClient([("[1, ", None), ("2", "length")])
+    assert _collect(truncated, cache) == "[1, 2"
+    assert cache.stats()["entries"] == 0
+
+    finished = FakeStreamClient([("[1, ", None), ("2]", "stop")])
+    assert _collect(finished, cache) == "[1, 2]"
+    assert _collect(finished, cache) == "[1, 2]"
+    assert finished.calls == 1
+
+def test_stream_drops_truncated_entry_from_older_cache(cache):
+    cache.put(cache_key(REQUEST), {"content": "[1, ", "finish_reason": "length"})
+    client = FakeStreamClient([("[1]", "stop")])
+    assert _collect(client, cache) == "[1]"
+    assert client.calls == 1
+
+@pytest.fixture
+def stub_server():
+    """bad-rate 1.0 스텁 서버 (모든 단어의 필드가 비어 있음). 요청 수를 센다"""
+    calls = []
+
+    class Handler(StubHandler):
+        bad_rate = 1.0
+
+        def do_POST(self):
+            calls.append(self.path)
+            super().do_POST()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1", calls
+    server.shutdown()
+    server.server_close()
+
+def test_invalid_stream_is_not_replayed_from_cache(stub_server, tmp_path, monkeypatch):
+    from openai import AsyncOpenAI
+
+    base_url, calls = stub_server
+    monkeypatch.setenv("OPENAI_API_KEY", "stub")
+    monkeypatch.chdir(tmp_path)
+    add_categories = importlib.import_module("add_categories")
+    cache = ResponseCache(str(tmp_path / "llm_cache.sqlite"))
+    monkeypatch.setattr(add_categories, "cache", cache)
+    monkeypatch.setattr(add_categories, "with_retries", functools.partial(with_retries, base_delay=0))
+
+    async def run():
+        aclient = AsyncOpenAI(base_url=base_url, api_key="stub")
+        return await add_categories.stream_chunk_async(
+            aclient, add_categories.NEW_CATEGORIES[0], 3, 1, 1, RateLimiter(), asyncio.Semaphore(1),
+            accept=lambda word: True, retries=2)
+
+    with pytest.raises(add_categories.IncompleteStream):
+        asyncio.run(run())
+    assert len(calls) == 3          # 재시도마다 API를 다시 호출 (캐시된 잘못된 응답을 재사용하지 않음)
+    assert cache.hits == 0
+    assert cache.stats()["entries"] == 0
+    cache.close()
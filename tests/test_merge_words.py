@@ -0,0 +1,54 @@
+from id_registry import IdRegistry
+from merge_words import merge_words
+
+def _word(word_id, word, reading, category="greeting", **fields):
+    record = {"id": word_id, "word": word, "reading": reading, "definition": word, "category": category}
+    record.update(fields)
+    return record
+
+EXISTING = [_word(1, "こんにちは", "こんにちは"), _word(2, "会社", "かいしゃ", "work")]
+
+def _registry(tmp_path, existing):
+    registry = IdRegistry(str(tmp_path / "ids.json"))
+    registry.sync(existing)
+    return registry
+
+def test_kana_and_width_variants_are_duplicates():
+    new = [_word(None, "コンニチハ", "コンニチハ", "party", example_jp="こんにちは、皆さん。"),
+           _word(None, "会社", "ｶｲｼｬ")]
+    merged, report = merge_words([dict(w) for w in EXISTING], new)
+    assert [w["id"] for w in merged] == [1, 2]
+    assert [(word, kept_id) for word, kept_id, _ in report["duplicates"]] == [("コンニチハ", 1), ("会社", 2)]
+    assert merged[0]["example_jp"] == "こんにちは、皆さん。"
+    assert report["filled"] == 1
+
+def test_rerun_with_same_ids_is_already_merged():
+    merged, report = merge_words([dict(w) for w in EXISTING], [dict(EXISTING[1])])
+    assert len(merged) == 2
+    assert report["already_merged"] == 1 and not report["duplicates"]
+
+def test_without_registry_new_ids_follow_max_id():
+    new = [_word(None, "銀行", "ぎんこう", "bank"), _word(1, "現金", "げんきん", "bank")]
+    merged, report = merge_words([dict(w) for w in EXISTING], new)
+    assert [w["id"] for w in merged[2:]] == [3, 4]
+    assert report["renumbered"] == 2
+
+def test_skipped_duplicates_do_not_take_registry_ids(tmp_path):
+    existing = [dict(w) for w in EXISTING]
+    registry = _registry(tmp_path, existing)
+    new = [_word(None, "こんにちは", "こんにちは", "party"), _word(None, "銀行", "ぎんこう", "bank")]
+    merged, report = merge_words(existing, new, registry=registry)
+    assert [w["id"] for w in merged] == [1, 2, 3]
+    assert len(report["duplicates"]) == 1
+    assert registry.next_id == 4
+    assert registry.lookup(_word(None, "こんにちは", "こんにちは", "party")) is None
+
+def test_registry_id_replaces_foreign_id_and_is_reused(tmp_path):
+    existing = [dict(w) for w in EXISTING]
+    registry = _registry(tmp_path, existing)
+    registry.allocate(_word(None, "銀行", "ぎんこう", "bank"))  # 예전에 있다가 지운 단어 (id 3)
+    new = [_word(900, "銀行", "ぎんこう", "bank"), _word(2, "現金", "げんきん", "bank")]
+    merged, report = merge_words(existing, new, registry=registry)
+    assert [w["id"] for w in merged[2:]] == [3, 4]
+    assert report["renumbered"] == 2
+    assert registry.next_id == 5
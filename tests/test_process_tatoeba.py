@@ -0,0 +1,107 @@
+import bz2
+import io
+import os
+import random
+import tarfile
+from array import array
+
+import pytest
+
+import process_tatoeba
+from process_tatoeba import (build_link_table, build_ngram_index, find_examples_for_word, get_links, iter_lines,
+                             load_links, load_sentences, lookup_candidates, match_all_terms,
+                             match_terms_with_index, resolve_source)
+
+WORDS = ["どきどき", "ワクワク", "ｷﾗｷﾗ", "猫", "雨", "ざあざあ", "ぴかぴか", "ＡＢＣ", "abc"]
+
+def _corpus(count=400, seed=3):
+    rng = random.Random(seed)
+    filler = ["今日は", "とても", "です。", "、", "が", "降る", "光る", "ABC", "ｷﾗｷﾗ", "きらきら"]
+    return {1000 + i: "".join(rng.choice(WORDS + filler) for _ in range(rng.randint(1, 6))) for i in range(count)}
+
+TERMS = WORDS + ["キラキラ", "ど", "無い言葉", "雨が降る"]
+
+@pytest.fixture(scope="module")
+def corpus():
+    return _corpus()
+
+@pytest.fixture(scope="module")
+def expected(corpus):
+    return {term: find_examples_for_word(term, corpus, limit=3) for term in TERMS}
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_automaton_matches_linear_scan(corpus, expected, workers):
+    assert match_all_terms(TERMS, corpus, limit=3, workers=workers) == expected
+    assert process_tatoeba._SHARED == {}
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_index_workers_match_linear_scan(corpus, expected, workers):
+    index = build_ngram_index(corpus)
+    assert match_terms_with_index(TERMS, index, limit=3, workers=workers) == expected
+    assert process_tatoeba._SHARED == {}
+
+def test_index_matches_linear_scan_per_word(corpus):
+    index = build_ngram_index(corpus)
+    for term in TERMS:
+        assert find_examples_for_word(term, None, index, limit=5) == find_examples_for_word(term, corpus, limit=5)
+
+def test_lookup_candidates():
+    index = build_ngram_index({10: "どきどきする", 11: "ドキドキ", 12: "きどき"})
+    assert lookup_candidates("きする", index) == [0]
+    assert lookup_candidates("どきど", index) == [0, 2]  # n-gram만 확인 (부분 문자열 검증 전)
+    assert lookup_candidates("ぬぬ", index) == []
+    assert lookup_candidates("ど", index) is None  # n보다 짧으면 색인으로 좁힐 수 없음
+
+SENTENCES_TSV = "1\tjpn\t猫がいる。\n2\tjpn\tどきどきする。\nbroken line\n3\tjpn\t雨がざあざあ降る。\n"
+LINKS_CSV = "1\t100\n1\t200\n2\t100\n9\t100\n3\t300\n"
+
+def _write_archives(directory):
+    """평문/bz2/tar.bz2 형식의 Tatoeba 파일"""
+    (directory / "jpn_sentences.tsv").write_text(SENTENCES_TSV, encoding="utf-8")
+    with bz2.open(directory / "jpn_sentences.tsv.bz2", "wt", encoding="utf-8") as f:
+        f.write(SENTENCES_TSV)
+    data = LINKS_CSV.encode("utf-8")
+    with tarfile.open(directory / "links.tar.bz2", "w:bz2") as tar:
+        member = tarfile.TarInfo("links/links.csv")
+        member.size = len(data)
+        tar.addfile(member, io.BytesIO(data))
+
+def test_iter_lines_reads_archives_without_extracting(tmp_path):
+    _write_archives(tmp_path)
+    plain = list(iter_lines(str(tmp_path / "jpn_sentences.tsv")))
+    assert list(iter_lines(str(tmp_path / "jpn_sentences.tsv.bz2"))) == plain
+    assert "".join(iter_lines(str(tmp_path / "links.tar.bz2"))) == LINKS_CSV
+    with pytest.raises(FileNotFoundError):
+        list(iter_lines(str(tmp_path / "links.tar.bz2"), member_name="missing.csv"))
+    assert sorted(os.listdir(tmp_path)) == ["jpn_sentences.tsv", "jpn_sentences.tsv.bz2", "links.tar.bz2"]
+
+def test_load_sentences_from_bz2(tmp_path):
+    _write_archives(tmp_path)
+    sentences = load_sentences(str(tmp_path / "jpn_sentences.tsv.bz2"))
+    assert sentences == {1: "猫がいる。", 2: "どきどきする。", 3: "雨がざあざあ降る。"}
+    assert sentences == load_sentences(str(tmp_path / "jpn_sentences.tsv"))
+
+def test_resolve_source_prefers_extracted_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert resolve_source("jpn_sentences.tsv", "jpn_sentences.tsv.bz2") == "jpn_sentences.tsv.bz2"
+    _write_archives(tmp_path)
+    assert resolve_source("jpn_sentences.tsv", "jpn_sentences.tsv.bz2") == "jpn_sentences.tsv"
+
+def test_link_table_is_csr_and_keeps_target_order():
+    src = array("I", [5, 1, 5, 3, 1])
+    tgt = array("I", [50, 10, 51, 30, 11])
+    table = build_link_table(src, tgt)
+    assert list(table["keys"]) == [1, 3, 5]
+    assert list(table["offsets"]) == [0, 2, 3, 5]
+    assert list(get_links(table, 1)) == [10, 11]
+    assert list(get_links(table, 5)) == [50, 51]
+    assert list(get_links(table, 4)) == [] and list(get_links(table, 9)) == []
+    assert list(get_links(build_link_table(array("I"), array("I")), 1)) == []
+
+def test_load_links_filters_sources_and_targets(tmp_path):
+    _write_archives(tmp_path)
+    links = load_links(str(tmp_path / "links.tar.bz2"), sources={1: "", 2: "", 3: ""},
+                       targets=({100: ""}, {300: ""}))
+    assert list(links["keys"]) == [1, 2, 3]
+    assert [list(get_links(links, sent_id)) for sent_id in (1, 2, 3, 9)] == [[100], [100], [300], []]
+    assert links["targets"].typecode == "I"
@@ -0,0 +1,51 @@
+import pytest
+
+from stage_cache import StageCache, run_incremental
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = StageCache(str(tmp_path / "stage.sqlite"))
+    yield cache
+    cache.close()
+
+def _records():
+    return [{"id": 1, "word": "あ", "definition": "a"}, {"id": 2, "word": "い", "definition": "i"}]
+
+def test_reuses_unchanged_records(cache):
+    calls = []
+
+    def process(records):
+        calls.append([record["id"] for record in records])
+        return [dict(record, upper=record["definition"].upper()) for record in records]
+
+    first = run_incremental(cache, "s", _records(), process, "v1")
+    records = _records()
+    records[1]["definition"] = "ii"
+    second = run_incremental(cache, "s", records, process, "v1")
+    assert calls == [[1, 2], [2]]
+    assert second == [first[0], dict(records[1], upper="II")]
+    run_incremental(cache, "s", records, process, "v2")
+    assert calls[-1] == [1, 2]
+
+def test_reads_limit_fingerprint_and_writes_are_merged(cache):
+    calls = []
+
+    def process(records):
+        calls.append([record["id"] for record in records])
+        for record in records:
+            record["example"] = record["word"] * 2
+        return records
+
+    options = dict(reads=("word",), writes=("example",))
+    run_incremental(cache, "s", _records(), process, "v1", **options)
+    records = _records()
+    records[0]["definition"] = "edited"
+    outputs = run_incremental(cache, "s", records, process, "v1", **options)
+    assert calls == [[1, 2]]
+    assert outputs == [dict(records[0], example="ああ"), dict(records[1], example="いい")]
+    assert "example" not in records[0]
+
+    records[1]["word"] = "う"
+    outputs = run_incremental(cache, "s", records, process, "v1", **options)
+    assert calls[-1] == [2]
+    assert outputs[1]["example"] == "うう"
@@ -0,0 +1,71 @@
+import os
+from array import array
+
+import pytest
+
+from process_tatoeba import build_link_table, get_links, load_corpus
+from tatoeba_cache import open_cache, source_hash, write_cache
+
+SENTENCES = {
+    "jpn": {7: "猫がいる。", 2: "どきどきする。", 30: "雨がざあざあ降る。"},  # 파일 순서 (id 순서 아님)
+    "eng": {100: "There is a cat.", 300: "It's pouring."},
+    "kor": {},
+}
+
+@pytest.fixture
+def corpus():
+    corpus = {lang: dict(sentences) for lang, sentences in SENTENCES.items()}
+    corpus["links"] = build_link_table(array("I", [30, 7, 7]), array("I", [300, 100, 101]))
+    return corpus
+
+def _mapped_links(links, sent_id):
+    return list(get_links(links, sent_id))
+
+def test_round_trip(tmp_path, corpus):
+    cache_file = str(tmp_path / "cache.bin")
+    write_cache(cache_file, b"d" * 20, corpus, corpus["links"])
+    cached = open_cache(cache_file, b"d" * 20)
+    for lang, sentences in SENTENCES.items():
+        mapped = cached[lang]
+        assert list(mapped.items()) == list(sentences.items())
+        assert list(mapped) == list(sentences) and len(mapped) == len(sentences)
+        for sent_id, text in sentences.items():
+            assert sent_id in mapped and mapped[sent_id] == text
+    assert 8 not in cached["jpn"]
+    with pytest.raises(KeyError):
+        cached["jpn"][8]
+    assert [_mapped_links(cached["links"], sent_id) for sent_id in (7, 30, 2)] == [[100, 101], [300], []]
+
+def test_stale_or_missing_cache_is_ignored(tmp_path, corpus):
+    cache_file = str(tmp_path / "cache.bin")
+    assert open_cache(cache_file, b"d" * 20) is None
+    write_cache(cache_file, b"d" * 20, corpus, corpus["links"])
+    assert open_cache(cache_file, b"e" * 20) is None
+    with open(cache_file, "wb") as f:
+        f.write(b"TTB")
+    assert open_cache(cache_file, b"d" * 20) is None
+
+def test_source_hash_changes_with_the_sources(tmp_path):
+    source = tmp_path / "jpn_sentences.tsv"
+    source.write_text("1\tjpn\t猫\n", encoding="utf-8")
+    before = source_hash([str(source)])
+    source.write_text("1\tjpn\t猫がいる\n", encoding="utf-8")
+    assert source_hash([str(source)]) != before
+
+def test_load_corpus_reuses_the_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for lang, sentences in SENTENCES.items():
+        with open(f"{lang}_sentences.tsv", "w", encoding="utf-8") as f:
+            f.writelines(f"{sent_id}\t{lang}\t{text}\n" for sent_id, text in sentences.items())
+    with open("links.csv", "w", encoding="utf-8") as f:
+        f.write("7\t100\n7\t999\n30\t300\n5\t100\n")
+
+    parsed = load_corpus("cache.bin")
+    assert "mmap" not in parsed and os.path.exists("cache.bin")
+    cached = load_corpus("cache.bin")
+    assert "mmap" in cached
+    for lang in SENTENCES:
+        assert list(cached[lang].items()) == list(parsed[lang].items())
+    for sent_id in (7, 30, 2, 5):
+        assert _mapped_links(cached["links"], sent_id) == _mapped_links(parsed["links"], sent_id)
+    assert _mapped_links(cached["links"], 7) == [100]
@@ -0,0 +1,28 @@
+import random
+
+from token_budget import estimate_tokens, pack_batches
+
+def test_estimate_tokens_grows_with_text():
+    assert estimate_tokens("") >= 0
+    assert 0 < estimate_tokens("猫") <= estimate_tokens("猫がいる")
+    assert estimate_tokens("どきどき (どきどき): throbbing") < estimate_tokens("どきどき (どきどき): throbbing" * 10)
+
+def test_pack_batches_keeps_order_and_budgets():
+    rng = random.Random(5)
+    items = [(rng.randint(1, 40), rng.randint(1, 10)) for _ in range(500)]
+    batches = pack_batches(items, lambda item: item, (100, 20), max_items=8)
+    assert [item for batch in batches for item in batch] == items
+    for batch in batches:
+        assert 1 <= len(batch) <= 8
+        assert sum(prompt for prompt, _ in batch) <= 100
+        assert sum(response for _, response in batch) <= 20
+
+def test_pack_batches_starts_a_new_batch_only_when_needed():
+    batches = pack_batches([5, 5, 5, 5, 5], lambda n: (n,), (10,))
+    assert batches == [[5, 5], [5, 5], [5]]
+    # 두 번째 예산(응답 토큰)만 넘쳐도 나눈다
+    assert pack_batches([1, 1, 1], lambda n: (n, 10), (100, 20)) == [[1, 1], [1]]
+
+def test_oversized_item_gets_its_own_batch():
+    assert pack_batches([3, 50, 3, 3], lambda n: (n,), (10,)) == [[3], [50], [3, 3]]
+    assert pack_batches([], lambda n: (n,), (10,)) == []
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+토큰 수 추정과 예산 기반 배치 구성
+tiktoken이 설치되어 있으면 사용하고, 없으면 문자 종류별 휴리스틱으로 추정한다.
+"""
+
+import re
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("o200k_base")
+except Exception:  # tiktoken 미설치 또는 인코딩 파일 없음
+    _ENCODING = None
+
+# 한자/가나/한글 등은 대략 글자당 1토큰, 그 외(라틴 문자 등)는 약 4글자당 1토큰
+_WIDE_CHARS = re.compile(r'[぀-ヿ㐀-䶿一-鿿가-힯＀-￯]')
+
+def estimate_tokens(text):
+    """text의 토큰 수 (추정치는 약간 크게 잡는다)"""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    wide = len(_WIDE_CHARS.findall(text))
+    return wide + (len(text) - wide + 3) // 4 + 1
+
+def pack_batches(items, costs, budgets, max_items=None):
+    """순서를 유지하면서 예산을 넘지 않게 items를 배치로 묶기
+
+    costs(item)는 budgets와 같은 길이의 비용 튜플 (예: (프롬프트 토큰, 응답 토큰))이다.
+    항목 하나가 예산보다 크면 그 항목만으로 배치를 만든다.
+    """
+    batches = []
+    batch = []
+    totals = [0] * len(budgets)
+    for item in items:
+        cost = costs(item)
+        fits = all(t + c <= b for t, c, b in zip(totals, cost, budgets))
+        if batch and (not fits or (max_items and len(batch) >= max_items)):
+            batches.append(batch)
+            batch = []
+            totals = [0] * len(budgets)
+        batch.append(item)
+        totals = [t + c for t, c in zip(totals, cost)]
+    if batch:
+        batches.append(batch)
+    return batches